@@ -0,0 +1,147 @@
+"""Binaural rendering with parametric head-related kernels.
+
+Each object's image position maps to an azimuth and elevation through the
+pinhole camera model. Kernels combine three parametric models:
+
+- the Woodworth interaural time difference, as a delay on the far ear
+- the Brown-Duda one-pole head-shadow filter for the interaural level difference
+- a single pinna reflection, whose notch frequency rises with elevation
+
+Kernels are built once per quantized direction, cached, and interpolated
+bilinearly between neighbouring directions. Voices are convolved block by block
+with FFT overlap-add. When a voice's direction changes, the block is
+crossfaded from the old kernel to the new one, so moving sources do not click.
+"""
+
+import math
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+HEAD_RADIUS = 0.0875  # meters
+SPEED_OF_SOUND = 343.0  # meters per second
+EAR_AZIMUTHS = (-90.0, 90.0)  # left, right
+
+def direction_from_position(x: float, y: float, frame_width: float, frame_height: float,
+                            focal_length: float) -> Tuple[float, float]:
+    """Azimuth (positive right) and elevation (positive up) in degrees of an image point"""
+    azimuth = math.degrees(math.atan2(x - frame_width / 2, focal_length))
+    elevation = math.degrees(math.atan2(frame_height / 2 - y, focal_length))
+    return azimuth, elevation
+
+def woodworth_itd(azimuth: float) -> float:
+    """Interaural time difference in seconds; positive when the sound reaches the right ear first"""
+    theta = math.radians(max(-90.0, min(90.0, azimuth)))
+    return HEAD_RADIUS / SPEED_OF_SOUND * (theta + math.sin(theta))
+
+def design_kernel(azimuth: float, elevation: float, rate: int, kernel_size: int) -> np.ndarray:
+    """Left and right impulse responses, shape (2, kernel_size)"""
+    design_size = 4 * kernel_size
+    omega = 2 * math.pi * np.fft.rfftfreq(design_size, 1.0 / rate)
+    omega0 = SPEED_OF_SOUND / HEAD_RADIUS
+
+    # Pinna reflection: notch from ~6 kHz (below) to ~10 kHz (above), unit gain at DC
+    notch = 8000.0 + 2000.0 * max(-1.0, min(1.0, elevation / 45.0))
+    pinna_delay = 1.0 / (2.0 * notch)
+    pinna = (1.0 + 0.5 * np.exp(-1j * omega * pinna_delay)) / 1.5
+
+    itd = woodworth_itd(azimuth)
+    kernels = np.empty((2, kernel_size), dtype=np.float64)
+    for ear, ear_azimuth in enumerate(EAR_AZIMUTHS):
+        # Brown-Duda head shadow: treble boost facing the ear, cut on the far side
+        incidence = abs(azimuth - ear_azimuth)
+        alpha = 1.05 + 0.95 * math.cos(math.pi * min(incidence, 150.0) / 150.0)
+        shadow = (1.0 + 1j * alpha * omega / (2 * omega0)) / (1.0 + 1j * omega / (2 * omega0))
+
+        far_ear = (ear == 0 and itd > 0) or (ear == 1 and itd < 0)
+        delay = abs(itd) if far_ear else 0.0
+        spectrum = shadow * pinna * np.exp(-1j * omega * delay)
+        kernels[ear] = np.fft.irfft(spectrum, design_size)[:kernel_size]
+
+    # Fade out the truncated tail
+    fade = kernel_size // 4
+    if fade:
+        kernels[:, -fade:] *= np.hanning(2 * fade)[fade:]
+    return kernels
+
+class BinauralState:
+    """Per-voice convolution state carried across blocks"""
+    def __init__(self, kernel_size: int):
+        self.tail = np.zeros((2, kernel_size - 1))
+        self.spectrum: Optional[np.ndarray] = None
+        self.direction: Optional[Tuple[float, float]] = None
+
+class BinauralRenderer:
+    """Renders mono voice blocks to two ears with cached direction kernels"""
+    def __init__(self, rate: int, block_size: int, kernel_size: int = 128,
+                 azimuth_step: float = 5.0, elevation_step: float = 10.0,
+                 direction_tolerance: float = 0.5):
+        """
+        Args:
+            rate: Sample rate in Hz
+            block_size: Samples per rendered block
+            kernel_size: Taps per ear; must cover the largest ITD (~0.66 ms)
+            azimuth_step, elevation_step: Cache grid in degrees
+            direction_tolerance: Degrees a voice may move before its kernel is updated
+        """
+        min_kernel_size = max(4, math.ceil(woodworth_itd(90.0) * rate) + 1)
+        if kernel_size < min_kernel_size:
+            raise ValueError(f"Binaural kernel of {kernel_size} taps is shorter than the "
+                             f"largest interaural delay; use at least {min_kernel_size} at {rate} Hz")
+        self.rate = rate
+        self.block_size = block_size
+        self.kernel_size = kernel_size
+        self.azimuth_step = azimuth_step
+        self.elevation_step = elevation_step
+        self.direction_tolerance = direction_tolerance
+        self.fft_size = 1 << (block_size + kernel_size - 2).bit_length()
+        self.kernels: Dict[Tuple[int, int], np.ndarray] = {}
+        self.crossfade = np.concatenate([np.linspace(0.0, 1.0, block_size, endpoint=False),
+                                         np.ones(kernel_size - 1)])
+
+    def _grid_kernel(self, azimuth_index: int, elevation_index: int) -> np.ndarray:
+        key = (azimuth_index, elevation_index)
+        if key not in self.kernels:
+            self.kernels[key] = design_kernel(azimuth_index * self.azimuth_step,
+                                              elevation_index * self.elevation_step,
+                                              self.rate, self.kernel_size)
+        return self.kernels[key]
+
+    def kernel(self, azimuth: float, elevation: float) -> np.ndarray:
+        """Bilinear interpolation between the four surrounding grid kernels"""
+        a = max(-90.0, min(90.0, azimuth)) / self.azimuth_step
+        e = max(-90.0, min(90.0, elevation)) / self.elevation_step
+        a0, e0 = math.floor(a), math.floor(e)
+        fa, fe = a - a0, e - e0
+        return ((1 - fa) * (1 - fe) * self._grid_kernel(a0, e0) +
+                fa * (1 - fe) * self._grid_kernel(a0 + 1, e0) +
+                (1 - fa) * fe * self._grid_kernel(a0, e0 + 1) +
+                fa * fe * self._grid_kernel(a0 + 1, e0 + 1))
+
+    def process(self, state: BinauralState, mono: np.ndarray, azimuth: float, elevation: float) -> np.ndarray:
+        """Convolve one mono block for both ears; returns (block_size, 2)"""
+        block = np.fft.rfft(mono, self.fft_size)
+        length = self.block_size + self.kernel_size - 1
+
+        moved = (state.direction is None or
+                 abs(azimuth - state.direction[0]) > self.direction_tolerance or
+                 abs(elevation - state.direction[1]) > self.direction_tolerance)
+        if moved:
+            spectrum = np.fft.rfft(self.kernel(azimuth, elevation), self.fft_size)
+            state.direction = (azimuth, elevation)
+
+        if state.spectrum is None:
+            state.spectrum = spectrum
+            out = np.fft.irfft(block * state.spectrum, self.fft_size)[:, :length]
+        elif moved:
+            old = np.fft.irfft(block * state.spectrum, self.fft_size)[:, :length]
+            new = np.fft.irfft(block * spectrum, self.fft_size)[:, :length]
+            out = old + (new - old) * self.crossfade
+            state.spectrum = spectrum
+        else:
+            out = np.fft.irfft(block * state.spectrum, self.fft_size)[:, :length]
+
+        # Overlap-add the previous block's tail
+        out[:, :self.kernel_size - 1] += state.tail
+        state.tail = out[:, self.block_size:].copy()
+        return out[:, :self.block_size].T
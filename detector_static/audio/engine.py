@@ -3,14 +3,24 @@
 import os
 import pygame
 import threading
-import math
 from collections import deque
 from threading import Lock
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import numpy
 import time
 
 from ..config.settings import Config
+from ..utils.types import TrackedObject
+from ..utils.latency import AUDIO_APPLIED, FrameTrace, LatencyTracker
+from ..utils.clock import Clock, SystemClock
+from .spatial import StereoPanner, DistanceAttenuator, MotionExtrapolator
+from .library import SampleCache, SampleLibrary, SoundProfile, create_sample_library
+from .pack import SamplePack, SamplePackError, resample_linear
+from .synth import ToneMapper, ToneParameters, ToneSynthesizer, ToneVoice
+from .binaural import BinauralRenderer, direction_from_position
+
+# Prefix marking resolved sample references that live in the sample pack
+PACK_PREFIX = 'pack:'
 
 class AudioInitializationError(Exception):
     """Exception raised when audio initialization fails."""
@@ -20,50 +30,25 @@ class SoundFileError(Exception):
     """Exception raised when sound files cannot be loaded."""
     pass
 
-class StereoPanner:
-    """Handles stereo panning calculations"""
-    def __init__(self, frame_width: int):
-        self.frame_width = frame_width
-        self.center_threshold = 0.1  # 10% of width around center where both channels play
-        
-    def calculate_pan(self, x_position: float) -> Tuple[float, float]:
-        """
-        Calculate left and right channel volumes based on x position.
-        Complete separation - when on left side, right channel is silent and vice versa.
-        
-        Args:
-            x_position: X coordinate in frame (0 to frame_width)
-            
-        Returns:
-            Tuple of (left_scale, right_scale) between 0 and 1
-        """
-        # Convert position to normalized value (0 to 1)
-        normalized_pos = x_position / self.frame_width
-        
-        # Define center region
-        center_min = 0.5 - self.center_threshold
-        center_max = 0.5 + self.center_threshold
-        
-        if normalized_pos < center_min:
-            # Left side - only left channel plays
-            return 1.0, 0.0
-        elif normalized_pos > center_max:
-            # Right side - only right channel plays
-            return 0.0, 1.0
-        else:
-            # Center region - smooth transition
-            # Map center region to 0-1 range
-            center_pos = (normalized_pos - center_min) / (center_max - center_min)
-            # Linear crossfade in center region
-            return 1.0 - center_pos, center_pos
-
 class SmoothAudioEngine:
     """Handles smooth audio transitions and playback"""
-    def __init__(self, sound_dir: str):
+    def __init__(self, sound_dir: str, profile: Optional[SoundProfile] = None,
+                 library: Optional[SampleLibrary] = None, clock: Optional[Clock] = None):
         if not os.path.isdir(sound_dir):
             raise AudioInitializationError(f"Sound directory not found: {sound_dir}")
             
         self.sound_dir = sound_dir
+        self.profile = profile if profile is not None else SoundProfile.default()
+        self.library = library  # Opened lazily the first time a profile references it
+        self.clock = clock if clock is not None else SystemClock()  # Drives cooldowns and extrapolation, not the mixer
+        self.sample_cache = SampleCache(int(Config.AUDIO.sample_cache_mb * 1024 * 1024))
+        self.voice_samples: Dict[str, str] = {}  # sound_name -> path of the loaded sample
+        self.pack: Optional[SamplePack] = None
+        if Config.AUDIO.sample_pack_path:
+            try:
+                self.pack = SamplePack(Config.AUDIO.sample_pack_path)
+            except (OSError, SamplePackError) as e:
+                raise AudioInitializationError(f"Failed to open sample pack: {str(e)}")
         self.sounds: Dict[str, Dict[str, pygame.mixer.Sound]] = {}  # sound_name -> {'left', 'right'} sounds
         self.channels: Dict[str, Dict[str, pygame.mixer.Channel]] = {}  # sound_name -> {'left', 'right'} channels
         self.target_volumes: Dict[str, float] = {}
@@ -76,21 +61,28 @@ class SmoothAudioEngine:
         self.volume_smoothing = Config.AUDIO.volume_smoothing
         self.max_volume = 2.0  # Increased to 200% for dramatic effect
         
-        # Distance-based volume parameters
-        self.min_distance = 0.3  # meters, closer distance for max volume
-        self.max_distance = 4.0  # meters, shorter range for min volume
-        self.min_volume_factor = 0.05  # 5% volume at max distance
-        self.distance_curve = 3.0  # Steeper falloff curve
+        # Distance-based volume
+        self.attenuator = DistanceAttenuator()
         
         # Stereo panning
         self.panner = StereoPanner(Config.CAMERA.frame_width)
+        
+        # Closest object's path between vision updates, followed by the audio thread
+        self.closest_motion = MotionExtrapolator(Config.AUDIO.extrapolation_max_sec)
+        self.closest_motion.update(self.current_x_position, 0.0, 0.0, 0.0, 0.0)
+        self.active_sound: Optional[str] = None  # Motion sound the closest object drives
+        self.pan_smoothing = Config.AUDIO.pan_smoothing
 
         # Motion state tracking
         self.current_state = 'none'
         self.state_history: deque = deque(maxlen=5)  # Smooth state transitions
         
+        # Latency tracing: the newest frame's trace waits here until the audio thread applies it
+        self.pending_trace: Optional[FrameTrace] = None
+        self.latency_tracker: Optional[LatencyTracker] = None
+        
         # Static sound cooldown tracking
-        self.last_static_time = 0
+        self.last_static_time = float('-inf')
         self.static_cooldown = Config.AUDIO.static_cooldown_sec
         self.static_volume = Config.AUDIO.static_volume
         
@@ -153,14 +145,103 @@ class SmoothAudioEngine:
             
         except Exception as e:
             raise SoundFileError(f"Failed to create stereo sound {sound_name}: {str(e)}")
+
+    def _create_stereo_sound_from_pack(self, key: str, sound_name: str) -> Tuple[pygame.mixer.Sound, pygame.mixer.Sound]:
+        """Create left and right channel sounds from the loop region of a packed sample"""
+        try:
+            loop_start, loop_end = self.pack.loop(key)
+            samples = self.pack.samples(key)[loop_start:loop_end, :1]
+            if samples.dtype == numpy.int16:
+                samples = samples.astype(numpy.float32) / 32767.0
+
+            mixer_rate = pygame.mixer.get_init()[0]
+            samples = resample_linear(samples.astype(numpy.float32), self.pack.rate, mixer_rate)
+            mono = numpy.clip(samples[:, 0] * 32767.0, -32768, 32767).astype(numpy.int16)
+
+            left_array = numpy.zeros((len(mono), 2), dtype=numpy.int16)
+            left_array[:, 0] = mono
+            right_array = numpy.zeros((len(mono), 2), dtype=numpy.int16)
+            right_array[:, 1] = mono
+
+            return pygame.sndarray.make_sound(left_array), pygame.sndarray.make_sound(right_array)
+        except Exception as e:
+            raise SoundFileError(f"Failed to create stereo sound {sound_name} from pack: {str(e)}")
+
+    def _resolve_sample_path(self, reference: str) -> str:
+        """Resolve a profile sample reference: sample pack first, then sound_dir, then the library"""
+        if self.pack is not None:
+            key = self.pack.resolve(reference)
+            if key is not None:
+                return PACK_PREFIX + key
+        if os.path.isabs(reference):
+            return reference
+        local_path = os.path.join(self.sound_dir, reference)
+        if os.path.exists(local_path):
+            return local_path
+
+        try:
+            if self.library is None:
+                self.library = create_sample_library()
+            return self.library.path(self.library.resolve(reference))
+        except (KeyError, FileNotFoundError) as e:
+            raise SoundFileError(f"Cannot resolve sample '{reference}': {str(e)}")
+
+    def _state_sample_path(self, sound_name: str, reference: str) -> str:
+        """Resolve a state's profile sample, falling back to the bundled default for that state"""
+        try:
+            filepath = self._resolve_sample_path(reference)
+            if filepath.startswith(PACK_PREFIX) or os.path.exists(filepath):
+                return filepath
+            error = f"File not found: {filepath}"
+        except SoundFileError as e:
+            filepath = reference
+            error = str(e)
+
+        default = SoundProfile.default().states.get(sound_name)
+        if default is None or default == reference:
+            return filepath  # Nothing to fall back to; reported as missing
+        print(f"WARNING: Using the default {sound_name} sound - {error}")
+        try:
+            return self._resolve_sample_path(default)
+        except SoundFileError:
+            return os.path.join(self.sound_dir, default)
+
+    def _load_stereo_sound(self, filepath: str, sound_name: str) -> Tuple[pygame.mixer.Sound, pygame.mixer.Sound]:
+        """Get the stereo pair for a file from the sample cache, decoding it on a miss"""
+        def loader(path: str):
+            if path.startswith(PACK_PREFIX):
+                left_sound, right_sound = self._create_stereo_sound_from_pack(path[len(PACK_PREFIX):], sound_name)
+            else:
+                left_sound, right_sound = self._create_stereo_sound(path, sound_name)
+            size = (pygame.sndarray.samples(left_sound).nbytes +
+                    pygame.sndarray.samples(right_sound).nbytes)
+            return (left_sound, right_sound), size
+
+        return self.sample_cache.get(filepath, loader)
+
+    def _select_voice_sample(self, sound_name: str, class_name: Optional[str]) -> None:
+        """Swap a voice to the profile's sample for the given object class if it differs"""
+        if sound_name not in self.sounds:
+            return
+        try:
+            filepath = self._resolve_sample_path(self.profile.sample_for(sound_name, class_name))
+            if filepath == self.voice_samples.get(sound_name):
+                return
+            # Decode outside the lock so the audio thread keeps running
+            left_sound, right_sound = self._load_stereo_sound(filepath, sound_name)
+        except SoundFileError as e:
+            print(f"WARNING: Keeping current {sound_name} sound - {str(e)}")
+            return
+
+        with self.lock:
+            for channel in self.channels[sound_name].values():
+                channel.stop()
+            self.sounds[sound_name] = {'left': left_sound, 'right': right_sound}
+            self.voice_samples[sound_name] = filepath
         
     def _initialize_audio(self) -> None:
-        """Initialize the audio system with sound files"""
-        sound_files = {
-            'fast': 'cello_A2_025_forte_arco-normal.mp3',
-            'slow': 'guitar_A3_very-long_piano_normal.mp3',
-            'static': 'english-horn_A3_025_mezzo-forte_normal.mp3',
-        }
+        """Initialize the audio system with the profile's sound files"""
+        sound_files = dict(self.profile.states)
         
         try:
             pygame.mixer.set_num_channels(16)  # Increased for stereo pairs
@@ -171,21 +252,22 @@ class SmoothAudioEngine:
         failed_loads = []
         channel_id = 0
         
-        for sound_name, filename in sound_files.items():
-            filepath = os.path.join(self.sound_dir, filename)
-            if not os.path.exists(filepath):
+        for sound_name, reference in sound_files.items():
+            filepath = self._state_sample_path(sound_name, reference)
+            if not filepath.startswith(PACK_PREFIX) and not os.path.exists(filepath):
                 missing_files.append(filepath)
                 continue
                 
             try:
                 # Create stereo versions of the sound
-                left_sound, right_sound = self._create_stereo_sound(filepath, sound_name)
+                left_sound, right_sound = self._load_stereo_sound(filepath, sound_name)
                 
                 # Store sounds
                 self.sounds[sound_name] = {
                     'left': left_sound,
                     'right': right_sound
                 }
+                self.voice_samples[sound_name] = filepath
                 
                 # Create stereo channel pair
                 self.channels[sound_name] = {
@@ -209,7 +291,10 @@ class SmoothAudioEngine:
                 error_msg.append(f"Failed to load: {', '.join(f'{name} ({err})' for name, err in failed_loads)}")
             raise SoundFileError('\n'.join(error_msg))
         
-        # Start the audio update thread
+        self._start_audio_thread()
+
+    def _start_audio_thread(self) -> None:
+        """Start the audio update thread"""
         self.running = True
         self.audio_thread = threading.Thread(target=self._audio_update_loop, daemon=True)
         self.audio_thread.start()
@@ -227,6 +312,12 @@ class SmoothAudioEngine:
     
     def _update_volumes(self) -> None:
         """Smooth volume interpolation using exponential easing"""
+        # Follow the closest object's predicted distance and position between vision updates
+        x_position, distance = self.closest_motion.predict(self.clock.now())
+        self.current_x_position += (x_position - self.current_x_position) * self.pan_smoothing
+        if self.active_sound is not None:
+            self.target_volumes[self.active_sound] = self.max_volume * self.calculate_distance_volume(distance)
+        
         for sound_name in self.sounds:
             current = self.current_volumes[sound_name]
             target = self.target_volumes[sound_name]
@@ -270,6 +361,24 @@ class SmoothAudioEngine:
                 for channel in channels.values():
                     if channel.get_busy():
                         channel.fadeout(fadeout_time)
+        
+        self._complete_pending_trace()
+
+    def submit_trace(self, trace: FrameTrace) -> None:
+        """Hand over the trace of the frame whose targets were just set"""
+        with self.lock:
+            if self.pending_trace is not None and self.latency_tracker is not None:
+                self.latency_tracker.supersede(self.pending_trace)
+            self.pending_trace = trace
+
+    def _complete_pending_trace(self) -> None:
+        """Stamp the pending trace now that its targets reached the mixer (lock held)"""
+        if self.pending_trace is None:
+            return
+        self.pending_trace.mark(AUDIO_APPLIED)
+        if self.latency_tracker is not None:
+            self.latency_tracker.complete(self.pending_trace)
+        self.pending_trace = None
     
     def smooth_state_transition(self, new_state: str) -> str:
         """Apply smoothing to state changes to prevent jitter"""
@@ -295,28 +404,13 @@ class SmoothAudioEngine:
         Returns:
             Volume factor between 0 and 1
         """
-        # Clamp distance between min and max
-        clamped_distance = max(self.min_distance, min(self.max_distance, distance))
-        
-        # Calculate normalized distance (0 to 1)
-        normalized_distance = (clamped_distance - self.min_distance) / (self.max_distance - self.min_distance)
-        
-        # Apply exponential falloff curve with more dramatic scaling
-        volume_factor = math.exp(-self.distance_curve * normalized_distance)
-        
-        # Scale between min and max volume with more dramatic range
-        volume_factor = self.min_volume_factor + (1 - self.min_volume_factor) * volume_factor
-        
-        # Apply additional boost for close objects
-        if distance < self.min_distance * 1.5:  # Extra boost zone
-            boost_factor = 1 + (1 - distance / (self.min_distance * 1.5))  # Up to 2x boost
-            volume_factor *= boost_factor
-            
-        return min(volume_factor, 1.0)  # Ensure we don't exceed 100% per channel
+        return self.attenuator.calculate_volume(distance)
         
     def play_static(self) -> None:
         """Play static sound if cooldown has elapsed"""
-        current_time = time.time()
+        if 'static' in self.profile.muted:
+            return
+        current_time = self.clock.now()
         if current_time - self.last_static_time >= self.static_cooldown:
             with self.lock:
                 # Set static sound volume
@@ -331,8 +425,17 @@ class SmoothAudioEngine:
         with self.lock:
             self.target_volumes['static'] = 0.0
 
+    def _anchor_time(self, capture_ts: Optional[float]) -> float:
+        """Engine clock time of a frame's capture; trace timestamps are time.perf_counter() based"""
+        now = self.clock.now()
+        if capture_ts is None:
+            return now
+        return now - max(0.0, time.perf_counter() - capture_ts)
+
     def update_from_motion_state(self, frame_dominant_motion: str, distances: List[float], 
-                               has_objects: bool, x_positions: List[float] = None) -> None:
+                               has_objects: bool, x_positions: List[float] = None,
+                               tracked_objects: Optional[List[TrackedObject]] = None,
+                               capture_ts: Optional[float] = None) -> None:
         """
         Update audio based on motion detection, object distances, and positions.
         
@@ -341,12 +444,23 @@ class SmoothAudioEngine:
             distances: List of object distances
             has_objects: Whether objects are detected
             x_positions: List of object x positions for stereo panning
+            tracked_objects: Analyzed objects, used for per-class sounds and extrapolation velocities
+            capture_ts: time.perf_counter() capture time of the frame, where extrapolation starts
         """
+        closest = None
+        if tracked_objects:
+            located = [obj for obj in tracked_objects if obj.distance > 0]
+            if located:
+                closest = min(located, key=lambda obj: obj.distance)
+                if self.profile.classes:
+                    self._select_voice_sample(closest.motion_state, closest.class_name)
+
         with self.lock:
             # Reset all volumes except static
             for sound_name in self.target_volumes:
                 if sound_name != 'static':  # Don't reset static volume
                     self.target_volumes[sound_name] = 0.0
+            self.active_sound = None
             
             if not has_objects or not distances:
                 return
@@ -360,15 +474,23 @@ class SmoothAudioEngine:
             volume_factor = self.calculate_distance_volume(min_distance)
             base_volume *= volume_factor
             
-            # Update x position for panning (use position of closest object)
+            # Update x position for panning (use position of closest object);
+            # the audio thread glides towards it and extrapolates from there
+            x_position = self.current_x_position
             if x_positions and len(x_positions) == len(distances):
-                self.current_x_position = x_positions[closest_idx]
+                x_position = x_positions[closest_idx]
+            # Pan follows camera-compensated positions, so extrapolate with the matching velocity
+            x_velocity = closest.x_rate if closest is not None else 0.0
+            distance_rate = closest.distance_rate if closest is not None else 0.0
+            self.closest_motion.update(x_position, x_velocity, min_distance, distance_rate,
+                                       self._anchor_time(capture_ts))
             
             # Get motion state of closest object
-            if frame_dominant_motion == 'fast':
-                self.target_volumes['fast'] = base_volume
-            elif frame_dominant_motion == 'slow':
-                self.target_volumes['slow'] = base_volume
+            if frame_dominant_motion in self.profile.muted:
+                return
+            if frame_dominant_motion in ('fast', 'slow'):
+                self.target_volumes[frame_dominant_motion] = base_volume
+                self.active_sound = frame_dominant_motion
     
     def cleanup(self) -> None:
         """Clean shutdown of audio system"""
@@ -384,15 +506,154 @@ class SmoothAudioEngine:
         except Exception as e:
             print(f"WARNING: Error during pygame cleanup: {str(e)}")
 
-def create_smooth_audio_system(sound_dir: str) -> SmoothAudioEngine:
-    """Create and initialize the smooth audio system"""
-    return SmoothAudioEngine(sound_dir)
+class SynthAudioEngine(SmoothAudioEngine):
+    """
+    Audio engine that synthesizes tones block by block instead of playing samples.
+
+    Up to Config.AUDIO.synth_max_voices of the closest objects each get a voice
+    whose pitch, timbre and pulse rate follow distance, class and speed. Blocks
+    are rendered on the audio thread and queued on a single mixer channel.
+    """
+    def _initialize_audio(self) -> None:
+        """Set up the synthesizer; there are no sound files to load"""
+        rate = pygame.mixer.get_init()[0]
+        block_size = int(rate * Config.AUDIO.synth_block_ms / 1000.0)
+        binaural = None
+        if Config.AUDIO.spatial_mode == 'binaural':
+            try:
+                binaural = BinauralRenderer(rate, block_size, Config.AUDIO.binaural_kernel_size)
+            except ValueError as e:
+                raise AudioInitializationError(str(e))
+        self.synth = ToneSynthesizer(rate, block_size, binaural=binaural)
+        self.tone_mapper = ToneMapper(min_distance=self.attenuator.min_distance,
+                                      max_distance=self.attenuator.max_distance)
+        self.voices: Dict[int, ToneVoice] = {}
+        self.voice_motion: Dict[int, Tuple[MotionExtrapolator, float, str, float]] = {}  # key -> path, speed, class, y
+
+        try:
+            self.output_channel = pygame.mixer.Channel(0)
+        except Exception as e:
+            raise AudioInitializationError(f"Failed to open synth output channel: {str(e)}")
+
+        print(f"DEBUG: Synth engine ready ({block_size} samples per block)")
+        self._start_audio_thread()
+
+    def _next_block(self) -> pygame.mixer.Sound:
+        """Render the next block and retire voices that have faded out"""
+        block = self.synth.render(list(self.voices.values()))
+        self._complete_pending_trace()
+        self.voices = {key: voice for key, voice in self.voices.items() if not voice.silent}
+        return pygame.sndarray.make_sound(block)
+
+    def _voice_params(self, distance: float, speed: float, class_name: str,
+                      x_position: float, y_position: float) -> ToneParameters:
+        """Tone, gain, pan and direction of a voice for one object position"""
+        gain = Config.AUDIO.max_volume * self.attenuator.calculate_volume(distance)
+        params = self.tone_mapper.map(distance, speed, class_name, gain)
+        params.left, params.right = self.panner.calculate_pan(x_position)
+        params.azimuth, params.elevation = direction_from_position(
+            x_position, y_position, Config.CAMERA.frame_width, Config.CAMERA.frame_height,
+            Config.CAMERA.focal_length)
+        return params
+
+    def _update_volumes(self) -> None:
+        """Move voice targets along their extrapolated paths; the synthesizer smooths per block"""
+        now = self.clock.now()
+        for key, (motion, speed, class_name, y_position) in self.voice_motion.items():
+            if key in self.voices:
+                x_position, distance = motion.predict(now)
+                self.voices[key].target = self._voice_params(distance, speed, class_name, x_position, y_position)
+
+    def _update_playback(self) -> None:
+        """Keep one block playing and one queued behind it"""
+        if not self.output_channel.get_busy():
+            self.output_channel.play(self._next_block())
+        if self.output_channel.get_queue() is None:
+            self.output_channel.queue(self._next_block())
+
+    def play_static(self) -> None:
+        """Static objects are voiced as slow pulses, no separate cue needed"""
+        pass
+
+    def update_from_motion_state(self, frame_dominant_motion: str, distances: List[float],
+                               has_objects: bool, x_positions: List[float] = None,
+                               tracked_objects: Optional[List[TrackedObject]] = None,
+                               capture_ts: Optional[float] = None) -> None:
+        """
+        Retarget the voices from the analyzed objects.
+
+        Args:
+            frame_dominant_motion: Motion state of the closest object
+            distances: List of object distances
+            has_objects: Whether objects are detected
+            x_positions: List of object x positions for stereo panning
+            tracked_objects: Analyzed objects; each of the closest gets its own voice
+            capture_ts: time.perf_counter() capture time of the frame, where extrapolation starts
+        """
+        # (key, distance, speed, class_name, x_position, y_position, x_velocity, distance_rate)
+        targets: List[Tuple[int, float, float, str, float, float, float, float]] = []
+        if tracked_objects:
+            located = sorted((obj for obj in tracked_objects
+                              if obj.distance > 0 and obj.motion_state not in self.profile.muted),
+                             key=lambda obj: obj.distance)
+            for obj in located[:Config.AUDIO.synth_max_voices]:
+                targets.append((obj.object_id, obj.distance, obj.speed, obj.class_name, obj.center[0], obj.center[1],
+                                obj.velocity[0], obj.distance_rate))
+        elif has_objects and distances and frame_dominant_motion not in self.profile.muted:
+            closest_idx = distances.index(min(distances))
+            x_position = self.current_x_position
+            if x_positions and len(x_positions) == len(distances):
+                x_position = x_positions[closest_idx]
+            targets.append((-1, distances[closest_idx], 0.0, '', x_position,
+                            Config.CAMERA.frame_height / 2, 0.0, 0.0))
+
+        anchor_time = self._anchor_time(capture_ts)
+        with self.lock:
+            for voice in self.voices.values():
+                voice.target.gain = 0.0
+
+            voice_motion = {}
+            for key, distance, speed, class_name, x_position, y_position, x_velocity, distance_rate in targets:
+                params = self._voice_params(distance, speed, class_name, x_position, y_position)
+                if key in self.voices:
+                    self.voices[key].target = params
+                else:
+                    self.voices[key] = ToneVoice(params)
+
+                motion = self.voice_motion[key][0] if key in self.voice_motion else \
+                    MotionExtrapolator(Config.AUDIO.extrapolation_max_sec)
+                motion.update(x_position, x_velocity, distance, distance_rate, anchor_time)
+                voice_motion[key] = (motion, speed, class_name, y_position)
+            self.voice_motion = voice_motion
+
+            if targets:
+                self.current_x_position = targets[0][4]
+
+def create_smooth_audio_system(sound_dir: str, profile_path: Optional[str] = None,
+                               clock: Optional[Clock] = None) -> SmoothAudioEngine:
+    """Create and initialize the configured audio backend"""
+    profile = None
+    if profile_path:
+        try:
+            profile = SoundProfile.load(profile_path)
+        except (OSError, ValueError) as e:
+            raise SoundFileError(f"Failed to load sound profile {profile_path}: {str(e)}")
+
+    if Config.AUDIO.backend == 'synth':
+        return SynthAudioEngine(sound_dir, profile, clock=clock)
+    if Config.AUDIO.spatial_mode == 'binaural':
+        print("WARNING: Binaural rendering needs the synth backend - falling back to stereo panning")
+    if Config.AUDIO.backend != 'samples':
+        raise AudioInitializationError(f"Unknown audio backend: {Config.AUDIO.backend}")
+    return SmoothAudioEngine(sound_dir, profile, clock=clock)
 
 def play_sound_async_smooth(audio_engine: SmoothAudioEngine, 
                           motion_state: str, 
                           distances: List[float], 
                           has_objects: bool,
-                          x_positions: List[float] = None) -> None:
+                          x_positions: List[float] = None,
+                          tracked_objects: Optional[List[TrackedObject]] = None,
+                          trace: Optional[FrameTrace] = None) -> None:
     """
     Update audio engine state based on motion and objects.
     
@@ -402,9 +663,14 @@ def play_sound_async_smooth(audio_engine: SmoothAudioEngine,
         distances: List of object distances
         has_objects: Whether objects are detected
         x_positions: Optional list of object x positions for stereo panning
+        tracked_objects: Optional analyzed objects for per-class sounds
+        trace: Optional latency trace, stamped when the audio thread applies the update
     """
     # Only play static sound if the closest object is static
     if motion_state == 'static' and has_objects and distances:
         audio_engine.play_static()
         
-    audio_engine.update_from_motion_state(motion_state, distances, has_objects, x_positions) 
\ No newline at end of file
+    audio_engine.update_from_motion_state(motion_state, distances, has_objects, x_positions,
+                                          tracked_objects, trace.capture_ts if trace is not None else None)
+    if trace is not None:
+        audio_engine.submit_trace(trace) 
\ No newline at end of file
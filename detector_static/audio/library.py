@@ -0,0 +1,304 @@
+"""Indexed instrument sample library, sound profiles and a size-bounded voice cache.
+
+The library lives in ``personalization_fe/public/audio/all-samples`` with files
+named ``<instrument>_<note>_<length>_<dynamic>_<style>.mp3`` (percussion has an
+empty note and one more directory level). Scanning it once produces a small
+JSON index; later startups only read the index and never touch the tree.
+"""
+
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..config.settings import Config
+
+INDEX_VERSION = 2
+
+@dataclass
+class SampleInfo:
+    """One sample file in the library"""
+    instrument: str
+    note: str
+    length: str
+    dynamic: str
+    style: str
+    path: str  # Relative to the library root
+
+    @property
+    def key(self) -> str:
+        """Key in the format the personalization front end stores (path without .mp3)"""
+        return os.path.splitext(self.path)[0]
+
+def parse_sample_name(filename: str) -> Optional[Tuple[str, str, str, str, str]]:
+    """Split a sample filename into (instrument, note, length, dynamic, style)"""
+    stem, ext = os.path.splitext(filename)
+    if ext.lower() != '.mp3':
+        return None
+    parts = stem.split('_')
+    if len(parts) != 5:
+        return None
+    return tuple(parts)
+
+class SampleLibrary:
+    """Index of the instrument sample tree, queryable by instrument, note, dynamic and length"""
+    def __init__(self, root: str, index_path: Optional[str] = None):
+        self.root = os.path.abspath(root)
+        self.index_path = index_path
+        self.samples: List[SampleInfo] = []
+        self.by_instrument: Dict[str, List[SampleInfo]] = {}
+        self.by_key: Dict[str, SampleInfo] = {}
+
+    def _signature(self) -> Dict[str, float]:
+        """Modification times of the root and its instrument folders (no file listing)"""
+        signature = {'.': os.stat(self.root).st_mtime}
+        with os.scandir(self.root) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    signature[entry.name] = entry.stat().st_mtime
+        return signature
+
+    def _scan(self) -> List[SampleInfo]:
+        """Walk the tree and parse every sample filename"""
+        samples: Dict[str, SampleInfo] = {}
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames.sort()
+            folder = os.path.basename(dirpath).replace(' ', '-')
+            for filename in sorted(filenames):
+                parsed = parse_sample_name(filename)
+                if parsed is None:
+                    continue
+
+                info = SampleInfo(*parsed, path=os.path.relpath(os.path.join(dirpath, filename), self.root))
+                # The combination folders repeat files of other instruments; prefer the instrument's own folder
+                existing = samples.get(filename)
+                if (existing is None or folder == info.instrument
+                        or existing.path.startswith('combination')):
+                    samples[filename] = info
+        return sorted(samples.values(), key=lambda s: s.path)
+
+    def _set_samples(self, samples: List[SampleInfo]) -> None:
+        self.samples = samples
+        self.by_instrument = {}
+        self.by_key = {}
+        for sample in samples:
+            self.by_instrument.setdefault(sample.instrument, []).append(sample)
+            self.by_key[sample.key] = sample
+
+    def build(self) -> None:
+        """Scan the tree and save a fresh index"""
+        start = time.time()
+        self._set_samples(self._scan())
+        print(f"DEBUG: Indexed {len(self.samples)} samples in {time.time() - start:.2f}s")
+
+        if self.index_path:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            data = {
+                'version': INDEX_VERSION,
+                'root': self.root,
+                'signature': self._signature(),
+                'samples': [[s.instrument, s.note, s.length, s.dynamic, s.style, s.path] for s in self.samples],
+            }
+            tmp_path = self.index_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_path, self.index_path)
+
+    def load(self) -> bool:
+        """Load the saved index. Returns False if it is missing or stale."""
+        if not self.index_path or not os.path.exists(self.index_path):
+            return False
+        try:
+            with open(self.index_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if (data.get('version') != INDEX_VERSION or data.get('root') != self.root
+                or data.get('signature') != self._signature()):
+            return False
+
+        self._set_samples([SampleInfo(*row) for row in data['samples']])
+        return True
+
+    def load_or_build(self) -> 'SampleLibrary':
+        """Load the saved index, rebuilding it only when the library changed"""
+        if not os.path.isdir(self.root):
+            raise FileNotFoundError(f"Sample library not found: {self.root}")
+        if not self.load():
+            self.build()
+        return self
+
+    def instruments(self) -> List[str]:
+        return sorted(self.by_instrument)
+
+    def find(self, instrument: str, note: Optional[str] = None, dynamic: Optional[str] = None,
+             length: Optional[str] = None, style: Optional[str] = None) -> List[SampleInfo]:
+        """All samples of an instrument matching the given attributes"""
+        matches = []
+        for sample in self.by_instrument.get(instrument, []):
+            if note is not None and sample.note != note:
+                continue
+            if dynamic is not None and sample.dynamic != dynamic:
+                continue
+            if length is not None and sample.length != length:
+                continue
+            if style is not None and sample.style != style:
+                continue
+            matches.append(sample)
+        return matches
+
+    def resolve(self, key: str) -> SampleInfo:
+        """
+        Resolve a sample reference.
+
+        Accepts a front-end key ('violin/violin_A3_025_forte_arco-normal'), a bare
+        filename stem, or a query 'instrument:note[:dynamic[:length]]'.
+        """
+        key = key[:-4] if key.endswith('.mp3') else key
+        if key in self.by_key:
+            return self.by_key[key]
+
+        if ':' in key:
+            instrument, *rest = key.split(':')
+            attrs = dict(zip(('note', 'dynamic', 'length'), (r or None for r in rest)))
+            matches = self.find(instrument, **attrs)
+            if matches:
+                return matches[0]
+        else:
+            stem = os.path.basename(key)
+            for sample in self.by_instrument.get(stem.split('_')[0], []):
+                if os.path.basename(sample.key) == stem:
+                    return sample
+
+        raise KeyError(f"No sample matches '{key}'")
+
+    def path(self, sample: SampleInfo) -> str:
+        """Absolute path of a sample"""
+        return os.path.join(self.root, sample.path)
+
+@dataclass
+class SoundProfile:
+    """User's choice of sample per motion state and per object class"""
+    states: Dict[str, str] = field(default_factory=dict)  # motion state -> sample reference
+    classes: Dict[str, str] = field(default_factory=dict)  # object class -> sample reference
+    muted: List[str] = field(default_factory=list)  # motion states without feedback
+
+    @classmethod
+    def default(cls) -> 'SoundProfile':
+        """The three bundled sounds"""
+        return cls(states={
+            'fast': 'cello_A2_025_forte_arco-normal.mp3',
+            'slow': 'guitar_A3_very-long_piano_normal.mp3',
+            'static': 'english-horn_A3_025_mezzo-forte_normal.mp3',
+        })
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SoundProfile':
+        """
+        Build a profile from either the native format ({states, classes, muted})
+        or the personalization form data ({soundTracks, noFeedbackFrom}).
+        """
+        profile = cls.default()
+        if 'soundTracks' in data or 'noFeedbackFrom' in data:
+            # Form answers are ordered picks; assign them to the states in urgency order
+            for state, track in zip(('fast', 'slow', 'static'), data.get('soundTracks', [])):
+                profile.states[state] = track
+            profile.muted = list(data.get('noFeedbackFrom', []))
+            return profile
+
+        profile.states.update(data.get('states', {}))
+        profile.classes.update(data.get('classes', {}))
+        profile.muted = list(data.get('muted', []))
+        return profile
+
+    @classmethod
+    def load(cls, path: str) -> 'SoundProfile':
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    def sample_for(self, state: str, class_name: Optional[str] = None) -> str:
+        """Sample reference for a state, honoring a class override"""
+        if class_name is not None and class_name in self.classes:
+            return self.classes[class_name]
+        return self.states[state]
+
+class SampleCache:
+    """LRU cache of decoded samples bounded by total size in bytes"""
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.entries: 'OrderedDict[str, Tuple[Any, int]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, loader: Callable[[str], Tuple[Any, int]]) -> Any:
+        """
+        Return the cached value for key, decoding it with loader on a miss.
+
+        Args:
+            key: Cache key, usually the sample path
+            loader: Returns (value, size_in_bytes) for the key
+        """
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key][0]
+
+        self.misses += 1
+        value, size = loader(key)
+        self.entries[key] = (value, size)
+        self.total_bytes += size
+        self._evict(keep=key)
+        return value
+
+    def _evict(self, keep: str) -> None:
+        """Drop least recently used entries until under budget (never the newest one)"""
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            oldest = next(iter(self.entries))
+            if oldest == keep:
+                break
+            _, size = self.entries.pop(oldest)
+            self.total_bytes -= size
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+def create_sample_library(root: Optional[str] = None) -> SampleLibrary:
+    """Create the configured sample library and load (or build) its index"""
+    root = root or Config.get_sample_library_dir()
+    return SampleLibrary(root, Config.get_sample_index_path()).load_or_build()
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    """Rebuild the index or look up samples from the command line"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Index and query the instrument sample library')
+    parser.add_argument('--root', default=Config.get_sample_library_dir())
+    parser.add_argument('--rebuild', action='store_true', help='Rescan the library even if the index is current')
+    parser.add_argument('--instrument')
+    parser.add_argument('--note')
+    parser.add_argument('--dynamic')
+    parser.add_argument('--length')
+    args = parser.parse_args(argv)
+
+    library = SampleLibrary(args.root, Config.get_sample_index_path())
+    if args.rebuild:
+        library.build()
+    else:
+        library.load_or_build()
+
+    if args.instrument:
+        for sample in library.find(args.instrument, args.note, args.dynamic, args.length):
+            print(sample.key)
+    else:
+        for instrument in library.instruments():
+            print(f"{instrument}: {len(library.by_instrument[instrument])} samples")
+
+if __name__ == '__main__':
+    main()
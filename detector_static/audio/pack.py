@@ -0,0 +1,287 @@
+"""Offline sample-pack builder and memory-mapped pack reader.
+
+A pack holds a chosen subset of the instrument library already decoded,
+resampled to the mixer rate, trimmed and given loop points, so devices carry
+only what they play and never decode MP3 at runtime.
+
+File layout::
+
+    b'ESPACK01'                      8-byte magic
+    sample data                      each block 64-byte aligned
+    JSON index                       rate, dtype, channels and per-sample entries
+    index offset, index length       two little-endian uint64
+    b'ESPACK01'                      trailing magic
+"""
+
+import json
+import os
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ..config.settings import Config
+from .library import SampleInfo, SampleLibrary
+
+PACK_MAGIC = b'ESPACK01'
+PACK_FOOTER = struct.Struct('<QQ8s')
+PACK_ALIGNMENT = 64
+
+SILENCE_THRESHOLD_DB = -50.0  # Relative to the sample's peak
+EDGE_FADE_SEC = 0.005
+LOOP_WINDOW_SEC = 0.01
+MIN_LOOP_SEC = 0.2
+
+class SamplePackError(Exception):
+    """Exception raised when a sample pack cannot be built or read."""
+    pass
+
+def resample_linear(samples: np.ndarray, src_rate: int, dst_rate: int) -> np.ndarray:
+    """Resample (frames, channels) float32 audio with linear interpolation"""
+    if src_rate == dst_rate or len(samples) == 0:
+        return samples
+    n_out = int(round(len(samples) * dst_rate / src_rate))
+    src_pos = np.arange(n_out, dtype=np.float64) * (src_rate / dst_rate)
+    src_idx = np.arange(len(samples), dtype=np.float64)
+    return np.stack([np.interp(src_pos, src_idx, samples[:, c]) for c in range(samples.shape[1])],
+                    axis=1).astype(np.float32)
+
+def trim_silence(samples: np.ndarray, rate: int, threshold_db: float = SILENCE_THRESHOLD_DB) -> np.ndarray:
+    """Cut leading and trailing silence and fade the new edges to avoid clicks"""
+    envelope = np.abs(samples).max(axis=1)
+    peak = envelope.max() if len(envelope) else 0.0
+    if peak <= 0:
+        return samples[:0]
+
+    loud = np.flatnonzero(envelope >= peak * (10 ** (threshold_db / 20)))
+    trimmed = samples[loud[0]:loud[-1] + 1].copy()
+
+    fade = min(int(EDGE_FADE_SEC * rate), len(trimmed) // 2)
+    if fade > 0:
+        ramp = np.linspace(0.0, 1.0, fade, dtype=np.float32)[:, None]
+        trimmed[:fade] *= ramp
+        trimmed[-fade:] *= ramp[::-1]
+    return trimmed
+
+def find_loop_points(samples: np.ndarray, rate: int) -> Tuple[int, int]:
+    """
+    Find a loop region in the sustained part of a sample.
+
+    The loop starts at a rising zero crossing after the attack and ends at the
+    rising zero crossing near the tail whose following waveform best matches
+    the waveform after the start, so the repeat is seamless.
+    """
+    n = len(samples)
+    if n < int(MIN_LOOP_SEC * rate) * 2:
+        return 0, n
+
+    mono = samples.mean(axis=1)
+    window = max(16, int(LOOP_WINDOW_SEC * rate))
+    rising = np.flatnonzero((mono[:-1] < 0) & (mono[1:] >= 0)) + 1
+
+    starts = rising[(rising >= n * 0.3) & (rising < n * 0.5)]
+    ends = rising[(rising >= n * 0.7) & (rising < n - window)]
+    if len(starts) == 0 or len(ends) == 0:
+        return 0, n
+
+    start = int(starts[0])
+    reference = mono[start:start + window]
+
+    # Compare at most a few thousand candidates; plenty for a clean splice
+    ends = ends[::max(1, len(ends) // 2000)]
+    segments = mono[ends[:, None] + np.arange(window)[None, :]]
+    errors = ((segments - reference[None, :]) ** 2).sum(axis=1)
+    return start, int(ends[int(np.argmin(errors))])
+
+def _init_decoder(rate: int) -> None:
+    """Worker initializer: open a silent mixer at the target rate for MP3 decoding"""
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    import pygame
+    pygame.mixer.init(frequency=rate, size=-16, channels=2)
+
+def _decode_sample(path: str, rate: int) -> np.ndarray:
+    """Decode a file into (frames, channels) float32 at the requested rate"""
+    import pygame
+    sound = pygame.mixer.Sound(path)
+    array = pygame.sndarray.array(sound)
+    if array.ndim == 1:
+        array = array[:, None]
+
+    mixer_rate, mixer_size, _ = pygame.mixer.get_init()
+    scale = float(2 ** (abs(mixer_size) - 1))
+    samples = array.astype(np.float32) / scale
+    return resample_linear(samples, mixer_rate, rate)
+
+def _process_sample(task: Tuple[str, str, int, bool, str]) -> Tuple[str, Optional[np.ndarray], int, int, str]:
+    """Decode, trim, loop and convert one sample; runs in a worker process"""
+    key, path, rate, mono, dtype = task
+    try:
+        samples = _decode_sample(path, rate)
+        if mono:
+            samples = samples.mean(axis=1, keepdims=True)
+        samples = trim_silence(samples, rate)
+        loop_start, loop_end = find_loop_points(samples, rate)
+
+        if dtype == 'int16':
+            samples = np.clip(samples * 32767.0, -32768, 32767).astype(np.int16)
+        else:
+            samples = samples.astype(np.float32)
+        return key, np.ascontiguousarray(samples), loop_start, loop_end, ''
+    except Exception as e:
+        return key, None, 0, 0, str(e)
+
+def build_pack(library: SampleLibrary, samples: List[SampleInfo], output_path: str,
+               rate: int = Config.AUDIO.frequency, mono: bool = False, dtype: str = 'float32',
+               jobs: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Build a pack from library samples using all cores.
+
+    Returns:
+        The pack index that was written
+    """
+    if dtype not in ('int16', 'float32'):
+        raise SamplePackError(f"Unsupported sample dtype: {dtype}")
+    if not samples:
+        raise SamplePackError("No samples selected")
+
+    tasks = [(s.key, library.path(s), rate, mono, dtype) for s in samples]
+    info_by_key = {s.key: s for s in samples}
+    entries: Dict[str, Dict[str, Any]] = {}
+    failures: List[Tuple[str, str]] = []
+    start_time = time.time()
+
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'wb') as f, \
+            ProcessPoolExecutor(max_workers=jobs, initializer=_init_decoder, initargs=(rate,)) as executor:
+        f.write(PACK_MAGIC)
+        # Results are written as they arrive so memory stays bounded by the chunk size
+        for key, data, loop_start, loop_end, error in executor.map(_process_sample, tasks, chunksize=8):
+            if data is None:
+                failures.append((key, error))
+                continue
+            if len(data) == 0:
+                # An empty entry would only fail later, when a voice loads it
+                failures.append((key, 'no audio above the silence threshold'))
+                continue
+
+            f.write(b'\0' * (-f.tell() % PACK_ALIGNMENT))
+            offset = f.tell()
+            f.write(data.tobytes())
+
+            info = info_by_key[key]
+            entries[key] = {
+                'offset': offset,
+                'frames': int(data.shape[0]),
+                'loop_start': loop_start,
+                'loop_end': loop_end,
+                'instrument': info.instrument,
+                'note': info.note,
+                'length': info.length,
+                'dynamic': info.dynamic,
+                'style': info.style,
+            }
+
+        index = {
+            'rate': rate,
+            'dtype': dtype,
+            'channels': 1 if mono else 2,
+            'samples': entries,
+        }
+        index_bytes = json.dumps(index, separators=(',', ':')).encode('utf-8')
+        index_offset = f.tell()
+        f.write(index_bytes)
+        f.write(PACK_FOOTER.pack(index_offset, len(index_bytes), PACK_MAGIC))
+
+    os.replace(tmp_path, output_path)
+
+    for key, error in failures:
+        print(f"WARNING: Skipped {key} - {error}")
+    print(f"DEBUG: Packed {len(entries)} samples into {output_path} "
+          f"({os.path.getsize(output_path) / 1e6:.1f} MB) in {time.time() - start_time:.1f}s")
+    return index
+
+class SamplePack:
+    """Read-only, memory-mapped view of a sample pack"""
+    def __init__(self, path: str):
+        self.path = path
+        self.data = np.memmap(path, dtype=np.uint8, mode='r')
+        if len(self.data) < len(PACK_MAGIC) + PACK_FOOTER.size or bytes(self.data[:8]) != PACK_MAGIC:
+            raise SamplePackError(f"Not a sample pack: {path}")
+
+        index_offset, index_length, magic = PACK_FOOTER.unpack(bytes(self.data[-PACK_FOOTER.size:]))
+        if magic != PACK_MAGIC:
+            raise SamplePackError(f"Truncated sample pack: {path}")
+
+        index = json.loads(bytes(self.data[index_offset:index_offset + index_length]))
+        self.rate: int = index['rate']
+        self.dtype = np.dtype(index['dtype'])
+        self.channels: int = index['channels']
+        self.entries: Dict[str, Dict[str, Any]] = index['samples']
+        self.by_stem = {os.path.basename(key): key for key in self.entries}
+
+    def resolve(self, reference: str) -> Optional[str]:
+        """Pack key for a sample reference (library key or filename), or None"""
+        reference = reference[:-4] if reference.endswith('.mp3') else reference
+        if reference in self.entries:
+            return reference
+        return self.by_stem.get(os.path.basename(reference))
+
+    def samples(self, key: str) -> np.ndarray:
+        """(frames, channels) view into the mapped file; no copy is made"""
+        entry = self.entries[key]
+        count = entry['frames'] * self.channels
+        flat = np.frombuffer(self.data, dtype=self.dtype, count=count, offset=entry['offset'])
+        return flat.reshape(entry['frames'], self.channels)
+
+    def loop(self, key: str) -> Tuple[int, int]:
+        entry = self.entries[key]
+        return entry['loop_start'], entry['loop_end']
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+def select_samples(library: SampleLibrary, instruments: Iterable[str], notes: Optional[List[str]] = None,
+                   dynamics: Optional[List[str]] = None, lengths: Optional[List[str]] = None) -> List[SampleInfo]:
+    """Library samples for the chosen instruments, filtered by note, dynamic and length"""
+    selected = []
+    for instrument in instruments:
+        for sample in library.find(instrument):
+            if notes and sample.note not in notes:
+                continue
+            if dynamics and sample.dynamic not in dynamics:
+                continue
+            if lengths and sample.length not in lengths:
+                continue
+            selected.append(sample)
+    return selected
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    """Build a sample pack from the command line"""
+    import argparse
+    from .library import create_sample_library
+
+    parser = argparse.ArgumentParser(description='Build a compact sample pack from the instrument library')
+    parser.add_argument('output', help='Pack file to write')
+    parser.add_argument('--instruments', nargs='+', help='Instruments to include (default: all)')
+    parser.add_argument('--notes', nargs='+', help='Notes to include, e.g. A2 C4')
+    parser.add_argument('--dynamics', nargs='+', help='Dynamics to include, e.g. forte piano')
+    parser.add_argument('--lengths', nargs='+', help='Lengths to include, e.g. 025 very-long')
+    parser.add_argument('--rate', type=int, default=Config.AUDIO.frequency)
+    parser.add_argument('--mono', action='store_true', help='Mix down to one channel')
+    parser.add_argument('--dtype', choices=('int16', 'float32'), default='float32')
+    parser.add_argument('--jobs', type=int, default=None, help='Worker processes (default: all cores)')
+    args = parser.parse_args(argv)
+
+    library = create_sample_library()
+    samples = select_samples(library, args.instruments or library.instruments(),
+                             args.notes, args.dynamics, args.lengths)
+    build_pack(library, samples, args.output, rate=args.rate, mono=args.mono,
+               dtype=args.dtype, jobs=args.jobs)
+
+if __name__ == '__main__':
+    main()
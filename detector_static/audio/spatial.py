@@ -0,0 +1,112 @@
+"""Spatial audio cue calculations shared by local and remote playback."""
+
+import math
+from typing import Tuple
+
+class StereoPanner:
+    """Handles stereo panning calculations"""
+    def __init__(self, frame_width: int):
+        self.frame_width = frame_width
+        self.center_threshold = 0.1  # 10% of width around center where both channels play
+        
+    def calculate_pan(self, x_position: float) -> Tuple[float, float]:
+        """
+        Calculate left and right channel volumes based on x position.
+        Complete separation - when on left side, right channel is silent and vice versa.
+        
+        Args:
+            x_position: X coordinate in frame (0 to frame_width)
+            
+        Returns:
+            Tuple of (left_scale, right_scale) between 0 and 1
+        """
+        # Convert position to normalized value (0 to 1)
+        normalized_pos = x_position / self.frame_width
+        
+        # Define center region
+        center_min = 0.5 - self.center_threshold
+        center_max = 0.5 + self.center_threshold
+        
+        if normalized_pos < center_min:
+            # Left side - only left channel plays
+            return 1.0, 0.0
+        elif normalized_pos > center_max:
+            # Right side - only right channel plays
+            return 0.0, 1.0
+        else:
+            # Center region - smooth transition
+            # Map center region to 0-1 range
+            center_pos = (normalized_pos - center_min) / (center_max - center_min)
+            # Linear crossfade in center region
+            return 1.0 - center_pos, center_pos
+
+class DistanceAttenuator:
+    """Maps object distance to a volume factor"""
+    def __init__(self,
+                 min_distance: float = 0.3,  # meters, closer distance for max volume
+                 max_distance: float = 4.0,  # meters, shorter range for min volume
+                 min_volume_factor: float = 0.05,  # 5% volume at max distance
+                 distance_curve: float = 3.0):  # Steeper falloff curve
+        self.min_distance = min_distance
+        self.max_distance = max_distance
+        self.min_volume_factor = min_volume_factor
+        self.distance_curve = distance_curve
+
+    def calculate_volume(self, distance: float) -> float:
+        """
+        Calculate volume based on distance using an exponential falloff curve.
+        
+        Args:
+            distance: Distance to object in meters
+            
+        Returns:
+            Volume factor between 0 and 1
+        """
+        # Clamp distance between min and max
+        clamped_distance = max(self.min_distance, min(self.max_distance, distance))
+        
+        # Calculate normalized distance (0 to 1)
+        normalized_distance = (clamped_distance - self.min_distance) / (self.max_distance - self.min_distance)
+        
+        # Apply exponential falloff curve with more dramatic scaling
+        volume_factor = math.exp(-self.distance_curve * normalized_distance)
+        
+        # Scale between min and max volume with more dramatic range
+        volume_factor = self.min_volume_factor + (1 - self.min_volume_factor) * volume_factor
+        
+        # Apply additional boost for close objects
+        if distance < self.min_distance * 1.5:  # Extra boost zone
+            boost_factor = 1 + (1 - distance / (self.min_distance * 1.5))  # Up to 2x boost
+            volume_factor *= boost_factor
+            
+        return min(volume_factor, 1.0)  # Ensure we don't exceed 100% per channel
+
+class MotionExtrapolator:
+    """Predicts an object's x position and distance between vision updates"""
+    def __init__(self, max_extrapolation: float = 0.25):  # seconds past the last update
+        self.max_extrapolation = max_extrapolation
+        self.x_position = 0.0
+        self.x_velocity = 0.0  # pixels per second
+        self.distance = 0.0
+        self.distance_rate = 0.0  # meters per second
+        self.anchor_time = 0.0
+
+    def update(self, x_position: float, x_velocity: float, distance: float,
+               distance_rate: float, anchor_time: float) -> None:
+        """Store an observation valid at anchor_time"""
+        self.x_position = x_position
+        self.x_velocity = x_velocity
+        self.distance = distance
+        self.distance_rate = distance_rate
+        self.anchor_time = anchor_time
+
+    def predict(self, now: float) -> Tuple[float, float]:
+        """
+        Linear prediction, held still once max_extrapolation has passed.
+
+        Returns:
+            Tuple of (x_position, distance)
+        """
+        dt = min(max(0.0, now - self.anchor_time), self.max_extrapolation)
+        return (self.x_position + self.x_velocity * dt,
+                max(0.0, self.distance + self.distance_rate * dt))
@@ -0,0 +1,276 @@
+"""Compiled runtime configuration.
+
+Hot paths index per-class NumPy tables by model class id instead of scanning
+Config lists and dicts per object. The tables are target mask, real size,
+width-based sizing and stationary flag. An immutable RuntimeConfig
+snapshot holds them together with the motion and camera settings. Readers
+take one snapshot per call and use it throughout.
+
+Settings can be hot-reloaded from a JSON file of Config overrides, for example
+{"TARGET_CLASSES": [...], "MOTION": {"slow_threshold": 50}}. Overrides are
+validated as a whole, applied to Config, and a freshly compiled snapshot then
+replaces the old one in a single reference swap.
+
+Only the settings in LIVE_SETTINGS can change while running. Every other
+section is read once when components are built, so it is accepted only when
+the file is applied at startup and refused on later reloads.
+"""
+
+import dataclasses
+import json
+import os
+import threading
+import typing
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from .settings import Config, CameraConfig, MotionConfig
+
+DEFAULT_REAL_SIZE = 100.0  # cm, for classes without configured dimensions
+MOTION_STATES = ('static', 'slow', 'fast')
+# BGR box colors per motion state; anything else is drawn like 'fast'
+MOTION_COLORS = np.array([(0, 255, 0), (0, 255, 255), (0, 0, 255)], dtype=np.uint8)
+# Settings compiled into the snapshot; every other Config section is read at startup only
+LIVE_SETTINGS = {'TARGET_CLASSES', 'STATIONARY_CLASSES', 'DIMENSIONS', 'MOTION', 'CAMERA'}
+# Fields of live settings that size buffers at startup (shared frame ring, stereo panner)
+FIXED_FIELDS = {'CAMERA': {'frame_width', 'frame_height'}}
+
+@dataclass(frozen=True)
+class RuntimeConfig:
+    """Immutable per-class lookup tables and the settings read per frame"""
+    version: int
+    names: Dict[int, str]  # class id -> name
+    class_ids: Dict[str, int]  # name -> class id
+    target_mask: np.ndarray  # bool, class id -> detected and tracked
+    target_ids: np.ndarray  # int64 ids where target_mask is set
+    real_sizes: np.ndarray  # float32 cm, class id -> real height (or width where size_by_width)
+    size_by_width: np.ndarray  # bool, class id -> distance from box width instead of diagonal
+    stationary: np.ndarray  # bool, class id -> always reported static
+    motion: MotionConfig
+    camera: CameraConfig
+
+    @property
+    def num_classes(self) -> int:
+        return len(self.target_mask)
+
+    def class_id(self, class_name: str) -> int:
+        return self.class_ids.get(class_name, -1)
+
+    def is_target(self, class_name: str) -> bool:
+        class_id = self.class_id(class_name)
+        return class_id >= 0 and bool(self.target_mask[class_id])
+
+    def motion_color(self, motion_state: str) -> Tuple[int, int, int]:
+        index = MOTION_STATES.index(motion_state) if motion_state in MOTION_STATES else len(MOTION_STATES) - 1
+        return tuple(int(c) for c in MOTION_COLORS[index])
+
+def default_class_names() -> Dict[int, str]:
+    """Class ids for use without a detector model: every configured class, in order"""
+    classes = dict.fromkeys(Config.TARGET_CLASSES + Config.STATIONARY_CLASSES +
+                            list(Config.DIMENSIONS.heights) + list(Config.DIMENSIONS.widths))
+    return {i: name for i, name in enumerate(classes)}
+
+def compile_runtime_config(names: Dict[int, str], version: int = 0) -> RuntimeConfig:
+    """Build the lookup tables for a model's class ids from the current Config"""
+    num_classes = max(names) + 1 if names else 0
+    targets = set(Config.TARGET_CLASSES)
+    stationary_classes = {name.lower() for name in Config.STATIONARY_CLASSES}
+
+    target_mask = np.zeros(num_classes, dtype=bool)
+    real_sizes = np.full(num_classes, DEFAULT_REAL_SIZE, dtype=np.float32)
+    size_by_width = np.zeros(num_classes, dtype=bool)
+    stationary = np.zeros(num_classes, dtype=bool)
+    for class_id, name in names.items():
+        target_mask[class_id] = name in targets
+        stationary[class_id] = name.lower() in stationary_classes
+        if name in Config.DIMENSIONS.widths:
+            real_sizes[class_id] = Config.DIMENSIONS.widths[name]
+            size_by_width[class_id] = True
+        else:
+            real_sizes[class_id] = Config.DIMENSIONS.heights.get(name, DEFAULT_REAL_SIZE)
+
+    for table in (target_mask, real_sizes, size_by_width, stationary):
+        table.setflags(write=False)
+
+    return RuntimeConfig(
+        version=version,
+        names=dict(names),
+        class_ids={name: class_id for class_id, name in names.items()},
+        target_mask=target_mask,
+        target_ids=np.flatnonzero(target_mask).astype(np.int64),
+        real_sizes=real_sizes,
+        size_by_width=size_by_width,
+        stationary=stationary,
+        motion=dataclasses.replace(Config.MOTION),
+        camera=dataclasses.replace(Config.CAMERA),
+    )
+
+_lock = threading.Lock()
+_current: Optional[RuntimeConfig] = None
+
+def get_runtime_config() -> RuntimeConfig:
+    """The current snapshot; take it once per call and keep using it"""
+    runtime = _current
+    if runtime is None:
+        with _lock:
+            if _current is None:
+                _swap(compile_runtime_config(default_class_names()))
+            runtime = _current
+    return runtime
+
+def _swap(runtime: RuntimeConfig) -> None:
+    global _current
+    _current = runtime
+
+def set_class_names(names: Dict[int, str]) -> RuntimeConfig:
+    """Recompile the tables for a detector model's class ids"""
+    with _lock:
+        version = _current.version + 1 if _current is not None else 0
+        runtime = compile_runtime_config(names, version)
+        _swap(runtime)
+    return runtime
+
+def _matches_type(value: Any, expected: Any) -> bool:
+    """Whether a JSON value fits a settings field annotation; ints are accepted for floats"""
+    origin, args = typing.get_origin(expected), typing.get_args(expected)
+    if origin is Union:
+        return any(_matches_type(value, arg) for arg in args)
+    if expected is type(None):
+        return value is None
+    if isinstance(value, bool):
+        return expected is bool
+    if expected is float:
+        return isinstance(value, (int, float))
+    if origin is dict:
+        return isinstance(value, dict) and all(isinstance(k, str) and _matches_type(v, args[1])
+                                               for k, v in value.items())
+    if origin is list:
+        return isinstance(value, list) and all(_matches_type(v, args[0]) for v in value)
+    return isinstance(value, expected)
+
+def _stage_overrides(overrides: Dict[str, Any], startup: bool = False) -> Dict[str, Any]:
+    """Validate overrides and build the new Config values without touching Config"""
+    staged = {}
+    for key, value in overrides.items():
+        if not key.isupper() or not hasattr(Config, key):
+            raise ValueError(f"Unknown setting: {key}")
+        if not startup and key not in LIVE_SETTINGS:
+            raise ValueError(f"Setting {key} is only read at startup, restart instead")
+        current = getattr(Config, key)
+        if dataclasses.is_dataclass(current):
+            if not isinstance(value, dict):
+                raise ValueError(f"Setting {key} expects an object")
+            field_types = typing.get_type_hints(type(current))
+            unknown = set(value) - set(field_types)
+            if unknown:
+                raise ValueError(f"Unknown fields for {key}: {', '.join(sorted(unknown))}")
+            fixed = set(value) & FIXED_FIELDS.get(key, set())
+            if fixed and not startup:
+                raise ValueError(f"Fields of {key} cannot be reloaded, restart instead: {', '.join(sorted(fixed))}")
+            changes = {}
+            for name, new in value.items():
+                if not _matches_type(new, field_types[name]):
+                    expected = field_types[name]
+                    type_name = expected.__name__ if isinstance(expected, type) else str(expected).replace('typing.', '')
+                    raise ValueError(f"Setting {key}.{name} expects {type_name}, got {new!r}")
+                old = getattr(current, name)
+                # Dict fields such as DIMENSIONS.heights are merged, not replaced
+                changes[name] = {**old, **new} if isinstance(old, dict) and isinstance(new, dict) else new
+            staged[key] = dataclasses.replace(current, **changes)
+        elif isinstance(current, list):
+            if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+                raise ValueError(f"Setting {key} expects a list of class names")
+            staged[key] = list(value)
+        else:
+            raise ValueError(f"Setting {key} cannot be reloaded")
+    return staged
+
+def apply_settings(overrides: Dict[str, Any], startup: bool = False) -> RuntimeConfig:
+    """
+    Apply Config overrides and swap in a recompiled snapshot; nothing changes if validation fails.
+
+    Args:
+        overrides: Config section or list name -> new fields or list
+        startup: Components are not built yet, so startup-only settings are accepted too
+
+    Config is updated in place without a lock readers take. Readers of live
+    settings go through the snapshot; the only fields read from Config directly
+    while running are single values (CAMERA.focal_length, the fixed frame size),
+    which a reload replaces one attribute at a time.
+    """
+    staged = _stage_overrides(overrides, startup)
+    with _lock:
+        for key, value in staged.items():
+            current = getattr(Config, key)
+            if dataclasses.is_dataclass(current):
+                # Update in place so modules holding the instance see the new values
+                for f in dataclasses.fields(value):
+                    setattr(current, f.name, getattr(value, f.name))
+            else:
+                setattr(Config, key, value)
+        names = _current.names if _current is not None else default_class_names()
+        version = _current.version + 1 if _current is not None else 0
+        runtime = compile_runtime_config(names, version)
+        _swap(runtime)
+    return runtime
+
+def load_settings(path: str, startup: bool = False) -> RuntimeConfig:
+    """Apply a JSON file of Config overrides; see apply_settings"""
+    with open(path) as f:
+        overrides = json.load(f)
+    if not isinstance(overrides, dict):
+        raise ValueError(f"Settings file {path} must contain an object")
+    return apply_settings(overrides, startup)
+
+class SettingsWatcher:
+    """Reloads a settings file whenever its modification time changes"""
+    def __init__(self, path: str, poll_interval_sec: Optional[float] = None):
+        """
+        Args:
+            path: JSON file of Config overrides
+            poll_interval_sec: Time between checks; by default Config.HOT_RELOAD's,
+                after the file itself was applied
+        """
+        self.path = path
+        self.poll_interval = poll_interval_sec
+        self.last_mtime: Optional[float] = None
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def check(self, startup: bool = False) -> bool:
+        """Reload if the file changed. Returns True when a new snapshot was installed."""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return False
+        if mtime == self.last_mtime:
+            return False
+        self.last_mtime = mtime
+
+        try:
+            runtime = load_settings(self.path, startup)
+        except (OSError, ValueError, TypeError) as e:
+            print(f"WARNING: Settings reload failed, keeping previous settings - {str(e)}")
+            return False
+        print(f"DEBUG: Reloaded settings from {self.path} (runtime config v{runtime.version})")
+        return True
+
+    def start(self) -> None:
+        """Apply the file now, before components are built, then keep watching it in the background"""
+        self.check(startup=True)
+        if self.poll_interval is None:
+            self.poll_interval = Config.HOT_RELOAD.poll_interval_sec
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._watch_loop, name='settings-watcher', daemon=True)
+        self.thread.start()
+
+    def _watch_loop(self) -> None:
+        while not self.stop_event.wait(self.poll_interval):
+            self.check()
+
+    def stop(self) -> None:
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=2.0)
@@ -2,7 +2,7 @@
 
 import os
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, Optional
 
 @dataclass
 class ObjectDimensions:
@@ -13,10 +13,11 @@ class ObjectDimensions:
 @dataclass
 class MotionConfig:
     """Configuration for motion detection thresholds"""
-    static_threshold: float  # pixels per frame
-    slow_threshold: float   # pixels per frame
+    static_threshold: float  # pixels per reference frame
+    slow_threshold: float   # pixels per reference frame
     smoothing_factor: float = 0.7  # Higher value = more smoothing (0-1)
     min_speed_threshold: float = 5.0  # Minimum speed to consider as movement
+    reference_fps: float = 10.0  # Live loop rate the thresholds were tuned at; speeds are per 1/reference_fps seconds
 
 @dataclass
 class CameraConfig:
@@ -38,6 +39,98 @@ class AudioConfig:
     cooldown_sec: float = 0.5
     static_cooldown_sec: float = 0.8  # Increased cooldown for static sound
     static_volume: float = 0.8  # Increased volume for static sound
+    sample_library_dir: Optional[str] = None  # Defaults to the front end's all-samples folder
+    sample_index_path: Optional[str] = None  # Defaults to ~/.cache/echosight/sample-index.json
+    sample_cache_mb: float = 64.0  # Upper bound for decoded samples kept in memory
+    profile_path: Optional[str] = None  # JSON sound profile (native or personalization form format)
+    sample_pack_path: Optional[str] = None  # Prebuilt pack (python -m detector_static.audio.pack), memory-mapped
+    backend: str = 'samples'  # 'samples' plays recordings, 'synth' generates tones procedurally
+    synth_block_ms: float = 40.0  # Synth render block; must exceed the 60 Hz audio tick
+    synth_max_voices: int = 4  # Closest objects that get their own synth voice
+    extrapolation_max_sec: float = 0.25  # Longest the audio thread extrapolates past a vision update, 0 disables
+    pan_smoothing: float = 0.3  # Fraction of the way to the predicted pan per 60 Hz tick
+    spatial_mode: str = 'stereo'  # 'binaural' renders azimuth and elevation with head-related kernels (synth backend)
+    binaural_kernel_size: int = 128  # Taps per ear
+
+@dataclass
+class InferenceConfig:
+    """Configuration for where YOLO inference runs"""
+    use_process_pool: bool = False  # Run inference in worker processes instead of in-process
+    num_workers: int = 1
+    max_frames_in_flight: int = 2  # Shared-memory ring slots; should be at least num_workers + 1
+    startup_timeout_sec: float = 60.0  # Time allowed for workers to load the model
+
+@dataclass
+class ServerConfig:
+    """Configuration for the remote stream server"""
+    host: str = '127.0.0.1'
+    port: int = 8765
+    max_sessions: int = 32
+    max_batch_size: int = 8  # Frames from different sessions per inference call
+    batch_window_ms: float = 5.0  # How long to wait for more sessions to join a batch
+    write_buffer_limit: int = 64 * 1024  # Unsent reply bytes before a session stops being served
+
+@dataclass
+class ProfilerConfig:
+    """Configuration for the built-in sampling profiler"""
+    output_dir: str = 'profiles'  # Collapsed-stack (.folded) files are written here
+    interval_ms: float = 5.0  # Time between stack samples
+    max_window_sec: float = 30.0  # Profiling stops by itself after this long
+    toggle_key: str = 'p'  # Key in the display window that starts/stops profiling
+    signal_toggle: bool = True  # Also toggle on SIGUSR1 (POSIX only)
+
+@dataclass
+class LatencyConfig:
+    """Configuration for glass-to-ear latency tracing"""
+    trace_path: Optional[str] = None  # JSON-lines file with one trace per frame
+    max_p95_ms: float = 250.0  # Replay benchmark fails above this end-to-end p95
+    regression_tolerance: float = 0.2  # Allowed p95 growth over a saved baseline
+
+@dataclass
+class SweepConfig:
+    """Configuration for offline tracker and motion parameter sweeps"""
+    switch_radius: float = 80.0  # A new track born this close to a recently lost one counts as an ID switch
+    switch_window: int = 15  # Frames a lost track stays eligible for that match
+
+@dataclass
+class GateConfig:
+    """Configuration for the frame-difference gate that skips inference on unchanged scenes"""
+    enabled: bool = False
+    scale_width: int = 160  # Width of the downscaled grayscale frame that is compared
+    block_size: int = 8  # Block edge in downscaled pixels
+    block_threshold: float = 12.0  # Mean absolute difference (0-255) for a block to count as changed
+    static_fraction: float = 0.01  # Below this share of changed blocks the scene is unchanged
+    roi_max_fraction: float = 0.35  # Up to this share, only the changed region is re-detected
+    roi_margin: int = 48  # Pixels added around the changed region before cropping
+    max_skipped_frames: int = 30  # Force a full pass at least this often
+
+@dataclass
+class DetectionConfig:
+    """Configuration for two-tier detection: low-res full frame plus high-res crops around tracks"""
+    roi_mode: bool = False
+    imgsz: int = 320  # Inference size shared by the full-frame pass and the crops
+    roi_max_crops: int = 8  # Crops per frame, smallest (most distant) tracks first
+    roi_scale: float = 1.6  # Crop edge relative to the track's last box
+    roi_min_crop: int = 96  # Smallest crop edge in pixels
+    roi_max_lost: int = 3  # Also re-detect around tracks missed for up to this many frames
+    merge_iou: float = 0.5  # Overlap at which full-frame and crop detections are merged
+
+@dataclass
+class CascadeConfig:
+    """Configuration for verifying uncertain nano-model tracks with a larger model"""
+    enabled: bool = False
+    model_path: str = 'yolov8m.pt'
+    run_async: bool = True  # Verify on a background thread; results arrive a few frames later
+    max_verifications_per_sec: float = 4.0
+    confirm_conf: float = 0.6  # Nano confidences below this are borderline
+    new_track_frames: int = 5  # Tracks younger than this are unconfirmed unless verified
+    crop_scale: float = 1.5  # Crop edge relative to the detection box
+
+@dataclass
+class HotReloadConfig:
+    """Configuration for reloading settings overrides while running"""
+    settings_path: Optional[str] = None  # JSON file of Config overrides, watched for changes
+    poll_interval_sec: float = 1.0
 
 class Config:
     """Global configuration container"""
@@ -45,6 +138,11 @@ class Config:
         'car', 'person', 'couch', 'chair', 'bed', 'dining table', 'plant'
     ]
 
+    # Classes always reported as static, whatever their measured speed
+    STATIONARY_CLASSES = [
+        'chair', 'couch', 'dining table', 'bed', 'tv', 'plant'
+    ]
+
     DIMENSIONS = ObjectDimensions(
         heights={
             'person': 170,
@@ -59,8 +157,8 @@ class Config:
     )
 
     MOTION = MotionConfig(
-        static_threshold=25,    # Need more movement to exit static state
-        slow_threshold=60,     # Lowered threshold - easier to trigger fast state
+        static_threshold=25,    # Need more movement to exit static state (pixels per reference frame)
+        slow_threshold=60,     # Lowered threshold - easier to trigger fast state (pixels per reference frame)
         smoothing_factor=0.7,   # 70% of previous speed + 30% of new speed
         min_speed_threshold=5.0 # Minimum speed to register as movement
     )
@@ -71,6 +169,24 @@ class Config:
 
     AUDIO = AudioConfig()
 
+    INFERENCE = InferenceConfig()
+
+    SERVER = ServerConfig()
+
+    PROFILER = ProfilerConfig()
+
+    LATENCY = LatencyConfig()
+
+    SWEEP = SweepConfig()
+
+    GATE = GateConfig()
+
+    DETECTION = DetectionConfig()
+
+    CASCADE = CascadeConfig()
+
+    HOT_RELOAD = HotReloadConfig()
+
     @classmethod
     def get_sound_paths(cls) -> tuple[str, str, str, str]:
         """Get paths to sound files"""
@@ -80,4 +196,19 @@ class Config:
             os.path.join(sound_dir, 'cello_A2_025_forte_arco-normal.mp3'),
             os.path.join(sound_dir, 'guitar_A3_very-long_piano_normal.mp3'),
             os.path.join(sound_dir, 'english-horn_A3_025_mezzo-forte_normal.mp3'),
-        ) 
\ No newline at end of file
+        ) 
+
+    @classmethod
+    def get_sample_library_dir(cls) -> str:
+        """Get the root of the instrument sample library"""
+        if cls.AUDIO.sample_library_dir:
+            return cls.AUDIO.sample_library_dir
+        repo_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        return os.path.join(repo_dir, 'personalization_fe', 'public', 'audio', 'all-samples')
+
+    @classmethod
+    def get_sample_index_path(cls) -> str:
+        """Get the location of the saved sample library index"""
+        if cls.AUDIO.sample_index_path:
+            return cls.AUDIO.sample_index_path
+        return os.path.join(os.path.expanduser('~'), '.cache', 'echosight', 'sample-index.json')
@@ -1,14 +1,20 @@
 """Main application module."""
 
+import argparse
 import cv2
-import time
 import sys
-from typing import List, Tuple
+from typing import List, Optional, Tuple, Union
 
 from ..config.settings import Config
-from ..core.detector import ObjectDetector
+from ..config.runtime import SettingsWatcher
+from ..core.detector import ObjectDetector, prepare_frame
+from ..core.inference import PooledObjectDetector
 from ..motion.analyzer import MotionAnalyzer
+from ..motion.gate import ChangeGate
 from ..visualization.display import Visualizer
+from ..utils.profiler import SamplingProfiler
+from ..utils.latency import FrameTrace, LatencyTracker
+from ..utils.clock import FrameClock, SystemClock
 from ..audio.engine import (
     create_smooth_audio_system, 
     play_sound_async_smooth,
@@ -18,20 +24,42 @@ from ..audio.engine import (
 
 class Application:
     """Main application class that coordinates all components"""
-    def __init__(self):
-        self.detector = ObjectDetector()
-        self.motion_analyzer = MotionAnalyzer()
+    def __init__(self, source: Union[int, str] = 0, display: bool = True,
+                 trace_path: Optional[str] = None,
+                 settings_path: Optional[str] = Config.HOT_RELOAD.settings_path):
+        """
+        Args:
+            source: Camera index or path to a video file
+            display: Show the annotated frames in a window
+            trace_path: Optional JSON-lines file receiving one latency trace per frame;
+                defaults to Config.LATENCY.trace_path after the settings file is applied
+            settings_path: Optional JSON file of Config overrides, reloaded whenever it changes
+        """
+        self.source = source
+        self.display = display
+        # Apply overrides before anything reads Config, then keep watching the file
+        self.settings_watcher = SettingsWatcher(settings_path) if settings_path else None
+        if self.settings_watcher is not None:
+            self.settings_watcher.start()
+        # Video files run on their own timestamps, so replay speed does not change results
+        self.clock = FrameClock() if isinstance(source, str) else SystemClock()
+        if Config.INFERENCE.use_process_pool:
+            self.detector = PooledObjectDetector(clock=self.clock)
+        else:
+            self.detector = ObjectDetector(clock=self.clock)
+        self.motion_analyzer = MotionAnalyzer(clock=self.clock)
         self.visualizer = Visualizer()
+        self.change_gate = ChangeGate() if Config.GATE.enabled else None
         
-        # Initialize camera
-        self.cap = cv2.VideoCapture(0)
+        # Initialize camera or video file
+        self.cap = cv2.VideoCapture(source)
         if not self.cap.isOpened():
-            raise RuntimeError('Error: Could not open camera.')
+            raise RuntimeError(f'Error: Could not open video source {source}.')
             
         # Initialize audio
         sound_dir, _, _, _ = Config.get_sound_paths()
         try:
-            self.audio_engine = create_smooth_audio_system(sound_dir)
+            self.audio_engine = create_smooth_audio_system(sound_dir, Config.AUDIO.profile_path, self.clock)
             self.audio_enabled = True
         except (AudioInitializationError, SoundFileError) as e:
             print(f"WARNING: Audio system disabled - {str(e)}")
@@ -43,37 +71,86 @@ class Application:
         
         # State tracking
         self.current_dominant_motion = None
-        self.last_sound_play_time = time.time()
+        self.last_sound_play_time = self.clock.now()
+        self.frame_count = 0
+        
+        # Glass-to-ear latency tracing
+        self.latency_tracker = LatencyTracker(trace_path if trace_path is not None else Config.LATENCY.trace_path)
+        if self.audio_enabled:
+            self.audio_engine.latency_tracker = self.latency_tracker
+        
+        # Sampling profiler, idle until toggled by key or signal
+        self.profiler = SamplingProfiler()
+        self.profiler.register_thread('vision')
+        if self.audio_enabled:
+            self.profiler.register_thread('audio', self.audio_engine.audio_thread)
+        if Config.PROFILER.signal_toggle:
+            self.profiler.install_signal_handler()
         
     def process_frame(self) -> bool:
         """Process a single frame. Returns False if should exit."""
         # Capture frame
         ret, frame = self.cap.read()
         if not ret:
-            print('Error: Failed to capture frame')
+            if isinstance(self.source, str):
+                print('End of video')
+            else:
+                print('Error: Failed to capture frame')
             return False
+        if isinstance(self.clock, FrameClock):
+            self.clock.set(self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0)
+        
+        # Tag the frame with its capture time
+        trace = FrameTrace(self.frame_count)
+        self.frame_count += 1
+            
+        # Convert to grayscale for change gating and motion analysis
+        frame_resized = prepare_frame(frame)
+        gray = cv2.cvtColor(frame_resized, cv2.COLOR_BGR2GRAY)
+        change = self.change_gate.update(gray) if self.change_gate is not None else None
             
         # Detect and track objects
-        tracked_objects, frame_resized = self.detector.detect_and_track(frame)
+        with trace.stage('detect'):
+            if change is not None and not change.changed:
+                # Unchanged scene: reuse the last detections, but keep the tracker in step
+                tracked_objects, result_frame = self.detector.track_unchanged(frame_resized, trace)
+            elif change is not None and change.localized:
+                tracked_objects, result_frame = self.detector.detect_and_track_region(
+                    frame_resized, change.roi, trace=trace)
+            else:
+                tracked_objects, result_frame = self.detector.detect_and_track(frame_resized, trace)
         
-        # Convert to grayscale for motion analysis
-        gray = cv2.cvtColor(frame_resized, cv2.COLOR_BGR2GRAY)
+        if result_frame is not frame_resized:
+            # Pipelined detectors answer for an earlier frame
+            frame_resized = result_frame
+            gray = cv2.cvtColor(frame_resized, cv2.COLOR_BGR2GRAY)
         
         # Analyze motion
-        self.motion_analyzer.estimate_camera_motion(gray)
-        frame_dominant_motion, distances, x_positions = self.motion_analyzer.analyze_object_motion(tracked_objects)
+        with trace.stage('motion'):
+            if change is not None and not change.changed:
+                # Nothing changed, so the camera did not move either
+                self.motion_analyzer.assume_still_camera(gray)
+            else:
+                # A localized change can still be a small pan of a handheld camera
+                self.motion_analyzer.estimate_camera_motion(gray)
+            frame_dominant_motion, distances, x_positions = self.motion_analyzer.analyze_object_motion(
+                tracked_objects, scene_static=change is not None and not change.changed)
         
         # Update visualization
-        frame_resized = self.visualizer.draw_results(frame_resized, tracked_objects)
+        if self.display:
+            with trace.stage('visualize'):
+                frame_resized = self.visualizer.draw_results(frame_resized, tracked_objects)
         
         # Update audio if enabled
         if self.audio_enabled:
-            current_time = time.time()
+            current_time = self.clock.now()
             has_objects = bool(tracked_objects)
             
-            # Always update the smooth audio system with x positions for stereo
-            play_sound_async_smooth(self.audio_engine, frame_dominant_motion, 
-                                 distances, has_objects, x_positions)
+            # Always update the smooth audio system with x positions for stereo;
+            # the audio thread completes the trace when it applies the change
+            with trace.stage('audio_submit'):
+                play_sound_async_smooth(self.audio_engine, frame_dominant_motion, 
+                                        distances, has_objects, x_positions, tracked_objects, trace)
             
             # Update timing for compatibility
             if frame_dominant_motion != self.current_dominant_motion and has_objects:
@@ -84,12 +161,20 @@ class Application:
             if not has_objects and self.current_dominant_motion != 'none':
                 self.current_dominant_motion = 'none'
                 print(f"  Smooth audio fading to silence (no objects detected).")
+        else:
+            self.latency_tracker.complete(trace)
+        
+        if not self.display:
+            return True
         
         # Display results
         cv2.imshow('Detection & Motion', frame_resized)
         
-        # Check for exit
-        return cv2.waitKey(1) & 0xFF != ord('q')
+        # Check for profiler toggle and exit
+        key = cv2.waitKey(1) & 0xFF
+        if key == ord(Config.PROFILER.toggle_key):
+            self.profiler.toggle()
+        return key != ord('q')
     
     def run(self):
         """Main application loop"""
@@ -101,19 +186,41 @@ class Application:
     
     def cleanup(self):
         """Clean up resources"""
+        if self.profiler.running:
+            self.profiler.stop()
+            self.profiler.sampler.join(timeout=2.0)
+        
         if self.audio_enabled:
             try:
                 self.audio_engine.cleanup()
             except Exception as e:
                 print(f"WARNING: Error during audio cleanup - {str(e)}")
         
+        if self.settings_watcher is not None:
+            self.settings_watcher.stop()
+        
+        self.detector.close()
         self.cap.release()
-        cv2.destroyAllWindows()
+        self.latency_tracker.close()
+        if self.display:
+            cv2.destroyAllWindows()
+
+def parse_source(source: str) -> Union[int, str]:
+    """Camera index if the argument is numeric, otherwise a video path"""
+    return int(source) if source.isdigit() else source
 
 def main():
     """Application entry point"""
+    parser = argparse.ArgumentParser(description='EchoSight static detector')
+    parser.add_argument('--source', default='0', help='Camera index or video file')
+    parser.add_argument('--trace', default=None,
+                        help='Write per-frame latency traces to this JSON-lines file')
+    parser.add_argument('--settings', default=Config.HOT_RELOAD.settings_path,
+                        help='JSON file of Config overrides, reloaded while running')
+    args = parser.parse_args()
+
     try:
-        app = Application()
+        app = Application(parse_source(args.source), trace_path=args.trace, settings_path=args.settings)
         app.run()
     except KeyboardInterrupt:
         print("\nApplication stopped by user")
@@ -0,0 +1,118 @@
+"""Confidence-driven model cascade.
+
+The nano model runs on every frame. Crops of new, unconfirmed tracks and of
+borderline-confidence detections are sent to a larger model, on a background
+thread and within a verifications-per-second budget. Its verdicts become the
+track's class label, or drop the track if the larger model sees nothing there.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+from ultralytics import YOLO
+
+from ..config.settings import Config
+from ..config.runtime import get_runtime_config
+from ..utils.clock import Clock, SystemClock
+
+@dataclass
+class Verdict:
+    """Larger model's answer for one track"""
+    object_id: int
+    class_name: Optional[str]  # None if no target object was found in the crop
+    confidence: float
+
+class VerificationBudget:
+    """Token bucket limiting verifications per second"""
+    def __init__(self, rate: float, clock: Optional[Clock] = None):
+        self.rate = rate
+        self.clock = clock if clock is not None else SystemClock()
+        self.tokens = rate
+        self.last_refill = self.clock.now()
+
+    def try_take(self) -> bool:
+        now = self.clock.now()
+        self.tokens = min(self.rate, self.tokens + max(0.0, now - self.last_refill) * self.rate)
+        self.last_refill = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+class CascadeVerifier:
+    """Runs the larger model on track crops, asynchronously or inline"""
+    def __init__(self, model_path: Optional[str] = None,
+                 run_async: Optional[bool] = None,
+                 max_per_sec: Optional[float] = None,
+                 clock: Optional[Clock] = None):
+        """Arguments left as None are read from Config.CASCADE"""
+        cfg = Config.CASCADE
+        self.model_path = model_path if model_path is not None else cfg.model_path
+        self.run_async = run_async if run_async is not None else cfg.run_async
+        self.budget = VerificationBudget(max_per_sec if max_per_sec is not None else cfg.max_verifications_per_sec,
+                                         clock)
+        self.model: Optional[YOLO] = None
+        self.model_lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='cascade') if self.run_async else None
+        self.pending: Dict[int, Future] = {}
+        self.ready: List[Verdict] = []
+
+    def _load_model(self) -> YOLO:
+        with self.model_lock:
+            if self.model is None:
+                self.model = YOLO(self.model_path)
+                print(f"DEBUG: Cascade model {self.model_path} loaded")
+            return self.model
+
+    def _verify(self, object_id: int, crop: np.ndarray) -> Verdict:
+        """Best target detection of the larger model inside a crop"""
+        model = self._load_model()
+        results = model(cv2.cvtColor(crop, cv2.COLOR_BGR2RGB), verbose=False)
+        runtime = get_runtime_config()
+        best_name, best_conf = None, 0.0
+        for box in results[0].boxes:
+            class_name = model.model.names[int(box.cls[0])]
+            conf = float(box.conf[0])
+            if runtime.is_target(class_name) and conf > best_conf:
+                best_name, best_conf = class_name, conf
+        return Verdict(object_id, best_name, best_conf)
+
+    def request(self, object_id: int, crop: np.ndarray) -> bool:
+        """Ask for a verdict on a track. Returns False if over budget or already pending."""
+        if object_id in self.pending or crop.size == 0 or not self.budget.try_take():
+            return False
+
+        if self.run_async:
+            self.pending[object_id] = self.executor.submit(self._verify, object_id, crop.copy())
+        else:
+            self.ready.append(self._verify(object_id, crop))
+        return True
+
+    def poll(self) -> List[Verdict]:
+        """Collect finished verdicts"""
+        verdicts, self.ready = self.ready, []
+        for object_id, future in list(self.pending.items()):
+            if future.done():
+                del self.pending[object_id]
+                try:
+                    verdicts.append(future.result())
+                except Exception as e:
+                    print(f"WARNING: Cascade verification of object {object_id} failed - {str(e)}")
+        return verdicts
+
+    def close(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+def crop_around(frame: np.ndarray, bbox: Tuple[int, int, int, int], scale: float) -> np.ndarray:
+    """Crop a box enlarged by scale around its center, clipped to the frame"""
+    x1, y1, x2, y2 = bbox
+    cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+    half_w, half_h = (x2 - x1) * scale / 2, (y2 - y1) * scale / 2
+    height, width = frame.shape[:2]
+    return frame[max(0, int(cy - half_h)):min(height, int(cy + half_h)),
+                 max(0, int(cx - half_w)):min(width, int(cx + half_w))]
@@ -3,59 +3,351 @@
 import cv2
 import numpy as np
 from ultralytics import YOLO
-from typing import List, Tuple, Dict
+from typing import List, Optional, Sequence, Set, Tuple, Dict
 
 from ..config.settings import Config
+from ..config.runtime import get_runtime_config, set_class_names
 from ..utils.types import TrackedObject
+from ..utils.latency import FrameTrace
+from ..utils.clock import Clock, SystemClock
 from ..motion.tracker import CentroidTracker
+from .cascade import CascadeVerifier, Verdict, crop_around
+
+# Column layout of the compact detection arrays: x1, y1, x2, y2, confidence, class id
+DETECTION_COLUMNS = 6
+
+def empty_detections() -> np.ndarray:
+    """Return an empty (0, 6) detection array"""
+    return np.zeros((0, DETECTION_COLUMNS), dtype=np.float32)
+
+def prepare_frame(frame: np.ndarray) -> np.ndarray:
+    """Resize a camera frame to the configured processing resolution; prepared frames pass through"""
+    size = (Config.CAMERA.frame_width, Config.CAMERA.frame_height)
+    if frame.shape[1::-1] == size:
+        return frame
+    return cv2.resize(frame, size)
+
+def filter_targets(detections: np.ndarray, target_mask: np.ndarray) -> np.ndarray:
+    """Keep compact detections whose class id is set in a runtime target mask"""
+    cls = detections[:, 5].astype(np.int64)
+    keep = (cls >= 0) & (cls < len(target_mask))
+    keep[keep] = target_mask[cls[keep]]
+    return detections[keep]
+
+def results_to_array(result, target_mask: Optional[np.ndarray]) -> np.ndarray:
+    """Convert one ultralytics result into a compact (N, 6) float32 array of target detections; a mask of None keeps every class"""
+    boxes = result.boxes
+    if boxes is None or len(boxes) == 0:
+        return empty_detections()
+
+    xyxy = boxes.xyxy.cpu().numpy()
+    conf = boxes.conf.cpu().numpy()
+    cls = boxes.cls.cpu().numpy()
+
+    detections = np.empty((len(cls), DETECTION_COLUMNS), dtype=np.float32)
+    detections[:, 0:4] = xyxy
+    detections[:, 4] = conf
+    detections[:, 5] = cls
+    if target_mask is not None:
+        detections = filter_targets(detections, target_mask)
+    return detections
+
+def box_iou(box: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    """IoU of one x1, y1, x2, y2 box against an (N, 4) array of boxes"""
+    ix1 = np.maximum(box[0], boxes[:, 0])
+    iy1 = np.maximum(box[1], boxes[:, 1])
+    ix2 = np.minimum(box[2], boxes[:, 2])
+    iy2 = np.minimum(box[3], boxes[:, 3])
+    intersection = np.clip(ix2 - ix1, 0, None) * np.clip(iy2 - iy1, 0, None)
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    return intersection / np.maximum(area + areas - intersection, 1e-6)
+
+def merge_detections(detections: np.ndarray, iou_threshold: float) -> np.ndarray:
+    """Greedy per-class non-maximum suppression over compact detections"""
+    if len(detections) < 2:
+        return detections
+
+    keep = []
+    order = np.argsort(-detections[:, 4])
+    suppressed = np.zeros(len(detections), dtype=bool)
+    for i in order:
+        if suppressed[i]:
+            continue
+        keep.append(i)
+        same_class = detections[:, 5] == detections[i, 5]
+        overlaps = box_iou(detections[i, :4], detections[:, :4]) > iou_threshold
+        suppressed |= same_class & overlaps
+    return detections[np.sort(keep)]
 
 class ObjectDetector:
     """Handles object detection and tracking using YOLOv8"""
-    def __init__(self, model_path: str = 'yolov8n.pt'):
-        self.model = YOLO(model_path)
-        self.tracker = CentroidTracker()
-        
-    def detect_and_track(self, frame: np.ndarray) -> Tuple[List[TrackedObject], np.ndarray]:
-        """Detect objects in frame and track them"""
-        # Prepare frame
-        frame_resized = cv2.resize(frame, (Config.CAMERA.frame_width, Config.CAMERA.frame_height))
+    def __init__(self, model_path: str = 'yolov8n.pt', load_model: bool = True,
+                 clock: Optional[Clock] = None):
+        self.model = YOLO(model_path) if load_model else None
+        self.clock = clock if clock is not None else SystemClock()
+        self.tracker = CentroidTracker(clock=self.clock)
+        self.names = dict(self.model.model.names) if self.model is not None else {}
+        self.last_detections = empty_detections()
+        self.track_sizes: Dict[int, Tuple[float, float]] = {}  # object id -> last box width, height
+
+        # Model cascade: labels confirmed per track, by the larger model or by persistence
+        self.cascade = CascadeVerifier(clock=self.clock) if Config.CASCADE.enabled else None
+        self.track_ages: Dict[int, int] = {}
+        self.track_labels: Dict[int, str] = {}
+        self.rejected_ids: Set[int] = set()
+        self.verdicts: Dict[int, Verdict] = {}
+
+    @property
+    def names(self) -> Dict[int, str]:
+        return self._names
+
+    @names.setter
+    def names(self, names: Dict[int, str]) -> None:
+        """Model class names; the runtime config tables are compiled for these ids"""
+        self._names = dict(names)
+        if self._names:
+            set_class_names(self._names)
+
+    def detect(self, frame_resized: np.ndarray, all_classes: bool = False) -> np.ndarray:
+        """
+        Run the model on an already resized BGR frame and return compact detections.
+
+        Args:
+            frame_resized: Frame at processing resolution
+            all_classes: Keep every class instead of only the runtime target classes
+        """
         img_rgb = cv2.cvtColor(frame_resized, cv2.COLOR_BGR2RGB)
-        
-        # Run detection
         results = self.model(img_rgb, verbose=False)
-        
+        return results_to_array(results[0], None if all_classes else get_runtime_config().target_mask)
+
+    def detect_batch(self, frames_resized: Sequence[np.ndarray]) -> List[np.ndarray]:
+        """Run the model once on several resized BGR frames"""
+        if not frames_resized:
+            return []
+        images = [cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) for frame in frames_resized]
+        results = self.model(images, verbose=False)
+        target_mask = get_runtime_config().target_mask
+        return [results_to_array(result, target_mask) for result in results]
+
+    def _roi_crops(self, frame_resized: np.ndarray,
+                   region: Optional[Tuple[int, int, int, int]] = None) -> List[Tuple[int, int, int, int]]:
+        """Crop windows around the predicted positions of active tracks, clipped to a region if given"""
+        height, width = frame_resized.shape[:2]
+        cfg = Config.DETECTION
+        candidates = []
+        for object_id, tracked_point in self.tracker.objects.items():
+            if tracked_point.lost_count > cfg.roi_max_lost or object_id not in self.track_sizes:
+                continue
+            box_w, box_h = self.track_sizes[object_id]
+            cx, cy = self.tracker.predict_new_position(tracked_point)
+            side = max(cfg.roi_min_crop, cfg.roi_scale * max(box_w, box_h))
+            candidates.append((box_w * box_h, cx, cy, side))
+
+        crops = []
+        for _, cx, cy, side in sorted(candidates)[:cfg.roi_max_crops]:
+            x1 = int(np.clip(cx - side / 2, 0, max(0, width - side)))
+            y1 = int(np.clip(cy - side / 2, 0, max(0, height - side)))
+            x2, y2 = min(width, int(x1 + side)), min(height, int(y1 + side))
+            if region is not None:
+                x1, y1 = max(x1, region[0]), max(y1, region[1])
+                x2, y2 = min(x2, region[2]), min(y2, region[3])
+            if x2 - x1 >= 8 and y2 - y1 >= 8:
+                crops.append((x1, y1, x2, y2))
+        return crops
+
+    def detect_with_rois(self, frame_resized: np.ndarray,
+                         region: Optional[Tuple[int, int, int, int]] = None) -> np.ndarray:
+        """
+        Two-tier detection in one batched model call.
+
+        The full frame is run at the low Config.DETECTION.imgsz, which finds new
+        objects cheaply. Crops around existing tracks run at the same size, so
+        each one keeps close to native resolution where small or distant objects
+        need it. Crop boxes are shifted back to frame coordinates and merged
+        with the full-frame boxes. With a region, both tiers are limited to it.
+        """
+        height, width = frame_resized.shape[:2]
+        rx1, ry1, rx2, ry2 = region if region is not None else (0, 0, width, height)
+        crops = self._roi_crops(frame_resized, region)
+        images = [cv2.cvtColor(frame_resized[ry1:ry2, rx1:rx2], cv2.COLOR_BGR2RGB)]
+        images += [cv2.cvtColor(frame_resized[y1:y2, x1:x2], cv2.COLOR_BGR2RGB) for x1, y1, x2, y2 in crops]
+
+        results = self.model(images, imgsz=Config.DETECTION.imgsz, verbose=False)
+
+        target_mask = get_runtime_config().target_mask
+        region_detections = results_to_array(results[0], target_mask)
+        region_detections[:, [0, 2]] += rx1
+        region_detections[:, [1, 3]] += ry1
+        all_detections = [region_detections]
+        for (x1, y1, _, _), result in zip(crops, results[1:]):
+            crop_detections = results_to_array(result, target_mask)
+            crop_detections[:, [0, 2]] += x1
+            crop_detections[:, [1, 3]] += y1
+            all_detections.append(crop_detections)
+
+        return merge_detections(np.concatenate(all_detections), Config.DETECTION.merge_iou)
+
+    def track_detections(self, detections: np.ndarray,
+                         tracker: Optional[CentroidTracker] = None,
+                         timestamp: Optional[float] = None) -> List[TrackedObject]:
+        """Feed compact detections through a centroid tracker and build tracked objects"""
+        tracker = tracker if tracker is not None else self.tracker
+
         # Process detections
         raw_detections_info = []
-        for box in results[0].boxes:
-            cls_id = int(box.cls[0])
-            class_name = self.model.model.names[cls_id]
-            
-            if class_name in Config.TARGET_CLASSES:
-                x1, y1, x2, y2 = map(int, box.xyxy[0])
-                conf = float(box.conf[0])
-                x_center = (x1 + x2) // 2
-                y_center = (y1 + y2) // 2
-                raw_detections_info.append(((x1, y1, x2, y2), class_name, conf, (x_center, y_center)))
-        
+        for x1, y1, x2, y2, conf, cls_id in detections:
+            x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
+            class_name = self.names.get(int(cls_id), str(int(cls_id)))
+            x_center = (x1 + x2) // 2
+            y_center = (y1 + y2) // 2
+            raw_detections_info.append(((x1, y1, x2, y2), class_name, float(conf), (x_center, y_center), int(cls_id)))
+
         # Update tracking
         current_frame_centers = [info[3] for info in raw_detections_info]
-        tracked_objects_output = self.tracker.update(current_frame_centers)
-        
+        tracked_objects_output = tracker.update(current_frame_centers, timestamp)
+
         # Create tracked objects
         tracked_objects: List[TrackedObject] = []
-        center_to_raw_info = {info[3]: (info[0], info[1], info[2]) for info in raw_detections_info}
-        
+        center_to_raw_info = {info[3]: (info[0], info[1], info[2], info[4]) for info in raw_detections_info}
+
         for object_id, current_tracked_center in tracked_objects_output:
             if current_tracked_center not in center_to_raw_info:
                 continue
-                
-            bbox, class_name, conf = center_to_raw_info[current_tracked_center]
+
+            bbox, class_name, conf, class_id = center_to_raw_info[current_tracked_center]
+            if tracker is self.tracker:
+                self.track_sizes[object_id] = (bbox[2] - bbox[0], bbox[3] - bbox[1])
+            velocity = tracker.objects[object_id].velocity if object_id in tracker.objects else (0.0, 0.0)
             tracked_objects.append(TrackedObject(
                 object_id=object_id,
                 center=current_tracked_center,
                 class_name=class_name,
                 confidence=conf,
-                bbox=bbox
+                bbox=bbox,
+                velocity=(float(velocity[0]), float(velocity[1])),
+                class_id=class_id
             ))
-        
-        return tracked_objects, frame_resized 
\ No newline at end of file
+
+        if tracker is self.tracker:
+            self.track_sizes = {oid: size for oid, size in self.track_sizes.items() if oid in tracker.objects}
+        return tracked_objects
+
+    def apply_cascade(self, frame_resized: np.ndarray,
+                      tracked_objects: List[TrackedObject]) -> List[TrackedObject]:
+        """
+        Apply the larger model's verdicts and queue uncertain tracks for verification.
+
+        A track is uncertain while it is younger than Config.CASCADE.new_track_frames
+        or its nano confidence is borderline. A verified label replaces the nano
+        label for the rest of the track's life. A borderline track the larger model
+        finds nothing in is dropped; a confident track that survives its first
+        frames is confirmed with its own label.
+        """
+        if self.cascade is None:
+            return tracked_objects
+
+        cfg = Config.CASCADE
+        runtime = get_runtime_config()
+        for verdict in self.cascade.poll():
+            self.verdicts[verdict.object_id] = verdict
+
+        kept = []
+        for obj in tracked_objects:
+            object_id = obj.object_id
+            age = self.track_ages.get(object_id, 0) + 1
+            self.track_ages[object_id] = age
+            borderline = obj.confidence < cfg.confirm_conf
+
+            verdict = self.verdicts.pop(object_id, None)
+            if verdict is not None:
+                if verdict.class_name is not None:
+                    self.track_labels[object_id] = verdict.class_name
+                elif borderline:
+                    self.rejected_ids.add(object_id)
+
+            if object_id in self.rejected_ids:
+                continue
+            if object_id in self.track_labels:
+                obj.class_name = self.track_labels[object_id]
+                obj.class_id = runtime.class_id(obj.class_name)
+            elif borderline or age < cfg.new_track_frames:
+                self.cascade.request(object_id, crop_around(frame_resized, obj.bbox, cfg.crop_scale))
+            else:
+                self.track_labels[object_id] = obj.class_name
+            kept.append(obj)
+
+        # Forget tracks the tracker has deregistered
+        live = self.tracker.objects
+        self.track_ages = {oid: age for oid, age in self.track_ages.items() if oid in live}
+        self.track_labels = {oid: label for oid, label in self.track_labels.items() if oid in live}
+        self.rejected_ids &= set(live)
+        self.verdicts = {oid: verdict for oid, verdict in self.verdicts.items() if oid in live}
+        return kept
+
+    def detect_and_track(self, frame: np.ndarray,
+                         trace: Optional[FrameTrace] = None) -> Tuple[List[TrackedObject], np.ndarray]:
+        """Detect objects in frame and track them"""
+        frame_resized = prepare_frame(frame)
+        if Config.DETECTION.roi_mode:
+            detections = self.detect_with_rois(frame_resized)
+        else:
+            detections = self.detect(frame_resized)
+        self.last_detections = detections
+        return self.apply_cascade(frame_resized, self.track_detections(detections)), frame_resized
+
+    def track_unchanged(self, frame_resized: np.ndarray,
+                        trace: Optional[FrameTrace] = None) -> Tuple[List[TrackedObject], np.ndarray]:
+        """
+        Advance tracking on a frame the change gate skipped.
+
+        The last detections are fed to the tracker again, so the track of an
+        object that stopped loses its velocity instead of coasting away from it
+        until the next full pass.
+        """
+        return self.apply_cascade(frame_resized, self.track_detections(self.last_detections)), frame_resized
+
+    def detect_and_track_region(self, frame_resized: np.ndarray, roi: Tuple[int, int, int, int],
+                                margin: Optional[int] = None,
+                                trace: Optional[FrameTrace] = None) -> Tuple[List[TrackedObject], np.ndarray]:
+        """
+        Re-detect only inside a changed region of an already resized frame.
+
+        Previous detections outside the region are kept; those overlapping it are
+        replaced by what the model finds in the crop. The region grows to cover
+        every overlapping previous box so no object is cut in half. In
+        Config.DETECTION.roi_mode the region gets the two-tier pass, with track
+        crops clipped to it.
+        """
+        height, width = frame_resized.shape[:2]
+        margin = margin if margin is not None else Config.GATE.roi_margin
+        x1, y1, x2, y2 = roi
+        x1, y1 = max(0, x1 - margin), max(0, y1 - margin)
+        x2, y2 = min(width, x2 + margin), min(height, y2 + margin)
+
+        previous = self.last_detections
+        overlapping = ((previous[:, 0] < x2) & (previous[:, 2] > x1) &
+                       (previous[:, 1] < y2) & (previous[:, 3] > y1))
+        if overlapping.any():
+            x1 = int(min(x1, previous[overlapping, 0].min()))
+            y1 = int(min(y1, previous[overlapping, 1].min()))
+            x2 = int(max(x2, previous[overlapping, 2].max()))
+            y2 = int(max(y2, previous[overlapping, 3].max()))
+            x1, y1 = max(0, x1), max(0, y1)
+            x2, y2 = min(width, x2), min(height, y2)
+
+        if Config.DETECTION.roi_mode:
+            crop_detections = self.detect_with_rois(frame_resized, (x1, y1, x2, y2))
+        else:
+            crop_detections = self.detect(frame_resized[y1:y2, x1:x2])
+            crop_detections[:, [0, 2]] += x1
+            crop_detections[:, [1, 3]] += y1
+
+        detections = np.concatenate([previous[~overlapping], crop_detections])
+        self.last_detections = detections
+        return self.apply_cascade(frame_resized, self.track_detections(detections)), frame_resized
+
+    def close(self) -> None:
+        """Release detector resources"""
+        if self.cascade is not None:
+            self.cascade.close()
@@ -0,0 +1,360 @@
+"""Process-pool inference with shared-memory frame transport.
+
+Frames are copied into a ring of ``multiprocessing.shared_memory`` slots and
+only the slot index travels over the task queue. Workers answer with compact
+(N, 6) float32 detection arrays of every class, so no image is ever pickled
+and target classes applied in the parent take effect immediately.
+"""
+
+import multiprocessing as mp
+import queue
+import time
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..config.settings import Config
+from ..config.runtime import get_runtime_config
+from ..utils.types import TrackedObject
+from ..utils.latency import FrameTrace
+from ..utils.clock import Clock
+from .detector import ObjectDetector, prepare_frame, empty_detections, filter_targets
+
+class InferenceWorkerError(Exception):
+    """Exception raised when inference workers fail to start or crash."""
+    pass
+
+class SharedFrameRing:
+    """Fixed number of equally shaped uint8 frame slots in one shared memory block"""
+    def __init__(self, slots: int, shape: Tuple[int, ...], name: Optional[str] = None):
+        self.slots = slots
+        self.shape = tuple(shape)
+        self.slot_size = int(np.prod(self.shape))
+        self.owner = name is None
+
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=self.slot_size * slots)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+
+        self.buffer = np.ndarray((slots,) + self.shape, dtype=np.uint8, buffer=self.shm.buf)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def write(self, slot: int, frame: np.ndarray) -> None:
+        """Copy a frame into a slot"""
+        np.copyto(self.buffer[slot], frame)
+
+    def read(self, slot: int) -> np.ndarray:
+        """Return a private copy of a slot"""
+        return self.buffer[slot].copy()
+
+    def close(self) -> None:
+        """Detach from the shared memory block and free it if we created it"""
+        # Drop the numpy view first, otherwise the buffer cannot be released
+        self.buffer = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+def _inference_worker(worker_index: int, model_path: str, ring_name: str, slots: int,
+                      shape: Tuple[int, ...], task_queue, result_queue) -> None:
+    """
+    Worker process loop: read frames from the ring, answer with compact detections.
+
+    Workers never see settings applied in the parent, so they return every
+    class and the parent filters with its current target classes.
+    """
+    try:
+        ring = SharedFrameRing(slots, shape, name=ring_name)
+        detector = ObjectDetector(model_path)
+    except Exception as e:
+        result_queue.put(('error', worker_index, -1, f"worker startup failed: {str(e)}"))
+        return
+
+    result_queue.put(('ready', worker_index, -1, detector.names))
+
+    try:
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+
+            seq, slot = task
+            try:
+                detections = detector.detect(ring.buffer[slot], all_classes=True)
+                result_queue.put(('result', seq, slot, detections))
+            except Exception as e:
+                result_queue.put(('error', seq, slot, str(e)))
+    finally:
+        ring.close()
+
+class InferenceWorkerPool:
+    """Runs YOLO inference in worker processes fed from a shared-memory frame ring"""
+    def __init__(self, model_path: str = 'yolov8n.pt',
+                 num_workers: Optional[int] = None,
+                 slots: Optional[int] = None,
+                 shape: Optional[Tuple[int, ...]] = None):
+        """Arguments left as None are read from Config.INFERENCE and Config.CAMERA"""
+        if num_workers is None:
+            num_workers = Config.INFERENCE.num_workers
+        if slots is None:
+            slots = Config.INFERENCE.max_frames_in_flight
+        if shape is None:
+            shape = (Config.CAMERA.frame_height, Config.CAMERA.frame_width, 3)
+
+        self.ring = SharedFrameRing(slots, shape)
+        self.free_slots: List[int] = list(range(slots))
+        self.next_seq = 0
+        self.names: Dict[int, str] = {}
+
+        # Spawn keeps the workers free of the parent's camera, window and mixer handles
+        ctx = mp.get_context('spawn')
+        self.task_queue = ctx.Queue()
+        self.result_queue = ctx.Queue()
+        self.workers = [
+            ctx.Process(
+                target=_inference_worker,
+                args=(i, model_path, self.ring.name, slots, self.ring.shape,
+                      self.task_queue, self.result_queue),
+                daemon=True
+            )
+            for i in range(num_workers)
+        ]
+        for worker in self.workers:
+            worker.start()
+
+        try:
+            self._wait_until_ready(Config.INFERENCE.startup_timeout_sec)
+        except Exception:
+            self.close()
+            raise
+
+    def _wait_until_ready(self, timeout: float) -> None:
+        """Block until every worker has loaded its model"""
+        ready = 0
+        while ready < len(self.workers):
+            try:
+                kind, _, _, payload = self.result_queue.get(timeout=timeout)
+            except queue.Empty:
+                raise InferenceWorkerError(f"Inference workers not ready after {timeout:.0f}s")
+
+            if kind == 'error':
+                raise InferenceWorkerError(payload)
+            if kind == 'ready':
+                self.names = payload
+                ready += 1
+
+        print(f"DEBUG: {ready} inference worker(s) ready")
+
+    @property
+    def in_flight(self) -> int:
+        return self.ring.slots - len(self.free_slots)
+
+    def submit(self, frame_resized: np.ndarray) -> Optional[int]:
+        """Queue a frame for inference. Returns its sequence number, or None if the ring is full."""
+        if not self.free_slots:
+            return None
+
+        slot = self.free_slots.pop(0)
+        self.ring.write(slot, frame_resized)
+
+        seq = self.next_seq
+        self.next_seq += 1
+        self.task_queue.put((seq, slot))
+        return seq
+
+    def collect(self, timeout: Optional[float] = 0.0) -> Optional[Tuple[int, np.ndarray, np.ndarray]]:
+        """
+        Fetch one finished result.
+
+        Args:
+            timeout: Seconds to wait, 0 to poll, None to block
+
+        Returns:
+            Tuple of (seq, frame, detections), or None if nothing finished in time.
+            The frame is a private copy and the ring slot is free again.
+        """
+        try:
+            if timeout == 0.0:
+                kind, seq, slot, payload = self.result_queue.get_nowait()
+            else:
+                kind, seq, slot, payload = self.result_queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+        frame = self.ring.read(slot)
+        self.free_slots.append(slot)
+
+        if kind == 'error':
+            print(f"WARNING: Inference failed for frame {seq} - {payload}")
+            return seq, frame, empty_detections()
+        return seq, frame, payload
+
+    def cancel_pending(self, timeout: float = 2.0) -> int:
+        """
+        Cancel frames no worker has started and wait for the ones being processed.
+
+        Every ring slot is free afterwards unless a worker hung past the timeout.
+
+        Returns:
+            Number of frames whose results were discarded
+        """
+        discarded = 0
+        while True:
+            try:
+                # A short wait lets the queue's feeder thread flush tasks submitted just before
+                _, slot = self.task_queue.get(timeout=0.05)
+            except queue.Empty:
+                break
+            self.free_slots.append(slot)
+            discarded += 1
+
+        deadline = time.monotonic() + timeout
+        while self.in_flight > 0 and any(w.is_alive() for w in self.workers):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                print(f"WARNING: {self.in_flight} inference frame(s) still running at shutdown")
+                break
+            if self.collect(min(remaining, 0.1)) is not None:
+                discarded += 1
+        return discarded
+
+    def close(self) -> None:
+        """Stop the workers and free the shared memory"""
+        if self.in_flight > 0:
+            discarded = self.cancel_pending()
+            if discarded:
+                print(f"DEBUG: Discarded {discarded} in-flight frame(s) on shutdown")
+        for _ in self.workers:
+            self.task_queue.put(None)
+        for worker in self.workers:
+            worker.join(timeout=2.0)
+            if worker.is_alive():
+                worker.terminate()
+
+        self.task_queue.close()
+        self.result_queue.close()
+        self.ring.close()
+
+class PooledObjectDetector(ObjectDetector):
+    """
+    Object detector that offloads inference to an InferenceWorkerPool.
+
+    Frames are pipelined: while the main process tracks and sonifies frame N,
+    workers already run on the following frames. Results are fed to the tracker
+    strictly in capture order, and the returned frame is always the one the
+    detections belong to.
+    """
+    def __init__(self, model_path: str = 'yolov8n.pt',
+                 num_workers: Optional[int] = None,
+                 clock: Optional[Clock] = None):
+        super().__init__(model_path, load_model=False, clock=clock)
+        self.pool = InferenceWorkerPool(model_path, num_workers=num_workers)
+        self.names = self.pool.names
+
+        self.pending: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}  # seq -> (frame, detections)
+        self.capture_times: Dict[int, float] = {}  # seq -> capture timestamp of the submitted frame
+        self.frame_times: Dict[int, float] = {}  # seq -> clock time of the submitted frame, for the tracker
+        self.next_expected_seq = 0
+
+    def _drain(self, timeout: Optional[float]) -> None:
+        """Move finished results into the reorder buffer. A timeout of None blocks for one result."""
+        if timeout is None:
+            result = None
+            while result is None:
+                result = self.pool.collect(1.0)
+                if result is None and not any(w.is_alive() for w in self.pool.workers):
+                    raise InferenceWorkerError("All inference workers exited")
+        else:
+            result = self.pool.collect(timeout)
+        while result is not None:
+            seq, frame, detections = result
+            self.pending[seq] = (frame, detections)
+            result = self.pool.collect(0.0)
+
+    def detect_and_track(self, frame: np.ndarray,
+                         trace: Optional[FrameTrace] = None) -> Tuple[List[TrackedObject], np.ndarray]:
+        """
+        Submit a frame and return tracking for the newest in-order result.
+
+        The result usually belongs to an earlier frame, so the trace's capture
+        timestamp is moved back to when that frame was captured.
+        """
+        frame_resized = prepare_frame(frame)
+
+        seq = self.pool.submit(frame_resized)
+        while seq is None:
+            # Ring full: wait for a slot to come back before accepting the new frame
+            self._drain(timeout=None)
+            seq = self.pool.submit(frame_resized)
+        self.capture_times[seq] = trace.capture_ts if trace is not None else 0.0
+        self.frame_times[seq] = self.clock.now()
+
+        # Keep one frame of slack so the workers run while we do the rest of the frame
+        if self.next_expected_seq not in self.pending and self.pool.in_flight >= len(self.pool.workers) + 1:
+            while self.next_expected_seq not in self.pending:
+                self._drain(timeout=None)
+        else:
+            self._drain(timeout=0.0)
+
+        result = self._track_ready(trace)
+        if result is None:
+            # Pipeline is still filling up
+            return [], frame_resized
+        return result
+
+    def _track_ready(self, trace: Optional[FrameTrace]) -> Optional[Tuple[List[TrackedObject], np.ndarray]]:
+        """Track every in-order result in the reorder buffer; None if the next one is not back yet"""
+        tracked_objects: List[TrackedObject] = []
+        result_frame = None
+        while self.next_expected_seq in self.pending:
+            result_frame, detections = self.pending.pop(self.next_expected_seq)
+            # Workers return every class; keep the current target classes
+            detections = filter_targets(detections, get_runtime_config().target_mask)
+            self.last_detections = detections
+            tracked_objects = self.track_detections(detections,
+                                                    timestamp=self.frame_times.pop(self.next_expected_seq, None))
+            capture_ts = self.capture_times.pop(self.next_expected_seq, 0.0)
+            if trace is not None and capture_ts:
+                trace.capture_ts = capture_ts
+            self.next_expected_seq += 1
+
+        if result_frame is None:
+            return None
+        return self.apply_cascade(result_frame, tracked_objects), result_frame
+
+    def track_unchanged(self, frame_resized: np.ndarray,
+                        trace: Optional[FrameTrace] = None) -> Tuple[List[TrackedObject], np.ndarray]:
+        """
+        Advance tracking on a frame the change gate skipped.
+
+        Frames still in flight are older than this one, so they are tracked
+        first; only an idle pipeline re-tracks the last detections.
+        """
+        while self.pool.in_flight > 0 and self.next_expected_seq not in self.pending:
+            self._drain(timeout=None)
+        result = self._track_ready(trace)
+        if result is not None:
+            return result
+        return super().track_unchanged(frame_resized, trace)
+
+    def detect_and_track_region(self, frame_resized: np.ndarray, roi: Tuple[int, int, int, int],
+                                margin: Optional[int] = None,
+                                trace: Optional[FrameTrace] = None) -> Tuple[List[TrackedObject], np.ndarray]:
+        """Crops are not worth a round trip through the pool; run the full pipelined pass"""
+        return self.detect_and_track(frame_resized, trace)
+
+    def close(self) -> None:
+        """Shut down the worker pool, reporting frames that never reached the tracker"""
+        discarded = len(self.pending) + self.pool.cancel_pending()
+        self.pending.clear()
+        self.capture_times.clear()
+        self.frame_times.clear()
+        if discarded:
+            print(f"DEBUG: Discarded {discarded} frame(s) still in the inference pipeline")
+        self.pool.close()
+        super().close()
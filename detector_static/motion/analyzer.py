@@ -2,18 +2,46 @@
 
 import cv2
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
-from ..config.settings import Config
+from ..config.settings import MotionConfig
+from ..config.runtime import DEFAULT_REAL_SIZE, RuntimeConfig, get_runtime_config
 from ..utils.types import TrackedObject
+from ..utils.clock import Clock, SystemClock
 
 class MotionAnalyzer:
     """Analyzes motion in video frames using ORB features"""
-    def __init__(self):
+    def __init__(self, config: Optional[MotionConfig] = None, verbose: bool = True,
+                 clock: Optional[Clock] = None):
+        """
+        Args:
+            config: Speed thresholds and smoothing to classify motion with;
+                by default those of the current runtime config, following reloads
+            verbose: Print per-object speed debug lines
+            clock: Time source used to normalize speeds by the real frame interval
+        """
+        self.config = config
+        self.verbose = verbose
+        self.clock = clock if clock is not None else SystemClock()
         self.prev_gray = None
         self.camera_motion = np.array([0, 0], dtype=np.float32)
         self.prev_positions: Dict[int, np.ndarray] = {}
+        self.prev_times: Dict[int, float] = {}  # Clock time of each stored position
+        self.prev_distances: Dict[int, float] = {}
+        self.distance_rates: Dict[int, float] = {}  # Smoothed meters per second
+        self.x_rates: Dict[int, float] = {}  # Smoothed compensated pixels per second
         self.prev_speeds: Dict[int, float] = {}  # Store previous speeds for smoothing
+
+    @property
+    def motion_config(self) -> MotionConfig:
+        return self.config if self.config is not None else get_runtime_config().motion
+
+    @staticmethod
+    def _class_index(runtime: RuntimeConfig, obj: TrackedObject) -> int:
+        """Row of the object's class in the runtime tables, or -1 for unknown classes"""
+        if 0 <= obj.class_id < runtime.num_classes and runtime.names.get(obj.class_id) == obj.class_name:
+            return obj.class_id
+        return runtime.class_id(obj.class_name)
         
     def estimate_camera_motion(self, gray: np.ndarray) -> np.ndarray:
         """Estimate camera motion between frames using ORB features"""
@@ -49,6 +77,11 @@ class MotionAnalyzer:
         self.camera_motion = camera_motion
         return camera_motion
     
+    def assume_still_camera(self, gray: np.ndarray) -> None:
+        """Skip ORB estimation for a frame known to have no ego-motion"""
+        self.prev_gray = gray
+        self.camera_motion = np.array([0, 0], dtype=np.float32)
+    
     def get_smoothed_speed(self, obj_id: int, current_speed: float) -> float:
         """Apply exponential smoothing to speed measurements"""
         if obj_id not in self.prev_speeds:
@@ -56,18 +89,54 @@ class MotionAnalyzer:
             return current_speed
             
         # Apply exponential smoothing
-        smoothed_speed = (Config.MOTION.smoothing_factor * self.prev_speeds[obj_id] + 
-                         (1 - Config.MOTION.smoothing_factor) * current_speed)
+        smoothing_factor = self.motion_config.smoothing_factor
+        smoothed_speed = (smoothing_factor * self.prev_speeds[obj_id] + 
+                         (1 - smoothing_factor) * current_speed)
         
         # Update stored speed
         self.prev_speeds[obj_id] = smoothed_speed
         
         return smoothed_speed
     
-    def analyze_object_motion(self, tracked_objects: List[TrackedObject]) -> Tuple[str, List[float], List[float]]:
+    def get_distance_rate(self, obj_id: int, distance: float, prev_time: Optional[float],
+                          now: float, scene_static: bool = False) -> float:
+        """Smoothed change of distance in meters per second, for audio extrapolation"""
+        prev_distance = self.prev_distances.get(obj_id)
+        self.prev_distances[obj_id] = distance
+        if scene_static or prev_distance is None or prev_time is None or now <= prev_time:
+            raw_rate = 0.0
+        else:
+            raw_rate = (distance - prev_distance) / (now - prev_time)
+
+        smoothing_factor = self.motion_config.smoothing_factor
+        rate = (smoothing_factor * self.distance_rates.get(obj_id, raw_rate) +
+                (1 - smoothing_factor) * raw_rate)
+        self.distance_rates[obj_id] = rate
+        return rate
+    
+    def get_x_rate(self, obj_id: int, compensated_x: float, prev: Optional[np.ndarray],
+                   prev_time: Optional[float], now: float, scene_static: bool = False) -> float:
+        """Smoothed camera-compensated horizontal velocity in pixels per second, for audio extrapolation"""
+        if scene_static or prev is None or prev_time is None or now <= prev_time:
+            raw_rate = 0.0
+        else:
+            raw_rate = float(compensated_x - prev[0]) / (now - prev_time)
+
+        smoothing_factor = self.motion_config.smoothing_factor
+        rate = (smoothing_factor * self.x_rates.get(obj_id, raw_rate) +
+                (1 - smoothing_factor) * raw_rate)
+        self.x_rates[obj_id] = rate
+        return rate
+    
+    def analyze_object_motion(self, tracked_objects: List[TrackedObject],
+                              scene_static: bool = False) -> Tuple[str, List[float], List[float]]:
         """
         Analyze motion of tracked objects and determine dominant motion type.
         
+        Args:
+            tracked_objects: Objects from the detector
+            scene_static: The frame was judged unchanged; report every object as static
+        
         Returns:
             Tuple of (closest_object_motion, distances, x_positions)
         """
@@ -82,58 +151,78 @@ class MotionAnalyzer:
         
         closest_distance = float('inf')
         closest_motion = 'none'
+        now = self.clock.now()
         
-        # Define stationary objects
-        stationary_objects = {'chair', 'couch', 'dining table', 'bed', 'tv', 'plant'}
+        # One snapshot for the whole frame, so a reload never mixes settings
+        runtime = get_runtime_config()
+        config = self.config if self.config is not None else runtime.motion
         
         for obj in tracked_objects:
+            class_index = self._class_index(runtime, obj)
             x_center, y_center = obj.center
             compensated_x = x_center - self.camera_motion[0]
             compensated_y = y_center - self.camera_motion[1]
             compensated_center = np.array([compensated_x, compensated_y], dtype=np.float32)
             
             prev = self.prev_positions.get(obj.object_id)
+            prev_time = self.prev_times.get(obj.object_id)
+            
+            speed = 0.0
             
             # Set motion state based on object type
-            if obj.class_name.lower() in stationary_objects:
+            if class_index >= 0 and runtime.stationary[class_index]:
                 motion = 'static'  # Always static for stationary objects
+            elif scene_static:
+                motion = 'static'  # Nothing moved since the last processed frame
+                speed = self.get_smoothed_speed(obj.object_id, 0.0)
             else:
                 motion = 'static'  # Default state
                 if prev is not None:
-                    # Calculate raw speed
-                    raw_speed = np.linalg.norm(compensated_center - prev)
+                    # Calculate raw speed in pixels per reference frame, so dropped
+                    # frames or a different frame rate do not change the state
+                    dt = now - prev_time
+                    elapsed_frames = dt * config.reference_fps if dt > 0 else 1.0
+                    raw_speed = np.linalg.norm(compensated_center - prev) / elapsed_frames
                     
                     # Apply smoothing and minimum threshold
                     speed = self.get_smoothed_speed(obj.object_id, raw_speed)
                     
                     # Only consider motion if above minimum threshold
-                    if speed > Config.MOTION.min_speed_threshold:
-                        if speed > Config.MOTION.slow_threshold:
+                    if speed > config.min_speed_threshold:
+                        if speed > config.slow_threshold:
                             motion = 'fast'
-                        elif speed > Config.MOTION.static_threshold:
+                        elif speed > config.static_threshold:
                             motion = 'slow'
                         
                         # Debug output for speed
-                        print(f"Object {obj.object_id} - Raw Speed: {raw_speed:.1f}, Smoothed: {speed:.1f}, State: {motion}")
+                        if self.verbose:
+                            print(f"Object {obj.object_id} - Raw Speed: {raw_speed:.1f}, Smoothed: {speed:.1f}, State: {motion}")
             
+            obj.x_rate = self.get_x_rate(obj.object_id, compensated_x, prev, prev_time, now, scene_static)
             self.prev_positions[obj.object_id] = compensated_center
+            self.prev_times[obj.object_id] = now
             
             # Calculate distance
             x1, y1, x2, y2 = obj.bbox
             w = x2 - x1
             h = y2 - y1
             
-            if obj.class_name == 'tv':
-                pixel_size = w  # width-based for TV
-                real_size = Config.DIMENSIONS.widths.get('tv', 100)
+            if class_index < 0:
+                pixel_size = np.sqrt(w ** 2 + h ** 2)  # use diagonal
+                real_size = DEFAULT_REAL_SIZE
+            elif runtime.size_by_width[class_index]:
+                pixel_size = w  # width-based, e.g. for TV
+                real_size = runtime.real_sizes[class_index]
             else:
                 pixel_size = np.sqrt(w ** 2 + h ** 2)  # use diagonal
-                real_size = Config.DIMENSIONS.heights.get(obj.class_name, 100)
+                real_size = runtime.real_sizes[class_index]
             
             if pixel_size > 0:
-                distance_m = (real_size * Config.CAMERA.focal_length) / (pixel_size * 100.0)
+                distance_m = float(real_size * runtime.camera.focal_length / (pixel_size * 100.0))
                 distances.append(distance_m)
                 x_positions.append(compensated_x)  # Store compensated x position
+                obj.distance_rate = self.get_distance_rate(obj.object_id, distance_m, prev_time, now,
+                                                           scene_static)
                 
                 # Update closest object's motion
                 if distance_m < closest_distance:
@@ -142,10 +231,15 @@ class MotionAnalyzer:
             
             # Update object's motion state
             obj.motion_state = motion
+            obj.speed = speed
             obj.distance = distance_m if pixel_size > 0 else -1.0
         
         # Clean up untracked objects
         self.prev_positions = {oid: pos for oid, pos in self.prev_positions.items() 
                              if oid in current_ids}
+        self.prev_times = {oid: t for oid, t in self.prev_times.items() if oid in current_ids}
+        self.prev_distances = {oid: d for oid, d in self.prev_distances.items() if oid in current_ids}
+        self.distance_rates = {oid: r for oid, r in self.distance_rates.items() if oid in current_ids}
+        self.x_rates = {oid: r for oid, r in self.x_rates.items() if oid in current_ids}
         
         return closest_motion, distances, x_positions 
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""Frame-difference gate that lets unchanged scenes skip inference."""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from ..config.settings import Config
+
+@dataclass
+class ChangeResult:
+    """Outcome of comparing a frame with the last fully processed one"""
+    changed: bool  # Anything above threshold; False means detections can be reused
+    changed_fraction: float  # Share of blocks that changed
+    roi: Optional[Tuple[int, int, int, int]]  # Bounding box of changed blocks in frame pixels, x1, y1, x2, y2
+
+    @property
+    def localized(self) -> bool:
+        """Change is confined to a region small enough to re-detect on its own"""
+        return self.roi is not None
+
+class ChangeGate:
+    """Block-wise mean absolute difference on a downscaled grayscale frame"""
+    def __init__(self,
+                 scale_width: Optional[int] = None,
+                 block_size: Optional[int] = None,
+                 block_threshold: Optional[float] = None,
+                 static_fraction: Optional[float] = None,
+                 roi_max_fraction: Optional[float] = None,
+                 max_skipped_frames: Optional[int] = None):
+        """Arguments left as None are read from Config.GATE"""
+        cfg = Config.GATE
+        self.scale_width = scale_width if scale_width is not None else cfg.scale_width
+        self.block_size = block_size if block_size is not None else cfg.block_size
+        self.block_threshold = block_threshold if block_threshold is not None else cfg.block_threshold
+        self.static_fraction = static_fraction if static_fraction is not None else cfg.static_fraction
+        self.roi_max_fraction = roi_max_fraction if roi_max_fraction is not None else cfg.roi_max_fraction
+        self.max_skipped_frames = max_skipped_frames if max_skipped_frames is not None else cfg.max_skipped_frames
+
+        self.reference: Optional[np.ndarray] = None
+        self.skipped_frames = 0
+
+    def _downscale(self, gray: np.ndarray) -> np.ndarray:
+        height, width = gray.shape[:2]
+        scale_height = max(self.block_size, int(round(height * self.scale_width / width)))
+        small = cv2.resize(gray, (self.scale_width, scale_height), interpolation=cv2.INTER_AREA)
+        return small.astype(np.int16)
+
+    def update(self, gray: np.ndarray) -> ChangeResult:
+        """
+        Compare a full-resolution grayscale frame with the reference.
+
+        The reference is the last frame that was not skipped, so slow drift
+        accumulates until it crosses the threshold instead of going unnoticed.
+        """
+        small = self._downscale(gray)
+        if self.reference is None or self.reference.shape != small.shape:
+            self.reference = small
+            self.skipped_frames = 0
+            return ChangeResult(True, 1.0, None)
+
+        # Mean absolute difference per block
+        b = self.block_size
+        rows, cols = small.shape[0] // b, small.shape[1] // b
+        diff = np.abs(small[:rows * b, :cols * b] - self.reference[:rows * b, :cols * b])
+        block_diff = diff.reshape(rows, b, cols, b).mean(axis=(1, 3))
+        changed_blocks = block_diff > self.block_threshold
+        fraction = float(changed_blocks.mean())
+
+        if fraction < self.static_fraction and self.skipped_frames < self.max_skipped_frames:
+            self.skipped_frames += 1
+            return ChangeResult(False, fraction, None)
+
+        self.reference = small
+        self.skipped_frames = 0
+
+        roi = None
+        if 0 < fraction <= self.roi_max_fraction:
+            ys, xs = np.nonzero(changed_blocks)
+            to_full = gray.shape[1] / self.scale_width
+            roi = (int(xs.min() * b * to_full), int(ys.min() * b * to_full),
+                   int(min(gray.shape[1], (xs.max() + 1) * b * to_full)),
+                   int(min(gray.shape[0], (ys.max() + 1) * b * to_full)))
+        return ChangeResult(True, fraction, roi)
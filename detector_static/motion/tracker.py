@@ -3,7 +3,8 @@
 import numpy as np
 from typing import Dict, List, Set, Tuple, Optional
 from dataclasses import dataclass
-import time
+
+from ..utils.clock import Clock, SystemClock
 
 @dataclass
 class TrackedPoint:
@@ -18,16 +19,19 @@ class CentroidTracker:
     def __init__(self, 
                  max_distance: float = 150.0,  # Increased from 50 to handle faster motion
                  max_lost: int = 10,  # Number of frames before considering object lost
-                 velocity_weight: float = 0.7):  # Weight for velocity prediction (0-1)
+                 velocity_weight: float = 0.7,  # Weight for velocity prediction (0-1)
+                 clock: Optional[Clock] = None):  # Time source; frame timestamps for replays
+        self.clock = clock if clock is not None else SystemClock()
         self.next_object_id = 0
         self.objects: Dict[int, TrackedPoint] = {}
         self.max_distance = max_distance
         self.max_lost = max_lost
         self.velocity_weight = velocity_weight
 
-    def predict_new_position(self, tracked_point: TrackedPoint) -> np.ndarray:
+    def predict_new_position(self, tracked_point: TrackedPoint,
+                             current_time: Optional[float] = None) -> np.ndarray:
         """Predict new position based on velocity and time since last update"""
-        current_time = time.time()
+        current_time = current_time if current_time is not None else self.clock.now()
         dt = current_time - tracked_point.last_update
         
         # Predict new position using current velocity
@@ -51,17 +55,19 @@ class CentroidTracker:
         tracked_point.last_update = current_time
         tracked_point.lost_count = 0
 
-    def update(self, detections: List[Tuple[float, float]]) -> List[Tuple[int, Tuple[float, float]]]:
+    def update(self, detections: List[Tuple[float, float]],
+               timestamp: Optional[float] = None) -> List[Tuple[int, Tuple[float, float]]]:
         """
         Update object tracking with new detections.
         
         Args:
             detections: List of (x, y) positions for detected objects
+            timestamp: Capture time of the detections; defaults to the tracker's clock
             
         Returns:
             List of (object_id, (x, y)) for tracked objects
         """
-        current_time = time.time()
+        current_time = timestamp if timestamp is not None else self.clock.now()
         
         # Convert detections to numpy arrays for easier computation
         detection_points = [np.array(d) for d in detections]
@@ -84,7 +90,7 @@ class CentroidTracker:
 
         # First pass: Try to match objects using predicted positions
         for obj_id, tracked_point in list(self.objects.items()):
-            predicted_pos = self.predict_new_position(tracked_point)
+            predicted_pos = self.predict_new_position(tracked_point, current_time)
             min_dist = self.max_distance
             best_det_idx = -1
 
@@ -0,0 +1 @@
+"""Remote streaming server functionality."""
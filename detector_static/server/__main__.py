@@ -0,0 +1,51 @@
+"""Entry point for the stream server."""
+
+import argparse
+import asyncio
+
+from ..config.settings import Config
+from .stream import StreamServer
+from .client import run_video_client
+
+def main():
+    """Run the server, optionally with local stand-in clients"""
+    parser = argparse.ArgumentParser(description='Serve audio cues to remote clients')
+    parser.add_argument('--host', default=Config.SERVER.host)
+    parser.add_argument('--port', type=int, default=Config.SERVER.port)
+    parser.add_argument('--model', default='yolov8n.pt')
+    parser.add_argument('--demo-video', help='Stream this video from local stand-in clients')
+    parser.add_argument('--demo-clients', type=int, default=4)
+    args = parser.parse_args()
+
+    async def run():
+        from ..core.detector import ObjectDetector
+        server = StreamServer(ObjectDetector(args.model), host=args.host, port=args.port)
+        if not args.demo_video:
+            await server.serve_forever()
+            return
+
+        await server.start()
+        try:
+            results = await asyncio.gather(*[
+                run_video_client(args.host, server.port, args.demo_video)
+                for _ in range(args.demo_clients)
+            ])
+        finally:
+            await server.close()
+
+        for i, round_trips in enumerate(results):
+            if round_trips:
+                round_trips.sort()
+                p50 = round_trips[len(round_trips) // 2] * 1000
+                p95 = round_trips[int(len(round_trips) * 0.95)] * 1000
+                print(f"Client {i}: {len(round_trips)} replies, p50 {p50:.1f} ms, p95 {p95:.1f} ms")
+            else:
+                print(f"Client {i}: no replies")
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print("\nServer stopped by user")
+
+if __name__ == '__main__':
+    main()
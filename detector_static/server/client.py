@@ -0,0 +1,74 @@
+"""Stand-in client for exercising the stream server locally."""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+import cv2
+import numpy as np
+
+from .protocol import encode_frame, read_cues
+
+class StreamClient:
+    """Minimal client that sends frames and collects cue replies"""
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.next_seq = 0
+
+    async def connect(self) -> None:
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def send_frame(self, frame: np.ndarray) -> int:
+        """Send one frame and return its sequence number"""
+        seq = self.next_seq
+        self.next_seq += 1
+        self.writer.write(encode_frame(frame, seq, time.time()))
+        await self.writer.drain()
+        return seq
+
+    async def receive(self) -> Dict[str, Any]:
+        """Wait for the next cue message"""
+        return await read_cues(self.reader)
+
+    async def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            await self.writer.wait_closed()
+
+async def run_video_client(host: str, port: int, video_path: str,
+                           fps: float = 15.0, max_frames: int = 300) -> List[float]:
+    """
+    Stream a video file at a fixed rate and measure reply round-trip times.
+
+    Returns:
+        List of round-trip times in seconds, one per received reply
+    """
+    client = StreamClient(host, port)
+    await client.connect()
+    cap = cv2.VideoCapture(video_path)
+    round_trips: List[float] = []
+
+    async def receive_loop():
+        while True:
+            cues = await client.receive()
+            round_trips.append(time.time() - cues['capture_ts'])
+
+    receiver = asyncio.create_task(receive_loop())
+    try:
+        for _ in range(max_frames):
+            ret, frame = cap.read()
+            if not ret:
+                break
+            await client.send_frame(frame)
+            await asyncio.sleep(1.0 / fps)
+        # Let the last replies arrive
+        await asyncio.sleep(1.0)
+    finally:
+        receiver.cancel()
+        cap.release()
+        await client.close()
+
+    return round_trips
@@ -0,0 +1,87 @@
+"""Wire protocol for streaming frames to the detector host.
+
+Client -> server: a fixed frame header followed by the image payload.
+Server -> client: a 4-byte big-endian length followed by a UTF-8 JSON cue message.
+"""
+
+import asyncio
+import json
+import struct
+from dataclasses import dataclass
+from typing import Any, Dict
+
+import cv2
+import numpy as np
+
+FRAME_MAGIC = b'ESF1'
+
+# magic, encoding, seq, capture timestamp, width, height, payload length
+FRAME_HEADER = struct.Struct('!4sBIdHHI')
+CUE_HEADER = struct.Struct('!I')
+
+ENCODING_RAW_BGR = 0
+ENCODING_JPEG = 1
+
+MAX_PAYLOAD_BYTES = 16 * 1024 * 1024
+
+class ProtocolError(Exception):
+    """Exception raised when a peer sends a malformed message."""
+    pass
+
+@dataclass
+class FrameMessage:
+    """One frame received from a client"""
+    seq: int
+    capture_ts: float
+    encoding: int
+    width: int
+    height: int
+    payload: bytes
+
+    def decode(self) -> np.ndarray:
+        """Decode the payload into a BGR image"""
+        if self.encoding == ENCODING_JPEG:
+            image = cv2.imdecode(np.frombuffer(self.payload, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if image is None:
+                raise ProtocolError(f"Frame {self.seq}: could not decode JPEG payload")
+            return image
+
+        if self.encoding == ENCODING_RAW_BGR:
+            expected = self.width * self.height * 3
+            if len(self.payload) != expected:
+                raise ProtocolError(f"Frame {self.seq}: expected {expected} bytes, got {len(self.payload)}")
+            return np.frombuffer(self.payload, dtype=np.uint8).reshape(self.height, self.width, 3)
+
+        raise ProtocolError(f"Frame {self.seq}: unknown encoding {self.encoding}")
+
+def encode_frame(frame: np.ndarray, seq: int, capture_ts: float, jpeg_quality: int = 80) -> bytes:
+    """Encode a BGR frame as a JPEG frame message"""
+    ok, jpeg = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality])
+    if not ok:
+        raise ProtocolError(f"Frame {seq}: JPEG encoding failed")
+    payload = jpeg.tobytes()
+    height, width = frame.shape[:2]
+    return FRAME_HEADER.pack(FRAME_MAGIC, ENCODING_JPEG, seq, capture_ts, width, height, len(payload)) + payload
+
+async def read_frame(reader: asyncio.StreamReader) -> FrameMessage:
+    """Read one frame message. Raises asyncio.IncompleteReadError on disconnect."""
+    header = await reader.readexactly(FRAME_HEADER.size)
+    magic, encoding, seq, capture_ts, width, height, length = FRAME_HEADER.unpack(header)
+    if magic != FRAME_MAGIC:
+        raise ProtocolError(f"Bad frame magic {magic!r}")
+    if length > MAX_PAYLOAD_BYTES:
+        raise ProtocolError(f"Frame {seq}: payload of {length} bytes exceeds limit")
+
+    payload = await reader.readexactly(length)
+    return FrameMessage(seq, capture_ts, encoding, width, height, payload)
+
+def encode_cues(message: Dict[str, Any]) -> bytes:
+    """Encode a cue message"""
+    body = json.dumps(message, separators=(',', ':')).encode('utf-8')
+    return CUE_HEADER.pack(len(body)) + body
+
+async def read_cues(reader: asyncio.StreamReader) -> Dict[str, Any]:
+    """Read one cue message"""
+    header = await reader.readexactly(CUE_HEADER.size)
+    (length,) = CUE_HEADER.unpack(header)
+    return json.loads(await reader.readexactly(length))
@@ -0,0 +1,248 @@
+"""asyncio stream server that serves audio cues to many remote clients.
+
+Each connected client is a session with its own tracker and motion analyzer.
+Pending frames from all sessions are gathered into shared inference batches.
+Every session holds at most one pending frame: a newer frame replaces an
+unprocessed older one, and a session whose cue replies are not being read is
+left out of batches until its socket drains.
+"""
+
+import asyncio
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+
+from ..config.settings import Config
+from ..core.detector import ObjectDetector, prepare_frame
+from ..motion.analyzer import MotionAnalyzer
+from ..motion.tracker import CentroidTracker
+from ..audio.spatial import StereoPanner, DistanceAttenuator
+from ..utils.types import TrackedObject
+from ..utils.clock import FrameClock
+from .protocol import FrameMessage, ProtocolError, read_frame, encode_cues
+
+class StreamSession:
+    """Per-client tracking state"""
+    def __init__(self, session_id: int, writer: asyncio.StreamWriter):
+        self.session_id = session_id
+        self.writer = writer
+        self.clock = FrameClock()  # Follows the client's capture timestamps
+        self.tracker = CentroidTracker(clock=self.clock)
+        self.motion_analyzer = MotionAnalyzer(verbose=False, clock=self.clock)
+        self.pending: Optional[FrameMessage] = None
+        self.in_flight = False
+        self.closed = False
+        self.frames_processed = 0
+        self.frames_dropped = 0
+
+    @property
+    def congested(self) -> bool:
+        """True while earlier cue replies are still waiting in the socket buffer"""
+        return self.writer.transport.get_write_buffer_size() > Config.SERVER.write_buffer_limit
+
+def build_cue_message(seq: int, capture_ts: float, motion_state: str,
+                      tracked_objects: List[TrackedObject], panner: StereoPanner,
+                      attenuator: DistanceAttenuator, frames_dropped: int) -> Dict[str, Any]:
+    """Turn analyzed objects into per-object pan/volume/motion cue parameters"""
+    objects = []
+    for obj in tracked_objects:
+        left, right = panner.calculate_pan(obj.center[0])
+        volume = attenuator.calculate_volume(obj.distance) if obj.distance > 0 else 0.0
+        objects.append({
+            'id': obj.object_id,
+            'class': obj.class_name,
+            'motion': obj.motion_state,
+            'distance': round(obj.distance, 3),
+            'velocity': [round(obj.velocity[0], 1), round(obj.velocity[1], 1)],  # pixels per second
+            'distance_rate': round(obj.distance_rate, 3),  # meters per second
+            'pan': [round(left, 3), round(right, 3)],
+            'volume': round(volume, 3),
+        })
+
+    return {
+        'seq': seq,
+        'capture_ts': capture_ts,
+        'server_ts': time.time(),
+        'motion': motion_state,
+        'objects': objects,
+        'dropped': frames_dropped,
+    }
+
+class StreamServer:
+    """Accepts client sessions and batches their frames into shared inference calls"""
+    def __init__(self, detector: Optional[ObjectDetector] = None,
+                 host: Optional[str] = None,
+                 port: Optional[int] = None,
+                 max_batch_size: Optional[int] = None,
+                 batch_window_ms: Optional[float] = None,
+                 max_sessions: Optional[int] = None):
+        """Arguments left as None are read from Config.SERVER"""
+        cfg = Config.SERVER
+        self.detector = detector if detector is not None else ObjectDetector()
+        self.host = host if host is not None else cfg.host
+        self.port = port if port is not None else cfg.port
+        self.max_batch_size = max_batch_size if max_batch_size is not None else cfg.max_batch_size
+        self.batch_window = (batch_window_ms if batch_window_ms is not None else cfg.batch_window_ms) / 1000.0
+        self.max_sessions = max_sessions if max_sessions is not None else cfg.max_sessions
+
+        self.sessions: Dict[int, StreamSession] = {}
+        self.session_ids = itertools.count()
+        self.frame_ready = asyncio.Event()
+        self.panner = StereoPanner(Config.CAMERA.frame_width)
+        self.attenuator = DistanceAttenuator()
+
+        # Single worker: the model and per-session trackers are only touched from this thread
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='stream-inference')
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.batch_task: Optional[asyncio.Task] = None
+        self.round_robin = 0
+
+    async def start(self) -> None:
+        """Start listening and batching"""
+        self.server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        if self.port == 0:
+            self.port = self.server.sockets[0].getsockname()[1]
+        self.batch_task = asyncio.create_task(self._batch_loop())
+        print(f"DEBUG: Stream server listening on {self.host}:{self.port}")
+
+    async def serve_forever(self) -> None:
+        """Start and run until cancelled"""
+        await self.start()
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """Stop accepting clients and shut down batching"""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.batch_task is not None:
+            self.batch_task.cancel()
+            try:
+                await self.batch_task
+            except asyncio.CancelledError:
+                pass
+        for session in list(self.sessions.values()):
+            session.closed = True
+            session.writer.close()
+        self.sessions.clear()
+        self.executor.shutdown(wait=True)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Read frames from one client into its pending slot"""
+        if len(self.sessions) >= self.max_sessions:
+            print("WARNING: Stream server full, rejecting client")
+            writer.close()
+            return
+
+        session = StreamSession(next(self.session_ids), writer)
+        self.sessions[session.session_id] = session
+        print(f"DEBUG: Session {session.session_id} connected")
+
+        try:
+            while True:
+                message = await read_frame(reader)
+                if session.pending is not None:
+                    session.frames_dropped += 1
+                session.pending = message
+                self.frame_ready.set()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except ProtocolError as e:
+            print(f"WARNING: Session {session.session_id} protocol error - {str(e)}")
+        finally:
+            session.closed = True
+            self.sessions.pop(session.session_id, None)
+            writer.close()
+            print(f"DEBUG: Session {session.session_id} disconnected after "
+                  f"{session.frames_processed} frames ({session.frames_dropped} dropped)")
+
+    def _ready_sessions(self) -> List[StreamSession]:
+        """Sessions that have a frame waiting and are not backed up"""
+        return [s for s in self.sessions.values()
+                if s.pending is not None and not s.in_flight and not s.closed and not s.congested]
+
+    def _take_batch(self) -> List[Tuple[StreamSession, FrameMessage]]:
+        """Pick up to max_batch_size pending frames, rotating the start for fairness"""
+        ready = self._ready_sessions()
+        if not ready:
+            return []
+
+        start = self.round_robin % len(ready)
+        self.round_robin += 1
+        chosen = (ready[start:] + ready[:start])[:self.max_batch_size]
+
+        batch = []
+        for session in chosen:
+            batch.append((session, session.pending))
+            session.pending = None
+            session.in_flight = True
+        return batch
+
+    async def _batch_loop(self) -> None:
+        """Wait for frames, gather a batch across sessions, and run it"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            await self.frame_ready.wait()
+            self.frame_ready.clear()
+
+            # Give other sessions a short window to join this batch
+            if self.batch_window > 0 and len(self._ready_sessions()) < self.max_batch_size:
+                await asyncio.sleep(self.batch_window)
+
+            batch = self._take_batch()
+            if not batch:
+                if any(s.pending is not None for s in self.sessions.values()):
+                    # Only congested sessions are waiting; check again shortly
+                    await asyncio.sleep(self.batch_window or 0.005)
+                    self.frame_ready.set()
+                continue
+
+            try:
+                replies = await loop.run_in_executor(self.executor, self._process_batch, batch)
+            except Exception as e:
+                print(f"WARNING: Batch of {len(batch)} frames failed - {str(e)}")
+                replies = []
+            finally:
+                for session, _ in batch:
+                    session.in_flight = False
+
+            for session, data in replies:
+                if not session.closed:
+                    session.writer.write(data)
+
+            if any(s.pending is not None for s in self.sessions.values()):
+                self.frame_ready.set()
+
+    def _process_batch(self, batch: List[Tuple[StreamSession, FrameMessage]]) -> List[Tuple[StreamSession, bytes]]:
+        """Decode, detect in one model call, then track and analyze per session"""
+        decoded = []
+        for session, message in batch:
+            try:
+                decoded.append((session, message, prepare_frame(message.decode())))
+            except ProtocolError as e:
+                print(f"WARNING: Session {session.session_id} - {str(e)}")
+
+        detections = self.detector.detect_batch([frame for _, _, frame in decoded])
+
+        replies = []
+        for (session, message, frame_resized), session_detections in zip(decoded, detections):
+            session.clock.set(message.capture_ts)
+            tracked_objects = self.detector.track_detections(session_detections, session.tracker)
+
+            gray = cv2.cvtColor(frame_resized, cv2.COLOR_BGR2GRAY)
+            session.motion_analyzer.estimate_camera_motion(gray)
+            motion_state, _, _ = session.motion_analyzer.analyze_object_motion(tracked_objects)
+
+            session.frames_processed += 1
+            cues = build_cue_message(message.seq, message.capture_ts, motion_state, tracked_objects,
+                                     self.panner, self.attenuator, session.frames_dropped)
+            replies.append((session, encode_cues(cues)))
+
+        return replies
@@ -0,0 +1 @@
+"""Offline benchmarking and tuning tools."""
@@ -0,0 +1,106 @@
+"""Replay benchmark: run recorded footage through the full pipeline and gate on latency.
+
+Exits with status 1 when the end-to-end (capture to audio applied) p95 exceeds
+the budget or regresses beyond the tolerance over a saved baseline.
+"""
+
+import argparse
+import cv2
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from ..config.settings import Config
+from ..core.app import Application
+
+def run_replay(video_path: str, max_frames: Optional[int] = None, realtime: bool = False,
+               trace_path: Optional[str] = None) -> Dict[str, Any]:
+    """Run a video through the headless pipeline and return the latency summary"""
+    app = Application(video_path, display=False, trace_path=trace_path)
+    fps = app.cap.get(cv2.CAP_PROP_FPS) or 30.0
+    frames = 0
+    start = time.perf_counter()
+    try:
+        while max_frames is None or frames < max_frames:
+            if not app.process_frame():
+                break
+            frames += 1
+            if realtime:
+                # Pace to the recording's frame rate, as a live camera would
+                delay = start + frames / fps - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+        # Give the audio thread a tick to apply the last frame
+        time.sleep(0.1)
+        elapsed = time.perf_counter() - start
+        summary = app.latency_tracker.summary()
+    finally:
+        app.cleanup()
+
+    summary['fps'] = round(frames / elapsed, 2) if elapsed > 0 else 0.0
+    return summary
+
+def check_regression(summary: Dict[str, Any], max_p95_ms: float,
+                     baseline: Optional[Dict[str, Any]] = None,
+                     tolerance: float = Config.LATENCY.regression_tolerance) -> List[str]:
+    """Return human-readable failures, empty when the run is within budget"""
+    failures = []
+    end_to_end = summary['end_to_end']
+    if end_to_end.get('count', 0) == 0:
+        return ['No frame reached the audio thread']
+
+    p95 = end_to_end['p95_ms']
+    if p95 > max_p95_ms:
+        failures.append(f"End-to-end p95 {p95:.1f} ms exceeds budget {max_p95_ms:.1f} ms")
+
+    if baseline is not None:
+        base_p95 = baseline['end_to_end']['p95_ms']
+        if p95 > base_p95 * (1 + tolerance):
+            failures.append(f"End-to-end p95 {p95:.1f} ms regressed from baseline {base_p95:.1f} ms "
+                            f"(tolerance {tolerance:.0%})")
+        for stage, stats in summary['stages'].items():
+            base_stats = baseline['stages'].get(stage)
+            if base_stats and stats.get('count') and stats['p95_ms'] > base_stats['p95_ms'] * (1 + tolerance):
+                failures.append(f"Stage '{stage}' p95 {stats['p95_ms']:.1f} ms regressed from "
+                                f"{base_stats['p95_ms']:.1f} ms")
+    return failures
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Replay footage and fail on latency regressions')
+    parser.add_argument('video', help='Recorded footage to replay')
+    parser.add_argument('--max-frames', type=int)
+    parser.add_argument('--realtime', action='store_true', help="Pace frames at the video's frame rate")
+    parser.add_argument('--trace', help='Write per-frame traces to this JSON-lines file')
+    parser.add_argument('--max-p95-ms', type=float, default=Config.LATENCY.max_p95_ms)
+    parser.add_argument('--baseline', help='Compare against a summary saved with --save-baseline')
+    parser.add_argument('--tolerance', type=float, default=Config.LATENCY.regression_tolerance)
+    parser.add_argument('--save-baseline', help='Write this run\'s summary as the new baseline')
+    parser.add_argument('--dummy-audio', action='store_true', help='Use a silent audio driver (CI machines)')
+    args = parser.parse_args()
+
+    if args.dummy_audio:
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+    summary = run_replay(args.video, args.max_frames, args.realtime, args.trace)
+    print(json.dumps(summary, indent=2))
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    failures = check_regression(summary, args.max_p95_ms, baseline, args.tolerance)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,283 @@
+"""Parameter sweep: tune tracker and motion thresholds on cached detections.
+
+YOLO and ORB camera-motion estimation run once per video, and their output is
+cached next to it. Every configuration in the grid then replays the cached
+frames through CentroidTracker and MotionAnalyzer in a process pool, on a
+FrameClock following the video's timestamps.
+
+There is no ground truth, so identity quality is measured by proxies. An ID
+switch is either a track whose class changes, or a new track born near a
+same-class track lost within the last few frames. The state flip rate is the
+share of consecutive observations of an object whose motion state changed.
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from ..config.settings import Config, MotionConfig
+from ..core.detector import ObjectDetector, prepare_frame
+from ..motion.analyzer import MotionAnalyzer
+from ..motion.tracker import CentroidTracker
+from ..utils.types import TrackedObject
+from ..utils.clock import FrameClock
+
+@dataclass(frozen=True)
+class SweepParams:
+    """One point of the parameter grid"""
+    static_threshold: float
+    slow_threshold: float
+    smoothing_factor: float
+    max_distance: float
+    max_lost: int
+    velocity_weight: float
+
+class DetectionCache:
+    """Per-frame detections and camera motion of one video"""
+    def __init__(self, detections: np.ndarray, offsets: np.ndarray, camera_motion: np.ndarray,
+                 timestamps: np.ndarray, names: Dict[int, str], complete: bool = True):
+        self.detections = detections  # (total, 6) compact detections of all frames
+        self.offsets = offsets  # Frame i owns detections[offsets[i]:offsets[i + 1]]
+        self.camera_motion = camera_motion  # (frames, 2)
+        self.timestamps = timestamps  # Video position in seconds, as the application's FrameClock follows it
+        self.names = names
+        self.complete = complete  # False if building stopped at a frame cap before the end of the video
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def frame(self, index: int) -> np.ndarray:
+        return self.detections[self.offsets[index]:self.offsets[index + 1]]
+
+    def head(self, frames: int) -> 'DetectionCache':
+        """The first frames of the cache"""
+        if frames >= len(self):
+            return self
+        return DetectionCache(self.detections[:self.offsets[frames]], self.offsets[:frames + 1],
+                              self.camera_motion[:frames], self.timestamps[:frames], self.names,
+                              complete=False)
+
+    def save(self, path: str) -> None:
+        np.savez(path, detections=self.detections, offsets=self.offsets,
+                 camera_motion=self.camera_motion, timestamps=self.timestamps,
+                 names=np.array(json.dumps({str(k): v for k, v in self.names.items()})),
+                 complete=np.array(self.complete))
+
+    @classmethod
+    def load(cls, path: str) -> 'DetectionCache':
+        with np.load(path) as data:
+            names = {int(k): v for k, v in json.loads(str(data['names'])).items()}
+            # Caches written without the flag may be truncated
+            complete = bool(data['complete']) if 'complete' in data else False
+            return cls(data['detections'], data['offsets'], data['camera_motion'],
+                       data['timestamps'], names, complete)
+
+def build_detection_cache(video_path: str, max_frames: Optional[int] = None) -> DetectionCache:
+    """Run YOLO and camera-motion estimation over a video once"""
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise RuntimeError(f'Error: Could not open video source {video_path}.')
+
+    detector = ObjectDetector()
+    analyzer = MotionAnalyzer(verbose=False)
+    frames: List[np.ndarray] = []
+    motions: List[np.ndarray] = []
+    timestamps: List[float] = []
+    complete = False
+    start = time.perf_counter()
+    try:
+        while max_frames is None or len(frames) < max_frames:
+            ret, frame = cap.read()
+            if not ret:
+                complete = True
+                break
+            # Same timestamps as Application, so variable-frame-rate files replay identically
+            timestamps.append(cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0)
+            frame_resized = prepare_frame(frame)
+            frames.append(detector.detect(frame_resized))
+            motions.append(analyzer.estimate_camera_motion(cv2.cvtColor(frame_resized, cv2.COLOR_BGR2GRAY)))
+    finally:
+        cap.release()
+        detector.close()
+    print(f"DEBUG: Cached detections for {len(frames)} frames in {time.perf_counter() - start:.1f}s")
+
+    offsets = np.zeros(len(frames) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(d) for d in frames])
+    detections = np.concatenate(frames) if frames else np.zeros((0, 6), dtype=np.float32)
+    camera_motion = np.array(motions, dtype=np.float32).reshape(-1, 2)
+    return DetectionCache(detections, offsets, camera_motion, np.array(timestamps, dtype=np.float64),
+                          detector.names, complete)
+
+def load_or_build_cache(video_path: str, cache_path: Optional[str] = None,
+                        max_frames: Optional[int] = None, refresh: bool = False) -> Tuple[DetectionCache, str]:
+    """
+    Reuse the cache next to the video unless it is missing, stale, too short or refresh is set.
+
+    A cache longer than max_frames is cut down to it. A cache built with a
+    frame cap only serves requests within that cap.
+    """
+    cache_path = cache_path or f"{video_path}.detections.npz"
+    if (not refresh and os.path.exists(cache_path)
+            and os.path.getmtime(cache_path) >= os.path.getmtime(video_path)):
+        cache = DetectionCache.load(cache_path)
+        if cache.complete or (max_frames is not None and len(cache) >= max_frames):
+            return (cache.head(max_frames) if max_frames is not None else cache), cache_path
+
+    cache = build_detection_cache(video_path, max_frames)
+    cache.save(cache_path)
+    return cache, cache_path
+
+class TrackMetrics:
+    """Ground-truth-free identity and motion-state stability counters"""
+    def __init__(self, switch_radius: float = Config.SWEEP.switch_radius,
+                 switch_window: int = Config.SWEEP.switch_window):
+        self.switch_radius = switch_radius
+        self.switch_window = switch_window
+        self.classes: Dict[int, str] = {}
+        self.states: Dict[int, str] = {}
+        self.last_seen: Dict[int, Tuple[int, Tuple[float, float]]] = {}  # id -> frame, center
+        self.id_switches = 0
+        self.state_flips = 0
+        self.transitions = 0
+
+    def update(self, frame_index: int, tracked_objects: List[TrackedObject]) -> None:
+        current_ids = {obj.object_id for obj in tracked_objects}
+        for obj in tracked_objects:
+            object_id = obj.object_id
+            if object_id not in self.classes:
+                if self._took_over_lost_track(frame_index, obj, current_ids):
+                    self.id_switches += 1
+                self.classes[object_id] = obj.class_name
+            elif self.classes[object_id] != obj.class_name:
+                self.id_switches += 1
+                self.classes[object_id] = obj.class_name
+
+            if object_id in self.states:
+                self.transitions += 1
+                if self.states[object_id] != obj.motion_state:
+                    self.state_flips += 1
+            self.states[object_id] = obj.motion_state
+            self.last_seen[object_id] = (frame_index, obj.center)
+
+    def _took_over_lost_track(self, frame_index: int, obj: TrackedObject, current_ids: set) -> bool:
+        """A recently lost same-class track near the new one; consumed when matched"""
+        for lost_id, (seen_frame, center) in list(self.last_seen.items()):
+            if lost_id in current_ids or frame_index - seen_frame > self.switch_window:
+                continue
+            if (self.classes.get(lost_id) == obj.class_name and
+                    np.hypot(center[0] - obj.center[0], center[1] - obj.center[1]) < self.switch_radius):
+                del self.last_seen[lost_id]
+                return True
+        return False
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'tracks': len(self.classes),
+            'id_switches': self.id_switches,
+            'state_flip_rate': round(self.state_flips / self.transitions, 4) if self.transitions else 0.0,
+        }
+
+def evaluate(cache: DetectionCache, params: SweepParams) -> Dict[str, Any]:
+    """Replay cached detections through one tracker and motion configuration"""
+    clock = FrameClock()
+    detector = ObjectDetector(load_model=False, clock=clock)
+    detector.names = cache.names
+    tracker = CentroidTracker(params.max_distance, params.max_lost, params.velocity_weight, clock=clock)
+    analyzer = MotionAnalyzer(MotionConfig(static_threshold=params.static_threshold,
+                                           slow_threshold=params.slow_threshold,
+                                           smoothing_factor=params.smoothing_factor,
+                                           min_speed_threshold=Config.MOTION.min_speed_threshold),
+                              verbose=False, clock=clock)
+    metrics = TrackMetrics()
+
+    start = time.perf_counter()
+    for i in range(len(cache)):
+        clock.set(float(cache.timestamps[i]))
+        tracked_objects = detector.track_detections(cache.frame(i), tracker)
+        analyzer.camera_motion = cache.camera_motion[i]
+        analyzer.analyze_object_motion(tracked_objects)
+        metrics.update(i, tracked_objects)
+    runtime = time.perf_counter() - start
+
+    result = asdict(params)
+    result.update(metrics.summary())
+    result['runtime_ms'] = round(runtime * 1000.0, 2)
+    return result
+
+# Per-worker cache, loaded once by the pool initializer
+_worker_cache: Optional[DetectionCache] = None
+
+def _init_worker(cache_path: str) -> None:
+    global _worker_cache
+    _worker_cache = DetectionCache.load(cache_path)
+
+def _evaluate_in_worker(params: SweepParams) -> Dict[str, Any]:
+    return evaluate(_worker_cache, params)
+
+def build_grid(static_thresholds: List[float], slow_thresholds: List[float], smoothing_factors: List[float],
+               max_distances: List[float], max_losts: List[int], velocity_weights: List[float]) -> List[SweepParams]:
+    """Cartesian product of the value lists, without static >= slow combinations"""
+    return [SweepParams(*values) for values in itertools.product(
+                static_thresholds, slow_thresholds, smoothing_factors,
+                max_distances, max_losts, velocity_weights)
+            if values[0] < values[1]]
+
+def run_sweep(cache_path: str, grid: List[SweepParams], workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Evaluate every configuration in a process pool, best first"""
+    context = mp.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker, initargs=(cache_path,)) as pool:
+        chunksize = max(1, len(grid) // ((workers or os.cpu_count() or 1) * 4))
+        results = list(pool.map(_evaluate_in_worker, grid, chunksize=chunksize))
+    return sorted(results, key=lambda r: (r['id_switches'], r['state_flip_rate'], r['runtime_ms']))
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Sweep tracker and motion parameters over cached detections')
+    parser.add_argument('video', help='Footage to tune on')
+    parser.add_argument('--cache', help='Detection cache path (default: <video>.detections.npz)')
+    parser.add_argument('--refresh', action='store_true', help='Re-run YOLO even if a cache exists')
+    parser.add_argument('--max-frames', type=int)
+    parser.add_argument('--workers', type=int, help='Worker processes (default: all cores)')
+    parser.add_argument('--static-threshold', type=float, nargs='+', default=[Config.MOTION.static_threshold])
+    parser.add_argument('--slow-threshold', type=float, nargs='+', default=[Config.MOTION.slow_threshold])
+    parser.add_argument('--smoothing-factor', type=float, nargs='+', default=[Config.MOTION.smoothing_factor])
+    parser.add_argument('--max-distance', type=float, nargs='+', default=[150.0])
+    parser.add_argument('--max-lost', type=int, nargs='+', default=[10])
+    parser.add_argument('--velocity-weight', type=float, nargs='+', default=[0.7])
+    parser.add_argument('--top', type=int, default=20, help='Rows to print')
+    parser.add_argument('--json', help='Write all results to this file')
+    args = parser.parse_args()
+
+    cache, cache_path = load_or_build_cache(args.video, args.cache, args.max_frames, args.refresh)
+    grid = build_grid(args.static_threshold, args.slow_threshold, args.smoothing_factor,
+                      args.max_distance, args.max_lost, args.velocity_weight)
+    if not grid:
+        parser.error('Empty grid: every static threshold must be below some slow threshold')
+
+    print(f"Evaluating {len(grid)} configurations on {len(cache)} frames")
+    start = time.perf_counter()
+    results = run_sweep(cache_path, grid, args.workers)
+    print(f"Sweep finished in {time.perf_counter() - start:.1f}s")
+
+    columns = ['static_threshold', 'slow_threshold', 'smoothing_factor', 'max_distance', 'max_lost',
+               'velocity_weight', 'tracks', 'id_switches', 'state_flip_rate', 'runtime_ms']
+    print('  '.join(f"{c:>12.12}" for c in columns))
+    for result in results[:args.top]:
+        print('  '.join(f"{result[c]:>12}" for c in columns))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
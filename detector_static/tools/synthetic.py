@@ -0,0 +1,293 @@
+"""Synthetic scenes for load-testing everything after the detection stage.
+
+SceneGenerator produces deterministic streams of compact detections for any
+number of objects. Classes come from Config.TARGET_CLASSES, and box sizes come
+from Config.DIMENSIONS at a per-object distance. People and cars move with
+drifting headings and distances. Objects are occluded for random spans, and a
+panning camera shifts the whole scene. Frames can optionally be rendered for
+the visualizer.
+
+The load test feeds these detections to track_detections, MotionAnalyzer,
+Visualizer and the audio engine. It reports throughput and per-stage latency
+for each object count. It also counts ID switches against the generator's
+ground-truth identities.
+"""
+
+import argparse
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import cv2
+import numpy as np
+
+from ..config.settings import Config
+from ..core.detector import DETECTION_COLUMNS, ObjectDetector
+from ..audio.engine import SmoothAudioEngine, create_smooth_audio_system, play_sound_async_smooth
+from ..motion.analyzer import MotionAnalyzer
+from ..visualization.display import Visualizer
+from ..utils.clock import FrameClock
+from ..utils.latency import FrameTrace, LatencyTracker
+
+# Width / height of each class's box
+CLASS_ASPECTS = {'person': 0.4, 'car': 1.8, 'couch': 2.0, 'chair': 0.8,
+                 'bed': 1.6, 'dining table': 1.5, 'plant': 0.7}
+# Speed range in pixels per generated frame; other classes stay put
+MOVING_CLASSES = {'person': (1.0, 12.0), 'car': (8.0, 60.0)}
+
+@dataclass
+class SyntheticFrame:
+    """One generated frame"""
+    index: int
+    timestamp: float
+    detections: np.ndarray  # (N, 6) compact detections of the visible objects
+    object_ids: np.ndarray  # Ground-truth identity of each detection row
+    camera_motion: np.ndarray  # Camera translation since the previous frame, pixels
+    image: Optional[np.ndarray] = None
+
+class SceneGenerator:
+    """Deterministic synthetic object streams"""
+    def __init__(self, num_objects: int, seed: int = 0,
+                 width: int = Config.CAMERA.frame_width, height: int = Config.CAMERA.frame_height,
+                 fps: float = 30.0, ego_motion: float = 0.0, occlusion_rate: float = 0.01,
+                 max_occlusion: int = 15, render: bool = False):
+        """
+        Args:
+            num_objects: Objects in the scene
+            seed: Same seed, same stream
+            width, height: Frame size in pixels
+            fps: Frame rate of the timestamps
+            ego_motion: Peak camera pan speed in pixels per frame, 0 for a fixed camera
+            occlusion_rate: Chance per object and frame that an occlusion starts
+            max_occlusion: Longest occlusion in frames
+            render: Also draw an image per frame
+        """
+        self.rng = np.random.default_rng(seed)
+        self.width, self.height = width, height
+        self.fps = fps
+        self.ego_motion = ego_motion
+        self.occlusion_rate = occlusion_rate
+        self.max_occlusion = max_occlusion
+        self.render = render
+        self.names = {i: name for i, name in enumerate(Config.TARGET_CLASSES)}
+        self.frame_index = 0
+        self.camera_offset = np.zeros(2)
+
+        rng = self.rng
+        n = num_objects
+        self.cls = rng.integers(0, len(self.names), n)
+        class_names = [self.names[c] for c in self.cls]
+        self.aspect = np.array([CLASS_ASPECTS.get(name, 1.0) for name in class_names])
+        self.real_size = np.array([Config.DIMENSIONS.heights.get(name, 100) for name in class_names], dtype=np.float64)
+        self.distance = rng.uniform(0.8, 8.0, n)
+        self.distance_rate = np.zeros(n)
+        self.position = np.column_stack([rng.uniform(0, width, n), rng.uniform(0, height, n)])
+
+        speed_range = np.array([MOVING_CLASSES.get(name, (0.0, 0.0)) for name in class_names])
+        self.moving = speed_range[:, 1] > 0
+        speed = rng.uniform(speed_range[:, 0], speed_range[:, 1])
+        self.heading = rng.uniform(0, 2 * np.pi, n)
+        self.speed = speed
+        self.distance_rate[self.moving] = rng.uniform(-0.02, 0.02, int(self.moving.sum()))
+        self.occluded_for = np.zeros(n, dtype=np.int64)
+        self.confidence = rng.uniform(0.4, 0.95, n)
+
+        if render:
+            # Static texture larger than the frame, so ego-motion shows up as image motion
+            pad = int(ego_motion * fps * 2) + 64
+            noise = rng.integers(0, 255, ((height + 2 * pad) // 8, (width + 2 * pad) // 8), dtype=np.uint8)
+            texture = cv2.resize(noise, (width + 2 * pad, height + 2 * pad), interpolation=cv2.INTER_NEAREST)
+            self.background = cv2.cvtColor(texture, cv2.COLOR_GRAY2BGR)
+            self.background_pad = pad
+            self.colors = rng.integers(64, 256, (len(self.names), 3))
+
+    def _step(self) -> np.ndarray:
+        """Advance object and camera state by one frame, return the camera translation"""
+        rng = self.rng
+        moving = self.moving
+
+        # Movers wander: headings drift and walls bounce
+        self.heading[moving] += rng.normal(0.0, 0.1, int(moving.sum()))
+        velocity = np.column_stack([np.cos(self.heading), np.sin(self.heading)]) * self.speed[:, None]
+        self.position += velocity
+        out_x = (self.position[:, 0] < 0) | (self.position[:, 0] > self.width)
+        out_y = (self.position[:, 1] < 0) | (self.position[:, 1] > self.height)
+        self.heading[out_x] = np.pi - self.heading[out_x]
+        self.heading[out_y] = -self.heading[out_y]
+        np.clip(self.position, 0, [self.width, self.height], out=self.position)
+        self.distance = np.clip(self.distance + self.distance_rate, 0.5, 10.0)
+
+        # Occlusions start at random and last a random number of frames
+        self.occluded_for = np.maximum(self.occluded_for - 1, 0)
+        starts = (self.occluded_for == 0) & (rng.random(len(self.cls)) < self.occlusion_rate)
+        self.occluded_for[starts] = rng.integers(1, self.max_occlusion + 1, int(starts.sum()))
+
+        # Camera pans slowly back and forth
+        t = self.frame_index / self.fps
+        pan = np.array([self.ego_motion * np.sin(0.5 * t), 0.3 * self.ego_motion * np.sin(0.23 * t)])
+        self.camera_offset += pan
+        return pan
+
+    def next_frame(self) -> SyntheticFrame:
+        camera_motion = self._step() if self.frame_index > 0 else np.zeros(2)
+
+        # Box size from distance, as the analyzer inverts it: diagonal = size * focal / distance
+        diagonal = self.real_size * Config.CAMERA.focal_length / (self.distance * 100.0)
+        box_h = diagonal / np.sqrt(1.0 + self.aspect ** 2)
+        box_w = box_h * self.aspect
+
+        # Objects live in world coordinates; the camera sees them shifted by its offset
+        center = self.position - self.camera_offset
+        visible = ((self.occluded_for == 0) &
+                   (center[:, 0] >= 0) & (center[:, 0] < self.width) &
+                   (center[:, 1] >= 0) & (center[:, 1] < self.height))
+
+        object_ids = np.nonzero(visible)[0]
+        detections = np.empty((len(object_ids), DETECTION_COLUMNS), dtype=np.float32)
+        jitter = self.rng.normal(0.0, 1.0, (len(object_ids), 2))
+        cx, cy = center[object_ids, 0] + jitter[:, 0], center[object_ids, 1] + jitter[:, 1]
+        half_w, half_h = box_w[object_ids] / 2, box_h[object_ids] / 2
+        detections[:, 0] = np.clip(cx - half_w, 0, self.width - 1)
+        detections[:, 1] = np.clip(cy - half_h, 0, self.height - 1)
+        detections[:, 2] = np.clip(cx + half_w, 0, self.width - 1)
+        detections[:, 3] = np.clip(cy + half_h, 0, self.height - 1)
+        detections[:, 4] = np.clip(self.confidence[object_ids] + self.rng.normal(0.0, 0.03, len(object_ids)), 0.25, 1.0)
+        detections[:, 5] = self.cls[object_ids]
+
+        frame = SyntheticFrame(self.frame_index, self.frame_index / self.fps, detections, object_ids,
+                               camera_motion.astype(np.float32))
+        if self.render:
+            frame.image = self._render(detections)
+        self.frame_index += 1
+        return frame
+
+    def _render(self, detections: np.ndarray) -> np.ndarray:
+        pad = self.background_pad
+        ox = int(np.clip(pad + self.camera_offset[0], 0, 2 * pad))
+        oy = int(np.clip(pad + self.camera_offset[1], 0, 2 * pad))
+        image = self.background[oy:oy + self.height, ox:ox + self.width].copy()
+        # Far objects first so near ones cover them
+        for x1, y1, x2, y2, _, cls_id in detections[np.argsort((detections[:, 2] - detections[:, 0]))]:
+            color = tuple(int(c) for c in self.colors[int(cls_id)])
+            cv2.rectangle(image, (int(x1), int(y1)), (int(x2), int(y2)), color, -1)
+        return image
+
+def count_id_switches(truth_to_track: Dict[int, int], frame: SyntheticFrame, tracked_objects) -> int:
+    """Ground-truth objects whose track id changed since they were last seen"""
+    track_by_center = {obj.center: obj.object_id for obj in tracked_objects}
+    switches = 0
+    for row, truth_id in zip(frame.detections, frame.object_ids):
+        center = ((int(row[0]) + int(row[2])) // 2, (int(row[1]) + int(row[3])) // 2)
+        track_id = track_by_center.get(center)
+        if track_id is None:
+            continue
+        previous = truth_to_track.get(int(truth_id))
+        if previous is not None and previous != track_id:
+            switches += 1
+        truth_to_track[int(truth_id)] = track_id
+    return switches
+
+def run_load_test(num_objects: int, frames: int, seed: int = 0, ego_motion: float = 0.0,
+                  occlusion_rate: float = 0.01, render: bool = False,
+                  audio_engine: Optional[SmoothAudioEngine] = None) -> Dict[str, Any]:
+    """Drive tracking, motion analysis, visualization and audio with one synthetic stream"""
+    generator = SceneGenerator(num_objects, seed, ego_motion=ego_motion,
+                               occlusion_rate=occlusion_rate, render=render)
+    clock = FrameClock()
+    detector = ObjectDetector(load_model=False, clock=clock)
+    detector.names = generator.names
+    analyzer = MotionAnalyzer(verbose=False, clock=clock)
+    visualizer = Visualizer()
+    latency_tracker = LatencyTracker()
+    if audio_engine is not None:
+        audio_engine.clock = clock
+        audio_engine.latency_tracker = latency_tracker
+
+    truth_to_track: Dict[int, int] = {}
+    id_switches = 0
+    detections_total = 0
+    busy = 0.0
+    for _ in range(frames):
+        frame = generator.next_frame()
+        detections_total += len(frame.detections)
+        clock.set(frame.timestamp)
+        trace = FrameTrace(frame.index)
+
+        start = time.perf_counter()
+        with trace.stage('track'):
+            tracked_objects = detector.track_detections(frame.detections)
+        with trace.stage('motion'):
+            analyzer.camera_motion = frame.camera_motion
+            motion, distances, x_positions = analyzer.analyze_object_motion(tracked_objects)
+        if render:
+            with trace.stage('visualize'):
+                visualizer.draw_results(frame.image, tracked_objects)
+        if audio_engine is not None:
+            with trace.stage('audio_submit'):
+                play_sound_async_smooth(audio_engine, motion, distances, bool(tracked_objects),
+                                        x_positions, tracked_objects, trace)
+        else:
+            latency_tracker.complete(trace)
+        busy += time.perf_counter() - start
+
+        id_switches += count_id_switches(truth_to_track, frame, tracked_objects)
+
+    if audio_engine is not None:
+        # Give the audio thread a tick to apply the last frame
+        time.sleep(0.1)
+    summary = latency_tracker.summary()
+    return {
+        'objects': num_objects,
+        'frames': frames,
+        'detections_per_frame': round(detections_total / max(1, frames), 1),
+        'fps': round(frames / busy, 1) if busy > 0 else 0.0,
+        'ms_per_frame': round(busy * 1000.0 / max(1, frames), 3),
+        'id_switches': id_switches,
+        'stages': summary['stages'],
+        'end_to_end': summary['end_to_end'],
+    }
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Load-test tracking, motion, display and audio with synthetic scenes')
+    parser.add_argument('--objects', type=int, nargs='+', default=[10, 50, 100, 200, 500])
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--ego-motion', type=float, default=0.0, help='Peak camera pan in pixels per frame')
+    parser.add_argument('--occlusion', type=float, default=0.01, help='Chance per object and frame to become occluded')
+    parser.add_argument('--render', action='store_true', help='Render frames and include the visualizer')
+    parser.add_argument('--audio', action='store_true', help='Include the configured audio engine')
+    parser.add_argument('--dummy-audio', action='store_true', help='Use a silent audio driver (CI machines)')
+    parser.add_argument('--json', help='Write all results to this file')
+    args = parser.parse_args()
+
+    if args.dummy_audio:
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+    audio_engine = None
+    if args.audio:
+        sound_dir, _, _, _ = Config.get_sound_paths()
+        audio_engine = create_smooth_audio_system(sound_dir, Config.AUDIO.profile_path)
+
+    results = []
+    try:
+        print(f"{'objects':>8} {'dets/frame':>10} {'fps':>9} {'ms/frame':>9} {'id sw':>6}  stage p95 ms")
+        for num_objects in args.objects:
+            result = run_load_test(num_objects, args.frames, args.seed, args.ego_motion,
+                                   args.occlusion, args.render, audio_engine)
+            results.append(result)
+            stages = '  '.join(f"{name} {stats['p95_ms']:.2f}" for name, stats in result['stages'].items())
+            print(f"{result['objects']:>8} {result['detections_per_frame']:>10} {result['fps']:>9} "
+                  f"{result['ms_per_frame']:>9} {result['id_switches']:>6}  {stages}")
+    finally:
+        if audio_engine is not None:
+            audio_engine.cleanup()
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+"""Time sources for tracking, motion analysis and audio cooldowns.
+
+Live runs use SystemClock. Replays and offline tools use FrameClock, which is
+advanced to each frame's own timestamp. Running faster or slower than real
+time then gives the same tracks, speeds and states as a live run.
+"""
+
+import time
+
+class Clock:
+    """Source of timestamps in seconds"""
+    def now(self) -> float:
+        raise NotImplementedError
+
+class SystemClock(Clock):
+    """Monotonic wall time"""
+    def now(self) -> float:
+        return time.monotonic()
+
+class FrameClock(Clock):
+    """Time that only moves when the frame source says so"""
+    def __init__(self, start: float = 0.0):
+        self.current = start
+
+    def now(self) -> float:
+        return self.current
+
+    def set(self, timestamp: float) -> None:
+        """Jump to a frame's timestamp; never moves backwards"""
+        self.current = max(self.current, timestamp)
+
+    def advance(self, dt: float) -> None:
+        self.current += max(0.0, dt)
@@ -0,0 +1,155 @@
+"""Glass-to-ear latency tracing.
+
+Every frame gets a FrameTrace stamped at capture, on entry and exit of each
+pipeline stage, and finally by the audio thread when it applies the volume or
+pan change the frame caused. Completed traces feed latency histograms and an
+optional JSON-lines trace file.
+"""
+
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, IO, List, Optional
+
+AUDIO_APPLIED = 'audio_applied'
+
+class FrameTrace:
+    """Timestamps of one frame's trip through the pipeline (time.perf_counter seconds)"""
+    def __init__(self, frame_id: int, capture_ts: Optional[float] = None):
+        self.frame_id = frame_id
+        self.capture_ts = capture_ts if capture_ts is not None else time.perf_counter()
+        self.stages: Dict[str, List[float]] = {}  # stage -> [enter, exit]
+        self.marks: Dict[str, float] = {}
+
+    def enter(self, stage: str) -> None:
+        self.stages[stage] = [time.perf_counter(), math.nan]
+
+    def exit(self, stage: str) -> None:
+        self.stages[stage][1] = time.perf_counter()
+
+    @contextmanager
+    def stage(self, stage: str):
+        """Stamp entry and exit of a stage"""
+        self.enter(stage)
+        try:
+            yield self
+        finally:
+            self.exit(stage)
+
+    def mark(self, name: str) -> None:
+        """Stamp a point event, e.g. the audio thread applying the frame's change"""
+        self.marks[name] = time.perf_counter()
+
+    def end_to_end(self) -> Optional[float]:
+        """Capture to audio application in seconds, if the audio stamp exists"""
+        if AUDIO_APPLIED not in self.marks:
+            return None
+        return self.marks[AUDIO_APPLIED] - self.capture_ts
+
+    def to_dict(self) -> Dict:
+        """Times in milliseconds relative to capture"""
+        def rel(t: float) -> Optional[float]:
+            return None if math.isnan(t) else round((t - self.capture_ts) * 1000.0, 3)
+        return {
+            'frame': self.frame_id,
+            'stages': {name: [rel(t0), rel(t1)] for name, (t0, t1) in self.stages.items()},
+            'marks': {name: rel(t) for name, t in self.marks.items()},
+        }
+
+class LatencyHistogram:
+    """Log-spaced latency histogram from 0.1 ms to ~10 s"""
+    def __init__(self, bins_per_decade: int = 20, min_ms: float = 0.1, decades: int = 5):
+        self.edges = [min_ms * 10 ** (i / bins_per_decade) for i in range(bins_per_decade * decades + 1)]
+        self.counts = [0] * (len(self.edges) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, latency_ms: float) -> None:
+        lo, hi = 0, len(self.edges)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.edges[mid] <= latency_ms:
+                lo = mid + 1
+            else:
+                hi = mid
+        self.counts[lo] += 1
+        self.total += 1
+        self.sum_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+
+    def percentile(self, p: float) -> float:
+        """Upper edge of the bin holding the p-th percentile (ms)"""
+        if self.total == 0:
+            return math.nan
+        rank = p / 100.0 * self.total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(self.edges[i], self.max_ms) if i < len(self.edges) else self.max_ms
+        return self.max_ms
+
+    def summary(self) -> Dict[str, float]:
+        if self.total == 0:
+            return {'count': 0}
+        return {
+            'count': self.total,
+            'mean_ms': round(self.sum_ms / self.total, 3),
+            'p50_ms': round(self.percentile(50), 3),
+            'p95_ms': round(self.percentile(95), 3),
+            'p99_ms': round(self.percentile(99), 3),
+            'max_ms': round(self.max_ms, 3),
+        }
+
+class LatencyTracker:
+    """Collects completed traces from the vision and audio threads"""
+    def __init__(self, trace_path: Optional[str] = None):
+        self.lock = threading.Lock()
+        self.end_to_end = LatencyHistogram()
+        self.stages: Dict[str, LatencyHistogram] = {}
+        self.completed = 0
+        self.without_audio = 0
+        self.superseded = 0  # Frames whose audio update was overwritten before being applied
+        self.trace_file: Optional[IO[str]] = open(trace_path, 'w') if trace_path else None
+
+    def complete(self, trace: FrameTrace) -> None:
+        """Record a finished trace (safe to call from any thread)"""
+        with self.lock:
+            self.completed += 1
+            for name, (t0, t1) in trace.stages.items():
+                if not math.isnan(t1):
+                    self.stages.setdefault(name, LatencyHistogram()).add((t1 - t0) * 1000.0)
+
+            total = trace.end_to_end()
+            if total is None:
+                self.without_audio += 1
+            else:
+                self.end_to_end.add(total * 1000.0)
+
+            if self.trace_file is not None:
+                self.trace_file.write(json.dumps(trace.to_dict()) + '\n')
+
+    def supersede(self, trace: FrameTrace) -> None:
+        """A newer frame replaced this one before the audio thread picked it up"""
+        with self.lock:
+            self.superseded += 1
+        self.complete(trace)
+
+    def summary(self) -> Dict:
+        with self.lock:
+            return {
+                'frames': self.completed,
+                'without_audio': self.without_audio,
+                'superseded': self.superseded,
+                'end_to_end': self.end_to_end.summary(),
+                'stages': {name: hist.summary() for name, hist in self.stages.items()},
+            }
+
+    def close(self) -> None:
+        with self.lock:
+            if self.trace_file is not None:
+                self.trace_file.close()
+                self.trace_file = None
@@ -0,0 +1,127 @@
+"""Runtime-toggleable sampling profiler with collapsed-stack output.
+
+While running, a background thread periodically snapshots the stacks of the
+registered threads via ``sys._current_frames`` and counts identical stacks.
+When stopped (or when the window runs out) it writes one ``.folded`` file per
+thread in the collapsed format read by flamegraph.pl, speedscope and inferno.
+Nothing runs while the profiler is off.
+"""
+
+import itertools
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+from ..config.settings import Config
+
+def collapse_stack(frame) -> str:
+    """Render a frame chain as 'root;...;leaf'"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+class SamplingProfiler:
+    """Samples named threads for a bounded window and writes flamegraph input"""
+    def __init__(self, output_dir: Optional[str] = None,
+                 interval_ms: Optional[float] = None,
+                 max_window_sec: Optional[float] = None):
+        """Arguments left as None are read from Config.PROFILER"""
+        cfg = Config.PROFILER
+        self.output_dir = output_dir if output_dir is not None else cfg.output_dir
+        self.interval = (interval_ms if interval_ms is not None else cfg.interval_ms) / 1000.0
+        self.max_window = max_window_sec if max_window_sec is not None else cfg.max_window_sec
+        self.threads: Dict[str, int] = {}  # name -> thread ident
+        self.stop_event = threading.Event()
+        self.sampler: Optional[threading.Thread] = None
+        self.last_outputs: List[str] = []
+
+    @property
+    def running(self) -> bool:
+        return self.sampler is not None and self.sampler.is_alive()
+
+    def register_thread(self, name: str, thread: Optional[threading.Thread] = None) -> None:
+        """Sample this thread (default: the calling thread) under the given name"""
+        thread = thread if thread is not None else threading.current_thread()
+        self.threads[name] = thread.ident
+
+    def start(self) -> None:
+        """Begin sampling; stops by itself after max_window_sec"""
+        if self.running or not self.threads:
+            return
+        self.stop_event.clear()
+        self.sampler = threading.Thread(target=self._sample_loop, name='sampling-profiler', daemon=True)
+        self.sampler.start()
+        print(f"DEBUG: Profiler started ({len(self.threads)} threads, up to {self.max_window:.0f}s)")
+
+    def stop(self) -> None:
+        """Ask the sampler to finish; it writes its output on the way out"""
+        self.stop_event.set()
+
+    def toggle(self) -> None:
+        if self.running:
+            self.stop()
+        else:
+            self.start()
+
+    def install_signal_handler(self, signum: Optional[int] = None) -> bool:
+        """Toggle on a signal (SIGUSR1 by default). Returns False where unsupported."""
+        if signum is None:
+            signum = getattr(signal, 'SIGUSR1', None)
+        if signum is None or threading.current_thread() is not threading.main_thread():
+            return False
+        signal.signal(signum, lambda *_: self.toggle())
+        return True
+
+    def _sample_loop(self) -> None:
+        counts: Dict[str, Counter] = {name: Counter() for name in self.threads}
+        own_ident = threading.get_ident()
+        start = time.time()
+        samples = 0
+
+        while not self.stop_event.wait(self.interval):
+            frames = sys._current_frames()
+            for name, ident in self.threads.items():
+                if ident == own_ident:
+                    continue
+                frame = frames.get(ident)
+                if frame is not None:
+                    counts[name][collapse_stack(frame)] += 1
+            samples += 1
+            del frames
+
+            if time.time() - start >= self.max_window:
+                break
+
+        self.last_outputs = self._write(counts)
+        print(f"DEBUG: Profiler stopped after {samples} samples in {time.time() - start:.1f}s; "
+              f"wrote {', '.join(self.last_outputs) or 'nothing'}")
+
+    def _write(self, counts: Dict[str, Counter]) -> List[str]:
+        """Write one collapsed-stack file per thread, never overwriting an earlier capture"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        now = time.time()
+        stamp = f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}-{int(now * 1000) % 1000:03d}"
+        paths = []
+        for name, stacks in counts.items():
+            if not stacks:
+                continue
+            for attempt in itertools.count():
+                suffix = f"-{attempt}" if attempt else ''
+                path = os.path.join(self.output_dir, f"{stamp}-{name}{suffix}.folded")
+                try:
+                    f = open(path, 'x')
+                    break
+                except FileExistsError:
+                    continue
+            with f:
+                for stack, count in stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+            paths.append(path)
+        return paths
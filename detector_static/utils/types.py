@@ -12,4 +12,9 @@ class TrackedObject:
     confidence: float
     bbox: Tuple[int, int, int, int]  # x1, y1, x2, y2
     motion_state: str = 'unknown'
-    distance: float = -1.0 
\ No newline at end of file
+    distance: float = -1.0
+    speed: float = 0.0  # Smoothed camera-compensated speed, pixels per reference frame (Config.MOTION.reference_fps)
+    velocity: Tuple[float, float] = (0.0, 0.0)  # Image-plane velocity from the tracker, pixels per second
+    distance_rate: float = 0.0  # Smoothed change of distance, meters per second (negative = approaching)
+    x_rate: float = 0.0  # Smoothed camera-compensated horizontal velocity, pixels per second
+    class_id: int = -1  # Model class id, indexes the runtime config tables; -1 if unknown 
\ No newline at end of file
@@ -5,14 +5,15 @@ import numpy as np
 from typing import List
 
 from ..utils.types import TrackedObject
-from ..config.settings import Config
+from ..config.runtime import get_runtime_config
 
 class Visualizer:
     """Handles visualization of detection and tracking results"""
     @staticmethod
     def draw_results(frame: np.ndarray, tracked_objects: List[TrackedObject]) -> np.ndarray:
         """Draw bounding boxes and labels for tracked objects"""
-        frame_width = Config.CAMERA.frame_width
+        runtime = get_runtime_config()
+        frame_width = runtime.camera.frame_width
         
         for obj in tracked_objects:
             x1, y1, x2, y2 = obj.bbox
@@ -41,9 +42,7 @@ class Visualizer:
             ]
             
             # Draw bounding box
-            color = (0, 255, 0) if motion == 'static' else \
-                    (0, 255, 255) if motion == 'slow' else \
-                    (0, 0, 255)
+            color = runtime.motion_color(motion)
             
             cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
             
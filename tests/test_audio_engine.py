@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+pygame = pytest.importorskip('pygame')
+
+from detector_static.audio.engine import SmoothAudioEngine
+from detector_static.audio.library import SampleLibrary, SoundProfile
+from detector_static.config.settings import Config
+from detector_static.utils.clock import FrameClock
+from detector_static.utils.types import TrackedObject
+
+SOUND_DIR = Config.get_sound_paths()[0]
+
+@pytest.fixture
+def engine_factory(tmp_path):
+    engines = []
+    def create(profile=None, clock=None):
+        library = SampleLibrary(str(tmp_path))  # Empty: every library reference is unresolvable
+        engine = SmoothAudioEngine(SOUND_DIR, profile, library=library, clock=clock)
+        engines.append(engine)
+        return engine
+    yield create
+    for engine in engines:
+        engine.cleanup()
+
+def test_unresolvable_profile_sample_falls_back_to_the_default(engine_factory):
+    """Regression: one unknown front-end key used to disable all audio"""
+    profile = SoundProfile.from_dict({'states': {'fast': 'french horn/french-horn_A2_025_forte_normal'}})
+    engine = engine_factory(profile)
+    default = SoundProfile.default().states['fast']
+    assert engine.voice_samples['fast'] == os.path.join(SOUND_DIR, default)
+    assert set(engine.sounds) == {'fast', 'slow', 'static'}
+
+def test_extrapolation_runs_on_the_engine_clock(engine_factory):
+    clock = FrameClock(5.0)
+    engine = engine_factory(clock=clock)
+    obj = TrackedObject(object_id=0, center=(400, 360), class_name='person', confidence=0.9,
+                        bbox=(370, 260, 430, 460), motion_state='slow', distance=2.0,
+                        velocity=(-300.0, 0.0), x_rate=50.0)
+    engine.update_from_motion_state('slow', [2.0], True, [500.0], [obj])
+    assert engine.closest_motion.predict(clock.now())[0] == pytest.approx(500.0)
+    clock.advance(0.1)
+    # Compensated position, compensated velocity; the tracker's raw velocity is not used
+    assert engine.closest_motion.predict(clock.now())[0] == pytest.approx(505.0)
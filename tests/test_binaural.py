@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from detector_static.audio.binaural import (BinauralRenderer, BinauralState, design_kernel,
+                                            direction_from_position, woodworth_itd)
+
+RATE, BLOCK = 16000, 256
+
+def test_image_points_map_to_directions():
+    assert direction_from_position(320, 240, 640, 480, 500) == pytest.approx((0.0, 0.0))
+    azimuth, elevation = direction_from_position(600, 40, 640, 480, 500)
+    assert azimuth > 0 and elevation > 0
+
+def test_itd_is_positive_to_the_right_and_antisymmetric():
+    assert woodworth_itd(0.0) == 0.0
+    assert woodworth_itd(45.0) > 0
+    assert woodworth_itd(-45.0) == pytest.approx(-woodworth_itd(45.0))
+    assert woodworth_itd(90.0) == pytest.approx(0.000656, abs=2e-5)
+    assert woodworth_itd(180.0) == woodworth_itd(90.0)
+
+def arrival(channel: np.ndarray) -> int:
+    return int(np.argmax(np.abs(channel) > 0.1 * np.abs(channel).max()))
+
+@pytest.mark.parametrize('azimuth, near, far', [(60.0, 1, 0), (-60.0, 0, 1)])
+def test_source_reaches_the_near_ear_first_and_louder(azimuth, near, far):
+    renderer = BinauralRenderer(RATE, BLOCK)
+    impulse = np.zeros(BLOCK)
+    impulse[0] = 1.0
+    out = renderer.process(BinauralState(renderer.kernel_size), impulse, azimuth, 0.0)
+    delay = arrival(out[:, far]) - arrival(out[:, near])
+    assert delay == pytest.approx(abs(woodworth_itd(azimuth)) * RATE, abs=1.5)
+    assert np.sum(out[:, near] ** 2) > np.sum(out[:, far] ** 2)
+
+def test_overlap_add_matches_one_long_convolution():
+    renderer = BinauralRenderer(RATE, BLOCK)
+    signal = np.random.default_rng(0).normal(size=4 * BLOCK)
+    state = BinauralState(renderer.kernel_size)
+    blocks = np.concatenate([renderer.process(state, signal[i:i + BLOCK], 30.0, 10.0)
+                             for i in range(0, len(signal), BLOCK)])
+    kernel = renderer.kernel(30.0, 10.0)
+    for ear in range(2):
+        expected = np.convolve(signal, kernel[ear])[:len(signal)]
+        np.testing.assert_allclose(blocks[:, ear], expected, atol=1e-9)
+
+def test_kernels_shorter_than_the_largest_delay_are_refused():
+    with pytest.raises(ValueError):
+        BinauralRenderer(RATE, BLOCK, kernel_size=3)
+    with pytest.raises(ValueError):
+        BinauralRenderer(44100, BLOCK, kernel_size=16)  # 0.66 ms is 29 taps here
+    assert design_kernel(0.0, 0.0, RATE, 3).shape == (2, 3)  # No fade on tiny kernels
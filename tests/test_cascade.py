@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('ultralytics')
+
+from detector_static.core.cascade import CascadeVerifier, Verdict, VerificationBudget, crop_around
+from detector_static.core.detector import ObjectDetector
+from detector_static.utils.clock import FrameClock
+
+def test_budget_refills_on_its_clock():
+    clock = FrameClock(100.0)
+    budget = VerificationBudget(2.0, clock)
+    assert [budget.try_take() for _ in range(3)] == [True, True, False]
+    clock.advance(0.5)
+    assert budget.try_take() and not budget.try_take()
+
+def test_budget_never_holds_more_than_one_second_of_tokens():
+    clock = FrameClock()
+    budget = VerificationBudget(2.0, clock)
+    clock.advance(3600.0)
+    assert [budget.try_take() for _ in range(3)] == [True, True, False]
+
+def test_crop_around_is_clipped_to_the_frame():
+    frame = np.zeros((100, 200, 3), dtype=np.uint8)
+    assert crop_around(frame, (50, 20, 70, 60), 2.0).shape == (80, 40, 3)
+    assert crop_around(frame, (0, 0, 40, 40), 2.0).shape == (60, 60, 3)
+
+def test_verdicts_relabel_or_drop_tracks():
+    clock = FrameClock()
+    detector = ObjectDetector(load_model=False, clock=clock)
+    detector.names = {0: 'person', 1: 'car'}
+    verifier = CascadeVerifier(run_async=False, max_per_sec=100.0, clock=clock)
+    labels = {0: 'car', 1: None}  # Track 0 is really a car, track 1 is nothing
+    verifier._verify = lambda object_id, crop: Verdict(object_id, labels[object_id], 0.9)
+    detector.cascade = verifier
+
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    detections = np.array([[10, 10, 60, 110, 0.9, 0],
+                           [300, 200, 340, 280, 0.3, 0]], dtype=np.float32)  # Second is borderline
+    first = detector.apply_cascade(frame, detector.track_detections(detections))
+    assert [obj.class_name for obj in first] == ['person', 'person']  # Verdicts arrive next frame
+
+    clock.advance(1 / 30)
+    second = detector.apply_cascade(frame, detector.track_detections(detections))
+    assert [(obj.object_id, obj.class_name, obj.class_id) for obj in second] == [(0, 'car', 1)]
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from detector_static.config.settings import Config
+from detector_static.motion.analyzer import MotionAnalyzer
+from detector_static.motion.tracker import CentroidTracker
+from detector_static.utils.clock import FrameClock
+from detector_static.utils.types import TrackedObject
+
+def test_frame_clock_never_moves_backwards():
+    clock = FrameClock(1.0)
+    clock.set(2.0)
+    clock.set(1.5)
+    clock.advance(-1.0)
+    assert clock.now() == 2.0
+    clock.advance(0.5)
+    assert clock.now() == 2.5
+
+def test_tracker_predicts_on_its_clock():
+    clock = FrameClock()
+    tracker = CentroidTracker(velocity_weight=0.0, clock=clock)
+    tracker.update([(100.0, 100.0)])
+    clock.set(0.1)
+    tracker.update([(110.0, 100.0)])
+    clock.set(0.2)
+    assert tracker.predict_new_position(tracker.objects[0]) == pytest.approx([120.0, 100.0])
+
+def speeds(frame_step: int, frames: int = 30, fps: float = 30.0, step_px: float = 6.0):
+    """Smoothed speed and state of an object moving step_px per 1/fps s, sampled every frame_step frames"""
+    clock = FrameClock()
+    analyzer = MotionAnalyzer(verbose=False, clock=clock)
+    for i in range(0, frames, frame_step):
+        clock.set(i / fps)
+        x = 100 + step_px * i
+        obj = TrackedObject(object_id=0, center=(x, 200), class_name='person', confidence=0.9,
+                            bbox=(x - 30, 100, x + 30, 300))
+        analyzer.analyze_object_motion([obj])
+    return obj.speed, obj.motion_state
+
+def test_speed_does_not_depend_on_dropped_frames():
+    every_frame, every_other = speeds(1), speeds(2)
+    assert every_frame[0] == pytest.approx(6.0 * 30.0 / Config.MOTION.reference_fps, rel=1e-3)
+    assert every_other[0] == pytest.approx(every_frame[0], rel=1e-3)
+    assert every_other[1] == every_frame[1]
+
+@pytest.mark.parametrize('step_px, state', [(15, 'static'), (40, 'slow'), (80, 'fast')])
+def test_live_rate_keeps_per_frame_thresholds(step_px, state):
+    """At the 10 FPS of the live loop, thresholds still read as pixels per processed frame"""
+    speed, motion_state = speeds(1, fps=10.0, step_px=step_px)
+    assert speed == pytest.approx(step_px, rel=1e-3)
+    assert motion_state == state
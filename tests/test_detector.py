@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('ultralytics')
+
+from detector_static.config.settings import Config
+from detector_static.core.detector import ObjectDetector, box_iou, merge_detections, prepare_frame, results_to_array
+from detector_static.utils.clock import FrameClock
+
+def test_prepare_frame_resizes_camera_frames():
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    assert prepare_frame(frame).shape == (Config.CAMERA.frame_height, Config.CAMERA.frame_width, 3)
+
+def test_prepare_frame_passes_prepared_frames_through():
+    frame = np.zeros((Config.CAMERA.frame_height, Config.CAMERA.frame_width, 3), dtype=np.uint8)
+    assert prepare_frame(frame) is frame
+
+def test_box_iou():
+    boxes = np.array([[0, 0, 10, 10], [5, 0, 15, 10], [20, 20, 30, 30]], dtype=np.float32)
+    assert box_iou(boxes[0], boxes) == pytest.approx([1.0, 1 / 3, 0.0])
+
+def test_merge_keeps_the_most_confident_of_overlapping_same_class_boxes():
+    detections = np.array([
+        [0, 0, 10, 10, 0.6, 0],
+        [1, 0, 11, 10, 0.9, 0],  # Overlaps the first, more confident
+        [1, 0, 11, 10, 0.5, 1],  # Same place, other class
+        [50, 50, 60, 60, 0.4, 0],
+    ], dtype=np.float32)
+    merged = merge_detections(detections, iou_threshold=0.5)
+    assert merged[:, 4].tolist() == pytest.approx([0.9, 0.5, 0.4])
+
+def test_roi_crops_cover_predicted_track_positions():
+    detector = ObjectDetector(load_model=False, clock=FrameClock())
+    detector.names = {0: 'person'}
+    detector.track_detections(np.array([[600, 300, 640, 380, 0.9, 0]], dtype=np.float32))
+    frame = np.zeros((Config.CAMERA.frame_height, Config.CAMERA.frame_width, 3), dtype=np.uint8)
+    [(x1, y1, x2, y2)] = detector._roi_crops(frame)
+    assert x1 <= 600 and x2 >= 640 and y1 <= 300 and y2 >= 380
+    assert x2 - x1 >= Config.DETECTION.roi_min_crop
+
+class FakeTensor:
+    def __init__(self, values):
+        self.values = np.asarray(values, dtype=np.float32)
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self.values
+
+class FakeBoxes:
+    def __init__(self, rows):
+        rows = np.asarray(rows, dtype=np.float32)
+        self.xyxy, self.conf, self.cls = FakeTensor(rows[:, :4]), FakeTensor(rows[:, 4]), FakeTensor(rows[:, 5])
+
+    def __len__(self):
+        return len(self.cls.values)
+
+class FakeResult:
+    def __init__(self, rows):
+        self.boxes = FakeBoxes(rows)
+
+def test_results_keep_every_class_without_a_mask():
+    """Pool workers answer unfiltered, so classes added in the parent are not lost"""
+    result = FakeResult([[0, 0, 10, 10, 0.9, 0], [5, 5, 20, 20, 0.8, 2]])
+    assert results_to_array(result, None)[:, 5].tolist() == [0, 2]
+    assert results_to_array(result, np.array([True, False, False]))[:, 5].tolist() == [0]
+
+def test_region_pass_uses_the_two_tier_detector_in_roi_mode(monkeypatch):
+    monkeypatch.setattr(Config.DETECTION, 'roi_mode', True)
+    detector = ObjectDetector(load_model=False, clock=FrameClock())
+    detector.names = {0: 'person'}
+    detector.track_detections(np.array([[600, 300, 640, 380, 0.9, 0]], dtype=np.float32))
+
+    shapes = []
+    def model(images, imgsz, verbose):
+        shapes.extend(image.shape[:2] for image in images)
+        return [FakeResult([[2, 2, 12, 12, 0.9, 0]]) for _ in images]
+    detector.model = model
+
+    frame = np.zeros((Config.CAMERA.frame_height, Config.CAMERA.frame_width, 3), dtype=np.uint8)
+    detector.detect_and_track_region(frame, (500, 250, 700, 450), margin=0)
+    assert shapes[0] == (200, 200)  # Low-resolution tier covers only the region
+    assert len(shapes) == 2  # Plus the crop around the track inside it
+    boxes = detector.last_detections
+    assert (boxes[:, 0] >= 500).all() and (boxes[:, 2] <= 700).all()
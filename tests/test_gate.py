@@ -0,0 +1,64 @@
+import cv2
+import numpy as np
+import pytest
+
+from detector_static.config.settings import Config
+from detector_static.motion.gate import ChangeGate
+from detector_static.utils.clock import FrameClock
+
+WIDTH, HEIGHT = Config.CAMERA.frame_width, Config.CAMERA.frame_height
+
+def scene(x: int) -> np.ndarray:
+    frame = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    cv2.rectangle(frame, (x, 200), (x + 60, 320), (255, 255, 255), -1)
+    return frame
+
+def gray(frame: np.ndarray) -> np.ndarray:
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+def test_first_frame_is_a_full_pass():
+    result = ChangeGate().update(gray(scene(100)))
+    assert result.changed and not result.localized
+
+def test_unchanged_frames_skip_until_forced():
+    gate = ChangeGate(max_skipped_frames=3)
+    gate.update(gray(scene(100)))
+    assert [gate.update(gray(scene(100))).changed for _ in range(4)] == [False, False, False, True]
+
+def test_small_change_is_localized_around_the_object():
+    gate = ChangeGate()
+    gate.update(gray(scene(100)))
+    result = gate.update(gray(scene(140)))
+    assert result.changed and result.localized
+    x1, y1, x2, y2 = result.roi
+    assert x1 <= 140 and x2 >= 200 and y1 <= 200 and y2 >= 320
+
+def test_stopped_object_keeps_its_id_across_skipped_frames():
+    """Regression: a track coasting on stale velocity through skipped frames was re-registered"""
+    pytest.importorskip('ultralytics')
+    from detector_static.core.detector import ObjectDetector
+
+    class BrightBoxDetector(ObjectDetector):
+        def detect(self, frame_resized):
+            ys, xs = np.nonzero(frame_resized[:, :, 0])
+            if len(xs) == 0:
+                return np.zeros((0, 6), dtype=np.float32)
+            return np.array([[xs.min(), ys.min(), xs.max() + 1, ys.max() + 1, 0.9, 0]], dtype=np.float32)
+
+    clock = FrameClock()
+    detector = BrightBoxDetector(load_model=False, clock=clock)
+    detector.names = {0: 'person'}
+    gate = ChangeGate()
+    seen_ids = set()
+    for i in range(130):
+        clock.set(i / 30.0)
+        frame = scene(20 + 6 * min(i, 60))  # Moves 6 px per frame, then stops
+        change = gate.update(gray(frame))
+        if not change.changed:
+            tracked_objects, _ = detector.track_unchanged(frame)
+        elif change.localized:
+            tracked_objects, _ = detector.detect_and_track_region(frame, change.roi)
+        else:
+            tracked_objects, _ = detector.detect_and_track(frame)
+        seen_ids.update(obj.object_id for obj in tracked_objects)
+    assert seen_ids == {0}
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('ultralytics')
+
+from detector_static.core.inference import InferenceWorkerPool, SharedFrameRing
+
+SHAPE = (8, 8, 3)
+
+def test_ring_round_trip():
+    ring = SharedFrameRing(2, SHAPE)
+    try:
+        frame = np.random.default_rng(0).integers(0, 255, SHAPE, dtype=np.uint8)
+        ring.write(1, frame)
+        copy = ring.read(1)
+        ring.write(1, np.zeros(SHAPE, dtype=np.uint8))
+        assert np.array_equal(copy, frame)  # Reads are private copies
+    finally:
+        ring.close()
+
+def test_close_cancels_queued_frames_and_frees_their_slots():
+    pool = InferenceWorkerPool(num_workers=0, slots=3, shape=SHAPE)  # No worker ever takes a task
+    try:
+        for _ in range(3):
+            assert pool.submit(np.zeros(SHAPE, dtype=np.uint8)) is not None
+        assert pool.submit(np.zeros(SHAPE, dtype=np.uint8)) is None
+        assert pool.cancel_pending(timeout=0.5) == 3
+        assert pool.in_flight == 0
+        assert sorted(pool.free_slots) == [0, 1, 2]
+    finally:
+        pool.close()
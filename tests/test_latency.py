@@ -0,0 +1,52 @@
+import json
+import math
+
+import pytest
+
+from detector_static.utils.latency import AUDIO_APPLIED, FrameTrace, LatencyHistogram, LatencyTracker
+
+BIN_RATIO = 10 ** (1 / 20)
+
+def test_percentiles_are_within_one_bin():
+    histogram = LatencyHistogram()
+    for ms in range(1, 101):
+        histogram.add(float(ms))
+    for p in (50, 95, 99):
+        assert p <= histogram.percentile(p) <= p * BIN_RATIO
+    assert histogram.percentile(100) == 100.0
+
+def test_percentiles_never_exceed_the_maximum():
+    histogram = LatencyHistogram()
+    for _ in range(10):
+        histogram.add(3.0)
+    assert histogram.percentile(50) == 3.0
+    assert histogram.summary()['max_ms'] == 3.0
+
+def test_out_of_range_latencies_are_kept():
+    histogram = LatencyHistogram()
+    histogram.add(0.01)
+    histogram.add(1e6)
+    assert histogram.percentile(50) == pytest.approx(histogram.edges[0])
+    assert histogram.percentile(100) == 1e6
+
+def test_empty_histogram():
+    assert math.isnan(LatencyHistogram().percentile(50))
+    assert LatencyHistogram().summary() == {'count': 0}
+
+def test_tracker_records_stages_and_end_to_end(tmp_path):
+    path = tmp_path / 'trace.jsonl'
+    tracker = LatencyTracker(str(path))
+    trace = FrameTrace(0, capture_ts=10.0)
+    trace.stages['detect'] = [10.010, 10.030]
+    trace.marks[AUDIO_APPLIED] = 10.050
+    tracker.complete(trace)
+    tracker.complete(FrameTrace(1))
+    tracker.close()
+
+    summary = tracker.summary()
+    assert (summary['frames'], summary['without_audio']) == (2, 1)
+    assert 50.0 <= summary['end_to_end']['p50_ms'] <= 50.0 * BIN_RATIO
+    assert 20.0 <= summary['stages']['detect']['p50_ms'] <= 20.0 * BIN_RATIO
+    first = json.loads(path.read_text().splitlines()[0])
+    assert first == {'frame': 0, 'stages': {'detect': [10.0, 30.0]}, 'marks': {AUDIO_APPLIED: 50.0}}
+    assert trace.end_to_end() == pytest.approx(0.05)
@@ -0,0 +1,45 @@
+from detector_static.audio.library import SampleCache, SampleLibrary, SoundProfile
+
+def sized_loader(size):
+    def loader(key):
+        return key.upper(), size
+    return loader
+
+def test_sample_cache_evicts_least_recently_used():
+    cache = SampleCache(max_bytes=30)
+    for key in ('a', 'b', 'c'):
+        cache.get(key, sized_loader(10))
+    cache.get('a', sized_loader(10))  # Touch 'a' so 'b' is now the oldest
+    cache.get('d', sized_loader(10))
+    assert 'b' not in cache
+    assert all(key in cache for key in ('a', 'c', 'd'))
+    assert cache.total_bytes == 30
+    assert (cache.hits, cache.misses) == (1, 4)
+
+def test_sample_cache_keeps_an_oversized_newest_entry():
+    cache = SampleCache(max_bytes=10)
+    cache.get('a', sized_loader(5))
+    assert cache.get('big', sized_loader(50)) == 'BIG'
+    assert 'big' in cache and 'a' not in cache
+
+def test_profile_from_form_data_assigns_states_in_urgency_order():
+    profile = SoundProfile.from_dict({'soundTracks': ['violin/x', 'flute/y'], 'noFeedbackFrom': ['static']})
+    assert profile.states['fast'] == 'violin/x'
+    assert profile.states['slow'] == 'flute/y'
+    assert profile.states['static'] == SoundProfile.default().states['static']
+    assert profile.muted == ['static']
+
+def test_profile_class_override():
+    profile = SoundProfile.from_dict({'classes': {'car': 'tuba/z'}})
+    assert profile.sample_for('fast', 'car') == 'tuba/z'
+    assert profile.sample_for('fast', 'person') == profile.states['fast']
+
+def test_index_prefers_instrument_folder_over_combination_copies(tmp_path):
+    filename = 'violin_A3_025_forte_arco-normal.mp3'
+    for folder in ('combination', 'violin'):  # The combination copy is walked first
+        (tmp_path / folder).mkdir()
+        (tmp_path / folder / filename).write_bytes(b'')
+    library = SampleLibrary(str(tmp_path))
+    library.build()
+    assert [s.path for s in library.samples] == [f'violin/{filename}']
+    assert library.resolve('violin:A3').path == f'violin/{filename}'
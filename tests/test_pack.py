@@ -0,0 +1,86 @@
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from detector_static.audio.library import SampleLibrary
+from detector_static.audio.pack import (
+    SamplePack, SamplePackError, build_pack, find_loop_points, resample_linear, trim_silence
+)
+from detector_static.config.settings import Config
+
+RATE = 8000
+
+def sine(seconds: float, frequency: float = 220.0) -> np.ndarray:
+    t = np.arange(int(seconds * RATE)) / RATE
+    return np.sin(2 * np.pi * frequency * t).astype(np.float32)[:, None]
+
+def test_resample_scales_length_and_keeps_shape():
+    samples = np.repeat(sine(0.5), 2, axis=1)
+    resampled = resample_linear(samples, RATE, 2 * RATE)
+    assert resampled.shape == (2 * len(samples), 2)
+    assert resample_linear(samples, RATE, RATE) is samples
+
+def test_trim_silence_cuts_quiet_edges():
+    tone = sine(0.2)
+    padded = np.concatenate([np.zeros((800, 1), np.float32), tone, np.zeros((400, 1), np.float32)])
+    trimmed = trim_silence(padded, RATE)
+    assert abs(len(trimmed) - len(tone)) < 10
+    assert trimmed[0, 0] == 0.0 and abs(trimmed[-1, 0]) < 1e-6  # Faded edges
+    assert len(trim_silence(np.zeros((100, 1), np.float32), RATE)) == 0
+
+def test_loop_points_splice_at_matching_phase():
+    samples = sine(1.0)
+    start, end = find_loop_points(samples, RATE)
+    assert 0.3 * len(samples) <= start < 0.5 * len(samples)
+    assert 0.7 * len(samples) <= end < len(samples)
+    window = int(0.01 * RATE)
+    assert np.abs(samples[start:start + window] - samples[end:end + window]).max() < 0.05
+
+def test_pack_round_trip(tmp_path):
+    pytest.importorskip('pygame')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    filename = 'cello_A2_025_forte_arco-normal.mp3'
+    (tmp_path / 'lib' / 'cello').mkdir(parents=True)
+    shutil.copy(os.path.join(Config.get_sound_paths()[0], filename), tmp_path / 'lib' / 'cello' / filename)
+    library = SampleLibrary(str(tmp_path / 'lib'))
+    library.build()
+
+    path = str(tmp_path / 'test.pack')
+    build_pack(library, library.samples, path, rate=RATE, mono=True, dtype='int16', jobs=1)
+    pack = SamplePack(path)
+    key = pack.resolve(filename)
+    assert key is not None and len(pack) == 1
+    samples = pack.samples(key)
+    assert samples.dtype == np.int16 and samples.shape[1] == 1 and len(samples) > RATE // 10
+    loop_start, loop_end = pack.loop(key)
+    assert 0 <= loop_start < loop_end <= len(samples)
+
+def test_non_pack_files_are_rejected(tmp_path):
+    path = tmp_path / 'not.pack'
+    path.write_bytes(b'x' * 64)
+    with pytest.raises(SamplePackError):
+        SamplePack(str(path))
+
+def test_silent_samples_are_left_out_of_the_pack(tmp_path):
+    pytest.importorskip('pygame')
+    import wave
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    (tmp_path / 'lib' / 'cello').mkdir(parents=True)
+    loud = 'cello_A2_025_forte_arco-normal.mp3'
+    shutil.copy(os.path.join(Config.get_sound_paths()[0], loud), tmp_path / 'lib' / 'cello' / loud)
+    # WAV data under an .mp3 name; the decoder goes by content
+    with wave.open(str(tmp_path / 'lib' / 'cello' / 'cello_A3_025_forte_arco-normal.mp3'), 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(RATE)
+        f.writeframes(b'\0' * 2 * RATE)
+    library = SampleLibrary(str(tmp_path / 'lib'))
+    library.build()
+    assert len(library.samples) == 2
+
+    path = str(tmp_path / 'test.pack')
+    index = build_pack(library, library.samples, path, rate=RATE, mono=True, jobs=1)
+    assert list(index['samples']) == [library.resolve(loud).key]
+    assert len(SamplePack(path)) == 1
@@ -0,0 +1,53 @@
+import sys
+import threading
+import time
+from collections import Counter
+
+from detector_static.utils.profiler import SamplingProfiler, collapse_stack
+
+def test_collapse_stack_lists_root_first():
+    def inner():
+        return collapse_stack(sys._getframe())
+    stack = inner().split(';')
+    assert stack[-1].startswith('inner (test_profiler.py:')
+    assert stack[-2].startswith('test_collapse_stack_lists_root_first ')
+
+def busy_wait(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+def test_profiler_writes_folded_stacks_for_registered_threads(tmp_path):
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_wait, args=(stop,), daemon=True)
+    worker.start()
+    profiler = SamplingProfiler(output_dir=str(tmp_path), interval_ms=1.0, max_window_sec=5.0)
+    profiler.register_thread('worker', worker)
+    try:
+        profiler.start()
+        time.sleep(0.1)
+        profiler.stop()
+        profiler.sampler.join(timeout=2.0)
+    finally:
+        stop.set()
+
+    assert not profiler.running
+    [path] = profiler.last_outputs
+    assert path.endswith('-worker.folded')
+    lines = open(path).read().splitlines()
+    assert lines and all(line.rsplit(' ', 1)[1].isdigit() for line in lines)
+    assert any('busy_wait (test_profiler.py:' in line for line in lines)
+
+def test_profiler_stops_after_its_window(tmp_path):
+    profiler = SamplingProfiler(output_dir=str(tmp_path), interval_ms=1.0, max_window_sec=0.05)
+    profiler.register_thread('main')
+    profiler.start()
+    profiler.sampler.join(timeout=2.0)
+    assert not profiler.running
+
+def test_captures_in_the_same_second_do_not_overwrite_each_other(tmp_path, monkeypatch):
+    monkeypatch.setattr(time, 'time', lambda: 1700000000.25)
+    profiler = SamplingProfiler(output_dir=str(tmp_path))
+    first = profiler._write({'vision': Counter({'main;run': 3})})
+    second = profiler._write({'vision': Counter({'main;run': 5})})
+    assert first != second
+    assert [open(path).read() for path in first + second] == ['main;run 3\n', 'main;run 5\n']
@@ -0,0 +1,40 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from detector_static.server.protocol import (
+    ENCODING_RAW_BGR, FRAME_HEADER, FrameMessage, ProtocolError,
+    encode_cues, encode_frame, read_cues, read_frame
+)
+
+def read_with(coroutine_function, data: bytes):
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return await coroutine_function(reader)
+    return asyncio.run(run())
+
+def test_frame_round_trip():
+    frame = np.full((48, 64, 3), 128, dtype=np.uint8)
+    message = read_with(read_frame, encode_frame(frame, seq=7, capture_ts=12.5))
+    assert (message.seq, message.capture_ts, message.width, message.height) == (7, 12.5, 64, 48)
+    decoded = message.decode()
+    assert decoded.shape == frame.shape
+    assert np.abs(decoded.astype(int) - 128).max() <= 2  # JPEG is lossy
+
+def test_raw_frames_are_checked_for_size():
+    frame = np.arange(2 * 3 * 3, dtype=np.uint8).reshape(2, 3, 3)
+    assert np.array_equal(FrameMessage(1, 0.0, ENCODING_RAW_BGR, 3, 2, frame.tobytes()).decode(), frame)
+    with pytest.raises(ProtocolError):
+        FrameMessage(1, 0.0, ENCODING_RAW_BGR, 4, 2, frame.tobytes()).decode()
+
+def test_bad_magic_is_rejected():
+    header = FRAME_HEADER.pack(b'NOPE', ENCODING_RAW_BGR, 1, 0.0, 1, 1, 3)
+    with pytest.raises(ProtocolError):
+        read_with(read_frame, header + b'\0\0\0')
+
+def test_cue_round_trip():
+    message = {'seq': 3, 'motion': 'slow', 'objects': [{'id': 1, 'pan': [0.2, 0.8]}]}
+    assert read_with(read_cues, encode_cues(message)) == message
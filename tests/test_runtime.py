@@ -0,0 +1,92 @@
+import copy
+import dataclasses
+
+import pytest
+
+from detector_static.config import runtime
+from detector_static.config.settings import Config
+
+@pytest.fixture(autouse=True)
+def restore_config():
+    """Undo Config and runtime snapshot changes made by a test"""
+    saved = {key: copy.deepcopy(value) for key, value in vars(Config).items() if key.isupper()}
+    saved_runtime = runtime.get_runtime_config()
+    yield
+    for key, value in saved.items():
+        current = getattr(Config, key)
+        if dataclasses.is_dataclass(current):
+            for f in dataclasses.fields(value):
+                setattr(current, f.name, getattr(value, f.name))
+        else:
+            setattr(Config, key, value)
+    runtime._swap(saved_runtime)
+
+def test_compiled_tables_follow_class_ids():
+    snapshot = runtime.compile_runtime_config({0: 'person', 2: 'tv', 3: 'dog'})
+    assert snapshot.num_classes == 4
+    assert snapshot.target_mask.tolist() == [True, False, False, False]
+    assert snapshot.stationary[2] and snapshot.size_by_width[2]
+    assert snapshot.real_sizes[3] == runtime.DEFAULT_REAL_SIZE
+    assert not snapshot.target_mask.flags.writeable
+
+def test_apply_settings_swaps_in_a_new_snapshot():
+    before = runtime.set_class_names({0: 'person', 1: 'chair'})
+    after = runtime.apply_settings({'MOTION': {'slow_threshold': 50}, 'STATIONARY_CLASSES': ['person']})
+    assert runtime.get_runtime_config() is after
+    assert after.version == before.version + 1
+    assert after.motion.slow_threshold == 50
+    assert after.stationary[after.class_id('person')]
+    assert not after.stationary[after.class_id('chair')]
+    assert before.motion.slow_threshold != 50  # Old snapshots are never mutated
+
+def test_dict_fields_are_merged():
+    runtime.apply_settings({'DIMENSIONS': {'heights': {'dog': 50}}})
+    assert Config.DIMENSIONS.heights['dog'] == 50
+    assert Config.DIMENSIONS.heights['person'] == 170
+
+@pytest.mark.parametrize('overrides', [
+    {'FOO': 1},
+    {'MOTION': {'nope': 1}},
+    {'MOTION': {'slow_threshold': '50'}},  # Regression: accepted, then failed on every frame
+    {'MOTION': {'slow_threshold': True}},
+    {'GATE': {'enabled': 'yes'}},
+    {'DIMENSIONS': {'heights': {'dog': 'tall'}}},
+    {'TARGET_CLASSES': 'person'},
+    {'TARGET_CLASSES': [1, 2]},
+    {'CAMERA': {'frame_width': 640}},
+    {'GATE': {'max_skipped_frames': 5}},  # Read when components are built
+])
+def test_invalid_overrides_change_nothing(overrides):
+    before = runtime.get_runtime_config()
+    motion = dataclasses.replace(Config.MOTION)
+    with pytest.raises(ValueError):
+        runtime.apply_settings({'MOTION': {'static_threshold': 1}, **overrides})
+    assert runtime.get_runtime_config() is before
+    assert Config.MOTION == motion
+
+def test_startup_only_settings_apply_before_components_are_built(tmp_path):
+    from detector_static.motion.gate import ChangeGate
+
+    path = tmp_path / 'settings.json'
+    path.write_text('{"GATE": {"max_skipped_frames": 5}, "CAMERA": {"frame_width": 640}}')
+    watcher = runtime.SettingsWatcher(str(path))
+    assert watcher.check(startup=True)
+    assert ChangeGate().max_skipped_frames == 5
+    assert Config.CAMERA.frame_width == 640
+
+    path.write_text('{"GATE": {"max_skipped_frames": 7}}')
+    watcher.last_mtime = None
+    assert not watcher.check()
+    assert Config.GATE.max_skipped_frames == 5
+
+def test_watcher_keeps_previous_settings_on_a_bad_file(tmp_path):
+    path = tmp_path / 'settings.json'
+    path.write_text('{"MOTION": {"slow_threshold": 55}}')
+    watcher = runtime.SettingsWatcher(str(path))
+    assert watcher.check()
+    assert runtime.get_runtime_config().motion.slow_threshold == 55
+
+    path.write_text('{"MOTION": {"slow_threshold": "fast"}}')
+    watcher.last_mtime = None
+    assert not watcher.check()
+    assert runtime.get_runtime_config().motion.slow_threshold == 55
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from detector_static.audio.spatial import MotionExtrapolator
+from detector_static.config.settings import MotionConfig
+from detector_static.motion.analyzer import MotionAnalyzer
+from detector_static.utils.clock import FrameClock
+from detector_static.utils.types import TrackedObject
+
+def test_extrapolator_predicts_linearly():
+    motion = MotionExtrapolator(max_extrapolation=0.25)
+    motion.update(100.0, 40.0, 3.0, -1.0, anchor_time=10.0)
+    assert motion.predict(10.1) == pytest.approx((104.0, 2.9))
+
+def test_extrapolator_holds_after_the_limit_and_before_the_anchor():
+    motion = MotionExtrapolator(max_extrapolation=0.25)
+    motion.update(100.0, 40.0, 0.1, -1.0, anchor_time=10.0)
+    assert motion.predict(11.0) == pytest.approx((110.0, 0.0))  # Distance never goes negative
+    assert motion.predict(9.0) == pytest.approx((100.0, 0.1))
+
+def test_x_rate_is_the_velocity_of_the_compensated_positions():
+    """Regression: audio extrapolated compensated positions with the tracker's raw velocity"""
+    clock = FrameClock()
+    analyzer = MotionAnalyzer(MotionConfig(static_threshold=25, slow_threshold=60, smoothing_factor=0.0),
+                              verbose=False, clock=clock)
+    previous_x = None
+    for i in range(6):
+        clock.set(i / 30.0)
+        analyzer.camera_motion = np.array([-8.0 * (i % 2), 0.0], dtype=np.float32)  # Jerky pan
+        x = 300 + 2 * i
+        obj = TrackedObject(object_id=0, center=(x, 240), class_name='person', confidence=0.9,
+                            bbox=(x - 30, 140, x + 30, 340))
+        _, _, x_positions = analyzer.analyze_object_motion([obj])
+        expected = 0.0 if previous_x is None else (x_positions[0] - previous_x) * 30.0
+        assert obj.x_rate == pytest.approx(expected, abs=1e-3)
+        previous_x = x_positions[0]
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('ultralytics')
+
+from detector_static.tools import sweep
+from detector_static.tools.sweep import DetectionCache, SweepParams, TrackMetrics, build_grid, evaluate
+from detector_static.utils.types import TrackedObject
+
+def tracked(object_id, center, class_name='person', motion_state='static'):
+    x, y = center
+    return TrackedObject(object_id=object_id, center=center, class_name=class_name, confidence=0.9,
+                         bbox=(x - 10, y - 10, x + 10, y + 10), motion_state=motion_state)
+
+def walking_cache(frames=30, fps=30.0, complete=True):
+    """One person walking right at 3 px per frame"""
+    detections = np.array([[100 + 3 * i, 200, 140 + 3 * i, 300, 0.9, 0] for i in range(frames)], dtype=np.float32)
+    return DetectionCache(detections, np.arange(frames + 1), np.zeros((frames, 2), np.float32),
+                          np.arange(frames) / fps, {0: 'person'}, complete)
+
+def test_grid_skips_static_thresholds_at_or_above_slow():
+    grid = build_grid([10, 30], [20, 40], [0.5], [150.0], [10], [0.7])
+    assert [(p.static_threshold, p.slow_threshold) for p in grid] == [(10, 20), (10, 40), (30, 40)]
+
+def test_metrics_count_takeovers_class_changes_and_flips():
+    metrics = TrackMetrics(switch_radius=50.0, switch_window=5)
+    metrics.update(0, [tracked(0, (100, 100))])
+    metrics.update(1, [tracked(0, (102, 100), motion_state='slow')])
+    metrics.update(2, [tracked(1, (110, 100))])  # Takes over the lost track 0 nearby
+    metrics.update(3, [tracked(1, (112, 100), class_name='car')])
+    assert metrics.summary() == {'tracks': 2, 'id_switches': 2, 'state_flip_rate': 0.5}
+
+def test_cache_round_trip(tmp_path):
+    cache = walking_cache(5)
+    path = str(tmp_path / 'cache.npz')
+    cache.save(path)
+    loaded = DetectionCache.load(path)
+    assert len(loaded) == 5 and loaded.names == {0: 'person'}
+    assert np.array_equal(loaded.frame(3), cache.frame(3))
+
+def test_cache_honours_frame_caps(tmp_path, monkeypatch):
+    video = tmp_path / 'walk.mp4'
+    video.write_bytes(b'')
+    builds = []
+    def build(video_path, max_frames=None):
+        builds.append(max_frames)
+        return walking_cache(max_frames or 30, complete=max_frames is None)
+    monkeypatch.setattr(sweep, 'build_detection_cache', build)
+
+    capped, _ = sweep.load_or_build_cache(str(video), max_frames=10)
+    assert len(capped) == 10 and not capped.complete
+    assert len(sweep.load_or_build_cache(str(video), max_frames=5)[0]) == 5  # Cut from the cached 10
+    full, _ = sweep.load_or_build_cache(str(video))  # A capped cache does not serve an uncapped run
+    assert len(full) == 30 and full.complete
+    assert len(sweep.load_or_build_cache(str(video), max_frames=20)[0]) == 20
+    assert builds == [10, None]
+
+def test_evaluate_replays_one_stable_track():
+    params = SweepParams(static_threshold=1.0, slow_threshold=10.0, smoothing_factor=0.0,
+                         max_distance=150.0, max_lost=10, velocity_weight=0.7)
+    result = evaluate(walking_cache(), params)
+    assert (result['tracks'], result['id_switches']) == (1, 0)
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from detector_static.audio.synth import ToneMapper, ToneParameters, ToneSynthesizer, ToneVoice
+
+RATE, BLOCK = 8000, 320
+
+def test_closer_objects_sound_higher():
+    mapper = ToneMapper()
+    assert mapper.frequency(0.1) == pytest.approx(mapper.near_frequency)
+    assert mapper.frequency(10.0) == pytest.approx(mapper.far_frequency)
+    assert mapper.frequency(1.0) > mapper.frequency(2.0)
+
+def test_faster_objects_pulse_faster_up_to_the_limit():
+    mapper = ToneMapper()
+    assert mapper.pulse_rate(0.0) == mapper.static_pulse_rate
+    assert mapper.pulse_rate(20.0) > mapper.pulse_rate(5.0)
+    assert mapper.pulse_rate(1e6) == mapper.max_pulse_rate
+
+def test_voices_fade_in_without_a_jump():
+    synth = ToneSynthesizer(RATE, BLOCK, smoothing=0.5)
+    voice = ToneVoice(ToneParameters(440.0, 0.3, 0.0, 1.0))
+    first = synth.render([voice])
+    assert first.shape == (BLOCK, 2) and first.dtype == np.int16
+    assert abs(int(first[0, 0])) < 100  # Gain starts at zero
+    assert voice.current.gain == pytest.approx(0.5)
+
+def test_phase_is_continuous_across_blocks():
+    synth = ToneSynthesizer(RATE, BLOCK, smoothing=1.0)
+    voice = ToneVoice(ToneParameters(200.0, 0.0, 0.0, 1.0))
+    voice.current.gain = 1.0
+    audio = np.concatenate([synth.render_voice(voice) for _ in range(3)])
+    assert np.abs(np.diff(audio)).max() < 2 * np.sin(np.pi * 200.0 / RATE) + 1e-6
+
+def test_stereo_scales_pan_the_voice():
+    synth = ToneSynthesizer(RATE, BLOCK, smoothing=1.0)
+    voice = ToneVoice(ToneParameters(300.0, 0.3, 0.0, 0.5, left=1.0, right=0.0))
+    voice.current.gain = 0.5
+    block = synth.render([voice]).astype(float)
+    assert np.abs(block[:, 1]).max() == 0.0 and np.abs(block[:, 0]).max() > 0
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('ultralytics')
+
+from detector_static.tools.synthetic import SceneGenerator, count_id_switches
+from detector_static.utils.types import TrackedObject
+
+def box_center(row) -> tuple:
+    return ((int(row[0]) + int(row[2])) // 2, (int(row[1]) + int(row[3])) // 2)
+
+def test_same_seed_same_stream():
+    first, second = SceneGenerator(20, seed=3), SceneGenerator(20, seed=3)
+    for _ in range(10):
+        a, b = first.next_frame(), second.next_frame()
+        np.testing.assert_array_equal(a.detections, b.detections)
+        np.testing.assert_array_equal(a.object_ids, b.object_ids)
+
+def test_detections_stay_inside_the_frame():
+    generator = SceneGenerator(50, seed=1, ego_motion=5.0)
+    for _ in range(30):
+        frame = generator.next_frame()
+        assert frame.detections.shape == (len(frame.object_ids), 6)
+        assert (frame.detections[:, [0, 2]] >= 0).all() and (frame.detections[:, [0, 2]] < generator.width).all()
+        assert (frame.detections[:, [1, 3]] >= 0).all() and (frame.detections[:, [1, 3]] < generator.height).all()
+
+def test_id_switch_counted_when_a_track_changes():
+    frame = SceneGenerator(3, seed=0, occlusion_rate=0.0).next_frame()
+    objects = [TrackedObject(object_id=i, class_name='person', class_id=0, bbox=tuple(map(int, row[:4])),
+                             center=box_center(row), confidence=float(row[4]))
+               for i, row in enumerate(frame.detections)]
+    truth_to_track = {}
+    assert count_id_switches(truth_to_track, frame, objects) == 0
+    objects[0].object_id = 99
+    assert count_id_switches(truth_to_track, frame, objects) == 1